@@ -0,0 +1,11 @@
+"""
+Benchmarks of pydantic-odm
+
+Run all benchmarks and compare results with stored baseline::
+
+    python -m benchmarks --output benchmark.json --baseline benchmarks/baseline.json
+
+CRUD benchmarks use MongoDB from docker-compose (`--mongodb-host`,
+`--mongodb-port`) or in-memory stand-in (`--in-memory`, requires
+`mongomock-motor`). Load is generated by `python -m benchmarks.workload`.
+"""
@@ -0,0 +1,84 @@
+"""Command line interface of benchmarks"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from typing import List, Optional
+
+from . import crud, micro
+from .runner import compare_results, dump_results, load_results, run_benchmarks
+
+GROUPS = ("micro", "crud")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description="Run benchmarks of pydantic-odm"
+    )
+    parser.add_argument("--group", choices=GROUPS, action="append", dest="groups")
+    parser.add_argument("-k", "--filter", help="Run benchmarks with key substring")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Path of JSON results")
+    parser.add_argument("--baseline", help="Path of JSON results for comparison")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Allowed slowdown relative to baseline (ratio)",
+    )
+    parser.add_argument("--documents", type=int, default=1000)
+    parser.add_argument("--mongodb-host", default=os.getenv("MONGODB_HOST"))
+    parser.add_argument(
+        "--mongodb-port", type=int, default=int(os.getenv("MONGODB_PORT", 37017))
+    )
+    parser.add_argument(
+        "--in-memory",
+        action="store_true",
+        help="Run CRUD benchmarks against in-memory stand-in (mongomock-motor)",
+    )
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> int:
+    groups = args.groups or GROUPS
+    benchmarks = micro.get_benchmarks() if "micro" in groups else []
+    manager = None
+    if "crud" in groups:
+        manager = await crud.init_database(
+            args.mongodb_host, args.mongodb_port, args.in_memory
+        )
+        benchmarks.extend(crud.get_benchmarks(manager, args.documents))
+    if args.filter:
+        benchmarks = [b for b in benchmarks if args.filter in b.key]
+
+    try:
+        results = await run_benchmarks(benchmarks, args.repeat, report=print)
+    finally:
+        if manager is not None:
+            await crud.drop_database(manager)
+
+    if args.output:
+        dump_results(results, args.output)
+    if not args.baseline:
+        return 0
+    if not os.path.exists(args.baseline):
+        print("Baseline %s is not found, comparison is skipped" % args.baseline)
+        return 0
+    regressions = compare_results(results, load_results(args.baseline), args.threshold)
+    for regression in regressions:
+        print(
+            "REGRESSION %s: %.2f us -> %.2f us (x%.2f)"
+            % (
+                regression.key,
+                regression.baseline * 1e6,
+                regression.current * 1e6,
+                regression.ratio,
+            )
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.get_event_loop().run_until_complete(main(parse_args())))
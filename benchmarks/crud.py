@@ -0,0 +1,115 @@
+"""End-to-end benchmarks of model operations"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List
+
+from pydantic_odm.db import MongoDBManager
+
+from .models import Post, User, make_post_data, make_user_data
+from .runner import Benchmark
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+DATABASE_NAME = "pydantic_odm_benchmarks"
+
+
+async def init_database(
+    host: str = None, port: int = None, in_memory: bool = False
+) -> MongoDBManager:
+    """
+    Initialize connection to benchmarks database.
+
+    In-memory stand-in (`mongomock_motor`) measures overhead of ODM without
+    network and server work.
+    """
+    settings = {"default": {"NAME": DATABASE_NAME, "HOST": host, "PORT": port}}
+    manager = MongoDBManager(settings)
+    if not in_memory:
+        return await manager.init_connections()
+    try:
+        import mongomock_motor
+    except ImportError:
+        raise RuntimeError("mongomock-motor is required for in-memory benchmarks")
+    client = mongomock_motor.AsyncMongoMockClient()
+    manager.connections["default"] = client
+    manager.databases["default"] = client[DATABASE_NAME]
+    manager.is_init = True
+    return manager
+
+
+async def drop_database(manager: MongoDBManager) -> None:
+    for collection in (User.Config.collection, Post.Config.collection):
+        await manager["default"][collection].drop()
+
+
+def get_benchmarks(manager: MongoDBManager, documents: int = 1000) -> List[Benchmark]:
+    users_data: List["DictStrAny"] = [make_user_data(i) for i in range(documents)]
+    posts_data = [make_post_data("medium", 3) for _ in range(documents // 10 or 1)]
+
+    async def clear() -> None:
+        await drop_database(manager)
+
+    async def fill() -> None:
+        await clear()
+        await User.bulk_create([User.parse_obj(data) for data in users_data])
+        await Post.bulk_create([Post.parse_obj(data) for data in posts_data])
+
+    async def bulk_create_users() -> None:
+        await User.bulk_create([User.parse_obj(data) for data in users_data])
+
+    async def find_users() -> None:
+        await User.find_many({})
+
+    async def find_posts() -> None:
+        await Post.find_many({})
+
+    loaded_users: List[User] = []
+
+    async def load_users() -> None:
+        await fill()
+        loaded_users[:] = await User.find_many({})
+
+    async def save_users() -> None:
+        for user in loaded_users:
+            user.age += 1
+            await user.save()
+
+    params = {"documents": documents}
+    posts_params = {"documents": len(posts_data), "size": "medium", "depth": 3}
+    return [
+        Benchmark(
+            "bulk_create",
+            bulk_create_users,
+            group="crud",
+            params=params,
+            setup=clear,
+            operations=documents,
+        ),
+        Benchmark(
+            "find_many",
+            find_users,
+            group="crud",
+            params=params,
+            setup=fill,
+            number=3,
+            operations=documents,
+        ),
+        Benchmark(
+            "find_many",
+            find_posts,
+            group="crud",
+            params=posts_params,
+            setup=fill,
+            number=3,
+            operations=len(posts_data),
+        ),
+        Benchmark(
+            "save",
+            save_users,
+            group="crud",
+            params=params,
+            setup=load_users,
+            operations=documents,
+        ),
+    ]
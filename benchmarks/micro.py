@@ -0,0 +1,75 @@
+"""Micro benchmarks of encoding, decoding and validation"""
+from __future__ import annotations
+
+from bson import ObjectId
+from typing import List
+
+from pydantic_odm.decoders.mongodb import BaseMongoDBDecoder
+from pydantic_odm.encoders.codegen import CompiledMongoDBModelEncoder
+from pydantic_odm.encoders.mongodb import BaseMongoDBEncoder, BaseMongoDBModelEncoder
+from pydantic_odm.types import ObjectIdStr
+
+from .models import DEPTHS, SIZES, Post, make_post_data, make_post_document
+from .runner import Benchmark
+
+
+def get_object_id_benchmarks() -> List[Benchmark]:
+    value = ObjectId()
+    return [
+        Benchmark(
+            "object_id_str_validate",
+            lambda: ObjectIdStr.validate(str(value)),
+            params={"input": "str"},
+        ),
+        Benchmark(
+            "object_id_str_validate",
+            lambda: ObjectIdStr.validate(value),
+            params={"input": "object_id"},
+        ),
+    ]
+
+
+def get_document_benchmarks(size: str, depth: int) -> List[Benchmark]:
+    encoder = BaseMongoDBEncoder()
+    generic_encoder = BaseMongoDBModelEncoder()
+    compiled_encoder = CompiledMongoDBModelEncoder()
+    decoder = BaseMongoDBDecoder()
+    data = make_post_data(size, depth)
+    document = make_post_document(size, depth)
+    post = Post.parse_obj(data)
+    decoded = decoder(document)
+
+    def update_model_from_doc() -> None:
+        post._doc = decoded
+        post._update_model_from__doc()
+
+    params = {"size": size, "depth": depth}
+    return [
+        Benchmark("encode_dict", lambda: encoder(data), params=params),
+        Benchmark(
+            "encode_model",
+            lambda: generic_encoder(post, exclude={"id"}),
+            params={**params, "encoder": "generic"},
+        ),
+        Benchmark(
+            "encode_model",
+            lambda: compiled_encoder(post, exclude={"id"}),
+            params={**params, "encoder": "compiled"},
+        ),
+        Benchmark("decode", lambda: decoder(document), params=params),
+        Benchmark("validate", lambda: Post.parse_obj(decoded), params=params),
+        Benchmark(
+            "from_mongo_document",
+            lambda: Post._from_mongo_document(document),
+            params=params,
+        ),
+        Benchmark("update_model_from_doc", update_model_from_doc, params=params),
+    ]
+
+
+def get_benchmarks() -> List[Benchmark]:
+    benchmarks = get_object_id_benchmarks()
+    for size in SIZES:
+        for depth in DEPTHS:
+            benchmarks.extend(get_document_benchmarks(size, depth))
+    return benchmarks
@@ -0,0 +1,104 @@
+"""Fixture models and documents of benchmarks"""
+from __future__ import annotations
+
+from bson import ObjectId
+from datetime import datetime
+from enum import Enum
+from pydantic import Field
+from typing import TYPE_CHECKING, List, Optional
+
+from pydantic_odm import mixins
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+# Count of comments in post by document size
+SIZES = {"small": 1, "medium": 10, "large": 100}
+# Nesting depths of comments
+DEPTHS = (1, 3, 5)
+
+CREATED = datetime(2020, 1, 1)
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Manager = "manager"
+    Author = "author"
+    Reader = "reader"
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+    age: Optional[int]
+    type: UserTypesEnum = Field(default=UserTypesEnum.Reader)
+
+    class Config:
+        database = "default"
+        collection = "benchmark_user"
+
+
+class Comment(mixins.BaseDBMixin):
+    """Example comment model (with nested replies)"""
+
+    body: str
+    created: datetime
+    author: User
+    replies: List["Comment"] = []
+
+
+Comment.update_forward_refs()
+
+
+class Post(mixins.DBPydanticMixin):
+    """Example post model"""
+
+    title: str
+    body: str
+    author: User
+    comments: List[Comment] = []
+
+    class Config:
+        database = "default"
+        collection = "benchmark_post"
+
+
+def make_user_data(i: int = 0) -> "DictStrAny":
+    return {
+        "username": "user #%s" % i,
+        "created": CREATED,
+        "age": 20 + i % 50,
+        "type": UserTypesEnum.Author,
+    }
+
+
+def make_comment_data(depth: int, i: int = 0) -> "DictStrAny":
+    """Return comment with chain of `depth - 1` nested replies"""
+    comment = {
+        "body": "comment #%s " % i * 5,
+        "created": CREATED,
+        "author": make_user_data(i),
+        "replies": [],
+    }
+    if depth > 1:
+        comment["replies"] = [make_comment_data(depth - 1, i)]
+    return comment
+
+
+def make_post_data(size: str = "small", depth: int = 1) -> "DictStrAny":
+    return {
+        "title": "Post title",
+        "body": "Post body " * 50,
+        "author": make_user_data(),
+        "comments": [make_comment_data(depth, i) for i in range(SIZES[size])],
+    }
+
+
+def make_post_document(size: str = "small", depth: int = 1) -> "DictStrAny":
+    """Return post document like it is stored to MongoDB"""
+    post = Post.parse_obj(make_post_data(size, depth))
+    return {"_id": ObjectId(), **post._encode_model_to_mongo(exclude={"id"})}
@@ -0,0 +1,199 @@
+"""Runner of benchmarks with JSON results and baseline comparison"""
+from __future__ import annotations
+
+import asyncio
+import bson
+import json
+import motor
+import platform
+import pydantic
+import statistics
+import timeit
+from datetime import datetime
+from pydantic import BaseModel
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+
+class Benchmark:
+    """
+    Benchmark of sync function or coroutine function.
+
+    Sync functions are called by `timeit` with auto-ranged number of calls
+    in each repeat.
+    Coroutine functions are awaited `number` times in each repeat, `setup`
+    coroutine function is awaited before each repeat (not measured).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[], Any],
+        group: str = "micro",
+        params: "DictStrAny" = None,
+        setup: Optional[Callable[[], Any]] = None,
+        number: int = 1,
+        operations: int = 1,
+    ) -> None:
+        self.name = name
+        self.func = func
+        self.group = group
+        self.params = params or {}
+        self.setup = setup
+        self.number = number
+        # Count of operations in one call (for example documents in batch)
+        self.operations = operations
+
+    @property
+    def key(self) -> str:
+        if not self.params:
+            return self.name
+        params = ",".join("%s=%s" % item for item in self.params.items())
+        return "%s[%s]" % (self.name, params)
+
+    @property
+    def is_async(self) -> bool:
+        return asyncio.iscoroutinefunction(self.func)
+
+
+class BenchmarkResult(BaseModel):
+    """Result of benchmark (times of one operation in seconds)"""
+
+    key: str
+    name: str
+    group: str
+    params: Dict[str, Any] = {}
+    rounds: int
+    iterations: int
+    min: float
+    median: float
+    mean: float
+    stdev: float
+    ops: float
+
+
+class Regression(BaseModel):
+    """Slowdown of benchmark relative to baseline"""
+
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def _build_result(
+    benchmark: Benchmark, times: List[float], number: int
+) -> BenchmarkResult:
+    per_operation = [t / number / benchmark.operations for t in times]
+    median = statistics.median(per_operation)
+    return BenchmarkResult(
+        key=benchmark.key,
+        name=benchmark.name,
+        group=benchmark.group,
+        params=benchmark.params,
+        rounds=len(times),
+        iterations=number * benchmark.operations,
+        min=min(per_operation),
+        median=median,
+        mean=statistics.mean(per_operation),
+        stdev=statistics.stdev(per_operation) if len(times) > 1 else 0.0,
+        ops=1 / median if median else 0.0,
+    )
+
+
+def run_sync(benchmark: Benchmark, repeat: int) -> BenchmarkResult:
+    timer = timeit.Timer(benchmark.func)
+    # Number of calls, which take at least 0.2 seconds
+    number, _ = timer.autorange()
+    return _build_result(benchmark, timer.repeat(repeat=repeat, number=number), number)
+
+
+async def run_async(benchmark: Benchmark, repeat: int) -> BenchmarkResult:
+    times = []
+    for _ in range(repeat):
+        if benchmark.setup is not None:
+            await benchmark.setup()
+        started = perf_counter()
+        for _ in range(benchmark.number):
+            await benchmark.func()
+        times.append(perf_counter() - started)
+    return _build_result(benchmark, times, benchmark.number)
+
+
+async def run_benchmarks(
+    benchmarks: List[Benchmark], repeat: int = 5, report: Callable[[str], Any] = None
+) -> List[BenchmarkResult]:
+    results = []
+    for benchmark in benchmarks:
+        if benchmark.is_async:
+            result = await run_async(benchmark, repeat)
+        else:
+            result = run_sync(benchmark, repeat)
+        if report is not None:
+            report(format_result(result))
+        results.append(result)
+    return results
+
+
+def format_result(result: BenchmarkResult) -> str:
+    return "%-60s %12.2f us %12.0f ops/s" % (
+        result.key,
+        result.median * 1e6,
+        result.ops,
+    )
+
+
+def get_environment() -> "DictStrAny":
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "pydantic": pydantic.VERSION,
+        "pydantic_compiled": pydantic.compiled,
+        "motor": motor.version,
+        "bson_c_extension": bson.has_c(),
+    }
+
+
+def dump_results(results: List[BenchmarkResult], path: str) -> None:
+    data = {
+        "environment": get_environment(),
+        "results": [result.dict() for result in results],
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, BenchmarkResult]:
+    with open(path) as f:
+        data = json.load(f)
+    results = [BenchmarkResult.parse_obj(result) for result in data["results"]]
+    return {result.key: result for result in results}
+
+
+def compare_results(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, BenchmarkResult],
+    threshold: float = 0.2,
+) -> List[Regression]:
+    """
+    Return benchmarks, which median time is greater than baseline median
+    by more than `threshold` (ratio). Benchmarks without baseline are skipped.
+    """
+    regressions = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None or not base.median:
+            continue
+        if result.median > base.median * (1 + threshold):
+            regressions.append(
+                Regression(key=result.key, baseline=base.median, current=result.median)
+            )
+    return regressions
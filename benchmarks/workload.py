@@ -0,0 +1,394 @@
+"""
+Workload generator and query log replay
+
+Drives concurrent mix of model operations with optional target rate and
+reports throughput, latency percentiles and time of ODM stages::
+
+    python -m benchmarks.workload --duration 30 --concurrency 32 --rps 2000 \\
+        --mix find_one=70,find_many=10,create=10,save=10 --size medium
+
+    python -m benchmarks.workload --replay queries.jsonl --concurrency 16
+
+Query log contains one operation per line in MongoDB extended JSON::
+
+    {"model": "Post", "op": "find_many", "query": {"author.age": {"$gt": 30}}}
+
+Latency is measured from scheduled start of operation (with target rate),
+so waiting for free worker is included in latency.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+from bson import json_util
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pydantic_odm.mixins import DBPydanticMixin
+
+from . import crud
+from .models import DEPTHS, SIZES, Post, User, make_post_data
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+    from typing import Iterator
+
+STAGES = ("encode", "decode", "validate")
+DEFAULT_MIX = "find_one=70,find_many=10,create=10,save=10"
+READ_OPERATIONS = ("find_one", "find_many", "count")
+
+# Times of ODM stages of current operation
+_stage_times: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "_stage_times", default=None
+)
+# Stage, which is measured in current context (nested stages are not measured)
+_current_stage: ContextVar[Optional[str]] = ContextVar("_current_stage", default=None)
+
+
+@contextmanager
+def measure_stage(stage: str) -> Iterator[None]:
+    times = _stage_times.get()
+    if times is None or _current_stage.get() is not None:
+        yield
+        return
+    token = _current_stage.set(stage)
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        times[stage] = times.get(stage, 0.0) + perf_counter() - started
+        _current_stage.reset(token)
+
+
+class TimedCall:
+    """Wrapper of encoder or decoder, which measures time of stage"""
+
+    def __init__(self, stage: str, wrapped: Any) -> None:
+        self.stage = stage
+        self.wrapped = wrapped
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        with measure_stage(self.stage):
+            return self.wrapped(*args, **kwargs)
+
+    def decode_value(self, value: Any) -> Any:
+        with measure_stage(self.stage):
+            return self.wrapped.decode_value(value)
+
+
+def instrument_model(model: Type[DBPydanticMixin]) -> Type[DBPydanticMixin]:
+    """
+    Return subclass of model, which measures time of ODM stages.
+
+    Dict encoder is not replaced (compiled model encoder and BSON codec check
+    its type), so encoding of dicts is measured by `_encode_dict_to_mongo`.
+    """
+    encode_dict = model._encode_dict_to_mongo.__func__  # type: ignore
+
+    def __init__(self: DBPydanticMixin, **data: Any) -> None:
+        with measure_stage("validate"):
+            model.__init__(self, **data)
+
+    def _encode_dict_to_mongo(
+        cls: Type[DBPydanticMixin], data: "DictStrAny"
+    ) -> "DictStrAny":
+        with measure_stage("encode"):
+            return encode_dict(cls, data)
+
+    namespace = {
+        "__module__": __name__,
+        "__init__": __init__,
+        "_encode_dict_to_mongo": classmethod(_encode_dict_to_mongo),
+        "_model_encoder": TimedCall("encode", model._model_encoder),
+        "_mongo_decoder": TimedCall("decode", model._mongo_decoder),
+    }
+    return type(model.__name__, (model,), namespace)
+
+
+class OperationStats:
+    """Latencies and stage times of operations of one type"""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.errors = 0
+
+    def add(self, latency: float, stages: Dict[str, float]) -> None:
+        self.latencies.append(latency)
+        for stage, value in stages.items():
+            self.stages[stage] += value
+
+    def report(self) -> "DictStrAny":
+        count = len(self.latencies)
+        latencies = sorted(self.latencies)
+        total = sum(latencies)
+        report = {
+            "count": count,
+            "errors": self.errors,
+            "p50": percentile(latencies, 0.5),
+            "p99": percentile(latencies, 0.99),
+            "p999": percentile(latencies, 0.999),
+            "mean": total / count if count else 0.0,
+        }
+        odm_time = sum(self.stages.values())
+        # Rest of operation time is driver (and event loop) time
+        stages = {stage: self.stages.get(stage, 0.0) for stage in STAGES}
+        stages["driver"] = max(total - odm_time, 0.0)
+        report["stages"] = {k: v / count if count else 0.0 for k, v in stages.items()}
+        return report
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return percentile of sorted values (nearest rank)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(math.ceil(fraction * len(values)) - 1, 0))]
+
+
+def parse_mix(mix: str, read_ratio: Optional[float] = None) -> Dict[str, float]:
+    """Return weights of operations from `op=weight,...` or from read ratio"""
+    if read_ratio is not None:
+        if not 0 <= read_ratio <= 1:
+            raise ValueError("Read ratio must be between 0 and 1")
+        write_ratio = 1 - read_ratio
+        return {
+            "find_one": read_ratio * 0.9,
+            "find_many": read_ratio * 0.1,
+            "create": write_ratio / 2,
+            "save": write_ratio / 2,
+        }
+    weights = {}
+    for item in mix.split(","):
+        name, _, weight = item.partition("=")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+class Workload:
+    """Operations of generated workload over seeded posts"""
+
+    def __init__(
+        self, model: Type[DBPydanticMixin], size: str, depth: int, seed: int
+    ) -> None:
+        self.model = model
+        self.size = size
+        self.depth = depth
+        self.seed = seed
+        self.instances: List[DBPydanticMixin] = []
+        self.ids: List[Any] = []
+
+    async def prepare(self) -> None:
+        collection = await self.model.get_collection()
+        await collection.drop()
+        self.instances = await self.model.bulk_create(
+            [
+                self.model.parse_obj(make_post_data(self.size, self.depth))
+                for _ in range(self.seed)
+            ]
+        )
+        self.ids = [instance.id for instance in self.instances]
+
+    async def find_one(self) -> None:
+        await self.model.find_one({"_id": random.choice(self.ids)})
+
+    async def find_many(self) -> None:
+        ids = random.sample(self.ids, min(10, len(self.ids)))
+        await self.model.find_many({"_id": {"$in": ids}})
+
+    async def count(self) -> None:
+        await self.model.count({"_id": {"$in": random.sample(self.ids, 1)}})
+
+    async def create(self) -> None:
+        await self.model.create(make_post_data(self.size, self.depth))
+
+    async def save(self) -> None:
+        instance = random.choice(self.instances)
+        instance.title = "Post title %s" % random.random()
+        await instance.save()
+
+    def get_operation(self, name: str) -> Callable[[], Any]:
+        if name not in ("find_one", "find_many", "count", "create", "save"):
+            raise ValueError('"%s" operation is not supported' % name)
+        return getattr(self, name)
+
+
+def load_query_log(
+    path: str, models: Dict[str, Type[DBPydanticMixin]]
+) -> List[Tuple[str, Callable[[], Any]]]:
+    """Return operations of query log (`find_one`, `find_many` and `count`)"""
+    operations = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json_util.loads(line)
+            model = models[entry.get("model", "Post")]
+            op = entry.get("op", "find_many")
+            if op not in READ_OPERATIONS:
+                raise ValueError('"%s" operation is not supported in replay' % op)
+            method = getattr(model, op)
+            query = entry.get("query", {})
+            operations.append((op, lambda m=method, q=query: m(q)))
+    return operations
+
+
+class Runner:
+    """Concurrent runner of operations with optional target rate"""
+
+    def __init__(
+        self,
+        next_operation: Callable[[int], Tuple[str, Callable[[], Any]]],
+        concurrency: int,
+        rps: float = 0,
+        duration: float = 10,
+        limit: Optional[int] = None,
+    ) -> None:
+        self.next_operation = next_operation
+        self.concurrency = concurrency
+        self.rps = rps
+        self.duration = duration
+        self.limit = limit
+        self.stats: Dict[str, OperationStats] = defaultdict(OperationStats)
+        self._issued = 0
+        self._started = 0.0
+
+    def _schedule(self) -> Optional[Tuple[int, float]]:
+        """Return number and scheduled start of next operation (or None)"""
+        number = self._issued
+        if self.limit is not None and number >= self.limit:
+            return None
+        now = perf_counter()
+        scheduled = self._started + number / self.rps if self.rps else now
+        if scheduled - self._started >= self.duration:
+            return None
+        self._issued += 1
+        return number, scheduled
+
+    async def _worker(self) -> None:
+        while True:
+            slot = self._schedule()
+            if slot is None:
+                return
+            number, scheduled = slot
+            delay = scheduled - perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name, operation = self.next_operation(number)
+            times: Dict[str, float] = {}
+            token = _stage_times.set(times)
+            try:
+                await operation()
+            except Exception:
+                self.stats[name].errors += 1
+                continue
+            finally:
+                _stage_times.reset(token)
+            self.stats[name].add(perf_counter() - scheduled, times)
+
+    async def run(self) -> "DictStrAny":
+        self._started = perf_counter()
+        await asyncio.gather(*(self._worker() for _ in range(self.concurrency)))
+        elapsed = perf_counter() - self._started
+        total = sum(len(stats.latencies) for stats in self.stats.values())
+        return {
+            "elapsed": elapsed,
+            "operations": total,
+            "errors": sum(stats.errors for stats in self.stats.values()),
+            "throughput": total / elapsed if elapsed else 0.0,
+            "by_operation": {k: v.report() for k, v in sorted(self.stats.items())},
+        }
+
+
+def format_report(report: "DictStrAny") -> str:
+    lines = [
+        "operations: %(operations)s, errors: %(errors)s, elapsed: %(elapsed).2f s, "
+        "throughput: %(throughput).1f ops/s" % report,
+        "%-10s %8s %9s %9s %9s | %8s %8s %8s %8s (ms per op)"
+        % ("operation", "count", "p50", "p99", "p999", *STAGES, "driver"),
+    ]
+    for name, stats in report["by_operation"].items():
+        stages = [stats["stages"][stage] * 1e3 for stage in (*STAGES, "driver")]
+        lines.append(
+            "%-10s %8d %9.2f %9.2f %9.2f | %8.3f %8.3f %8.3f %8.3f"
+            % (
+                name,
+                stats["count"],
+                stats["p50"] * 1e3,
+                stats["p99"] * 1e3,
+                stats["p999"] * 1e3,
+                *stages,
+            )
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.workload",
+        description="Generate workload of pydantic-odm operations",
+    )
+    parser.add_argument("--duration", type=float, default=10, help="Seconds")
+    parser.add_argument("--operations", type=int, help="Limit of operations")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=0, help="Target rate (0 - max)")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Weights of operations")
+    parser.add_argument("--read-ratio", type=float, help="Share of read operations")
+    parser.add_argument("--size", choices=list(SIZES), default="small")
+    parser.add_argument("--depth", type=int, choices=DEPTHS, default=1)
+    parser.add_argument("--seed-documents", type=int, default=1000)
+    parser.add_argument("--replay", help="Path of query log (JSON lines)")
+    parser.add_argument("--output", help="Path of JSON report")
+    parser.add_argument("--mongodb-host", default=os.getenv("MONGODB_HOST"))
+    parser.add_argument(
+        "--mongodb-port", type=int, default=int(os.getenv("MONGODB_PORT", 37017))
+    )
+    parser.add_argument("--in-memory", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> int:
+    manager = await crud.init_database(
+        args.mongodb_host, args.mongodb_port, args.in_memory
+    )
+    models = {model.__name__: instrument_model(model) for model in (User, Post)}
+    workload = Workload(models["Post"], args.size, args.depth, args.seed_documents)
+    try:
+        if args.replay:
+            log = load_query_log(args.replay, models)
+            if not log:
+                raise ValueError("Query log is empty")
+            next_operation = lambda number: log[number % len(log)]  # noqa: E731
+        else:
+            await workload.prepare()
+            weights = parse_mix(args.mix, args.read_ratio)
+            names = list(weights)
+            operations = {name: workload.get_operation(name) for name in names}
+
+            def next_operation(number: int) -> Tuple[str, Callable[[], Any]]:
+                name = random.choices(names, [weights[n] for n in names])[0]
+                return name, operations[name]
+
+        runner = Runner(
+            next_operation, args.concurrency, args.rps, args.duration, args.operations,
+        )
+        report = await runner.run()
+    finally:
+        await crud.drop_database(manager)
+
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"arguments": vars(args), "report": report}, f, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.get_event_loop().run_until_complete(main(parse_args())))
@@ -0,0 +1,175 @@
+"""Admission control of database operations"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import monotonic
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Optional,
+    Type,
+    TypeVar,
+    cast,
+)
+
+from .errors import AdmissionRejected
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+    from typing import AsyncIterator, FrozenSet
+
+    from .mixins import DBPydanticMixin
+
+# Decorated async method
+F = TypeVar("F", bound=Callable[..., Awaitable[Any]])
+
+# Limiters, which are acquired in current context (for nested operations)
+_acquired: ContextVar[FrozenSet[int]] = ContextVar("_acquired", default=frozenset())
+
+# Limiters of database aliases
+_alias_limiters: Dict[str, AdmissionLimiter] = {}
+
+
+class AdmissionLimiter:
+    """
+    Limiter of concurrent database operations with bounded waiting queue.
+
+    Operation waits for free slot if `max_concurrency` operations are running.
+    If `max_queue` operations are already waiting (or operation waits longer
+    than `timeout` seconds) operation is rejected with `AdmissionRejected`.
+    `max_queue=0` rejects operations without waiting.
+
+    Usage::
+
+        limiter = AdmissionLimiter(max_concurrency=50, max_queue=200)
+
+        class User(DBPydanticMixin):
+            class Config:
+                admission_limiter = limiter
+
+        # or for all models of database alias
+        set_alias_limiter("default", limiter)
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.timeout = timeout
+        # Semaphore is created on first use in running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # Metrics
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def stats(self) -> "DictStrAny":
+        """Return metrics of limiter (wait times in seconds)"""
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "mean_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+            "max_wait": self.max_wait,
+        }
+
+    def reset_stats(self) -> None:
+        self.admitted = self.rejected = 0
+        self.total_wait = self.max_wait = 0.0
+
+    async def _wait(self) -> None:
+        if self.semaphore.locked() and (
+            self.max_queue is not None and self.waiting >= self.max_queue
+        ):
+            self.rejected += 1
+            raise AdmissionRejected("Admission queue is full")
+        started = monotonic()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise AdmissionRejected("Admission wait timeout is expired")
+        finally:
+            self.waiting -= 1
+        wait = monotonic() - started
+        self.admitted += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """
+        Wait for free slot of operation.
+
+        Nested operations (in same context) use slot of outer operation.
+        """
+        acquired = _acquired.get()
+        if id(self) in acquired:
+            yield
+            return
+        await self._wait()
+        self.active += 1
+        token = _acquired.set(acquired | {id(self)})
+        try:
+            yield
+        finally:
+            _acquired.reset(token)
+            self.active -= 1
+            self.semaphore.release()
+
+
+def set_alias_limiter(alias: str, limiter: Optional[AdmissionLimiter]) -> None:
+    """Set limiter for models of database alias (or remove it by None)"""
+    if limiter is None:
+        _alias_limiters.pop(alias, None)
+    else:
+        _alias_limiters[alias] = limiter
+
+
+def get_admission_limiter(
+    model: Type["DBPydanticMixin"],
+) -> Optional[AdmissionLimiter]:
+    """Return limiter of model or of its database alias"""
+    limiter = getattr(model.Config, "admission_limiter", None)
+    if limiter is None:
+        alias = getattr(model.Config, "database", None)
+        limiter = _alias_limiters.get(alias) if alias else None
+    return limiter
+
+
+def admitted(method: F) -> F:
+    """Decorator of model (or model class) method limited by admission limiter"""
+
+    @wraps(method)
+    async def wrapper(model: Any, *args: Any, **kwargs: Any) -> Any:
+        model_cls = model if isinstance(model, type) else type(model)
+        limiter = get_admission_limiter(model_cls)
+        if limiter is None:
+            return await method(model, *args, **kwargs)
+        async with limiter.acquire():
+            return await method(model, *args, **kwargs)
+
+    return cast(F, wrapper)
@@ -0,0 +1,62 @@
+"""Local application of atomic update operators"""
+from __future__ import annotations
+
+from pydantic.fields import ModelField
+from typing import Any, List, Optional
+
+SUPPORTED_OPERATORS = ("$inc", "$push", "$addToSet", "$min", "$max", "$unset")
+
+# Marker of operation, which result can't be computed locally
+NOT_APPLIED = object()
+
+
+def _get_items(operand: Any) -> Optional[List[Any]]:
+    """Return items of `$push`/`$addToSet` (None for unsupported modifiers)"""
+    if isinstance(operand, dict) and any(str(k).startswith("$") for k in operand):
+        if set(operand) != {"$each"}:
+            return None
+        return list(operand["$each"])
+    return [operand]
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def apply_operation(operator: str, value: Any, operand: Any, field: ModelField) -> Any:
+    """
+    Return new value of field after update operator or `NOT_APPLIED`.
+
+    Operation is applied only if its result is deterministic from local value:
+    operations on None values (missing field and null are not distinguished
+    locally), `$inc` changing type of value (float operand of integer field),
+    `$unset` of required field, `$push` with modifiers other than `$each`
+    and comparison of incomparable values are not applied.
+    """
+    if operator == "$unset":
+        return NOT_APPLIED if field.required else field.get_default()
+    if value is None:
+        return NOT_APPLIED
+    if operator == "$inc":
+        if not (_is_number(value) and _is_number(operand)):
+            return NOT_APPLIED
+        if isinstance(value, int) and not isinstance(operand, int):
+            return NOT_APPLIED
+        return value + operand
+    if operator in ("$min", "$max"):
+        try:
+            if operator == "$min":
+                return operand if operand < value else value
+            return operand if operand > value else value
+        except TypeError:
+            return NOT_APPLIED
+    if operator in ("$push", "$addToSet"):
+        items = _get_items(operand)
+        if items is None or not isinstance(value, list):
+            return NOT_APPLIED
+        result = list(value)
+        for item in items:
+            if operator == "$push" or item not in result:
+                result.append(item)
+        return result
+    return NOT_APPLIED
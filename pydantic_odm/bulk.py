@@ -0,0 +1,129 @@
+"""Bulk operations by natural key"""
+from __future__ import annotations
+
+import bson
+import hashlib
+from pydantic import BaseModel
+from pymongo import UpdateOne
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Type
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictAny, DictStrAny
+
+    from .mixins import DBPydanticMixin
+
+# Document field with content hash of upserted fields
+CONTENT_HASH_FIELD = "_content_hash"
+
+
+class BulkUpsertResult(BaseModel):
+    """Result of bulk upsert"""
+
+    matched_count: int = 0
+    modified_count: int = 0
+    upserted_count: int = 0
+    skipped_count: int = 0
+    # Ids of inserted documents by index of passed record
+    upserted_ids: Dict[int, Any] = {}
+
+
+def content_hash(data: "DictStrAny") -> str:
+    """Return hash of encoded document fields (independent of fields order)"""
+    return hashlib.sha1(bson.encode(dict(sorted(data.items())))).hexdigest()
+
+
+def get_key(data: "DictStrAny", key: Sequence[str]) -> Tuple[Any, ...]:
+    """Return values of natural key fields of document"""
+    try:
+        return tuple(data[field] for field in key)
+    except KeyError as e:
+        raise ValueError('"%s" key field is not found in document' % e.args[0])
+
+
+def build_key_query(key: Sequence[str], values: List[Tuple[Any, ...]]) -> "DictStrAny":
+    """Return query of documents by natural key values"""
+    if len(key) == 1:
+        return {key[0]: {"$in": [value[0] for value in values]}}
+    return {"$or": [dict(zip(key, value)) for value in values]}
+
+
+def build_upsert_operation(
+    data: "DictStrAny",
+    key: Sequence[str],
+    set_on_insert: Sequence[str],
+    hash_value: Optional[str] = None,
+) -> UpdateOne:
+    """Return upsert operation of document by natural key"""
+    query = dict(zip(key, get_key(data, key)))
+    update: "DictStrAny" = {}
+    fields = {
+        k: v for k, v in data.items() if k not in query and k not in set_on_insert
+    }
+    if hash_value is not None:
+        fields[CONTENT_HASH_FIELD] = hash_value
+    if fields:
+        update["$set"] = fields
+    on_insert = {k: data[k] for k in set_on_insert if k in data and k not in query}
+    if on_insert:
+        update["$setOnInsert"] = on_insert
+    if not update:
+        # Document contains only key fields
+        update["$setOnInsert"] = query
+    return UpdateOne(query, update, upsert=True)
+
+
+async def bulk_upsert(
+    model: Type["DBPydanticMixin"],
+    documents: List["DictAny"],
+    key: Sequence[str],
+    set_on_insert: Sequence[str] = (),
+    chunk_size: int = 1000,
+    skip_unchanged: bool = False,
+) -> BulkUpsertResult:
+    """
+    Insert or update encoded documents by natural key.
+
+    Documents are written by chunks of unordered `bulk_write` of
+    `UpdateOne(..., upsert=True)` operations: `set_on_insert` fields are
+    written only on insert, other fields are updated. With `skip_unchanged`
+    content hash of document is stored in `_content_hash` field and documents
+    with same hash (read by chunk before write) are not written.
+    """
+    if not key:
+        raise ValueError("Natural key is not passed")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    collection = await model.get_collection()
+    result = BulkUpsertResult()
+
+    for start in range(0, len(documents), chunk_size):
+        chunk = documents[start : start + chunk_size]
+        hashes: List[Optional[str]] = [None] * len(chunk)
+        stored_hashes: Dict[Tuple[Any, ...], Any] = {}
+        if skip_unchanged:
+            hashes = [content_hash(data) for data in chunk]
+            query = build_key_query(key, [get_key(data, key) for data in chunk])
+            projection = {field: 1 for field in [*key, CONTENT_HASH_FIELD]}
+            async for stored in collection.find(query, projection):
+                stored_hashes[get_key(stored, key)] = stored.get(CONTENT_HASH_FIELD)
+
+        operations = []
+        indexes = []
+        for i, data in enumerate(chunk):
+            if skip_unchanged and stored_hashes.get(get_key(data, key)) == hashes[i]:
+                result.skipped_count += 1
+                continue
+            operations.append(
+                build_upsert_operation(data, key, set_on_insert, hashes[i])
+            )
+            indexes.append(start + i)
+        if not operations:
+            continue
+
+        write_result = await collection.bulk_write(operations, ordered=False)
+        result.matched_count += write_result.matched_count
+        result.modified_count += write_result.modified_count
+        result.upserted_count += write_result.upserted_count
+        for operation_index, document_id in write_result.upserted_ids.items():
+            result.upserted_ids[indexes[operation_index]] = document_id
+    return result
@@ -0,0 +1,136 @@
+"""BSON codecs for encode model values in MongoDB driver"""
+from __future__ import annotations
+
+from bson import _BUILT_IN_TYPES
+from bson.codec_options import CodecOptions, TypeCodec, TypeEncoder, TypeRegistry
+from bson.decimal128 import Decimal128
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Set, Type
+
+from .encoders.mongodb import AbstractMongoDBEncoder, BaseMongoDBEncoder
+from .types import DateTimeRange
+
+if TYPE_CHECKING:
+    from pydantic.typing import AnyCallable
+
+# Python types converted by `BaseMongoDBEncoder`
+# and their converters for use in fallback encoder
+CODEC_ENCODERS: Dict[Type[Any], "AnyCallable"] = {
+    Enum: lambda value: value.value,
+    Decimal: Decimal128,
+    DateTimeRange: lambda value: value.to_mongo(),
+}
+
+
+class EnumCodec(TypeEncoder):
+    """Encode members of specific Enum class to their values"""
+
+    def __init__(self, enum_cls: Type[Enum]):
+        self._enum_cls = enum_cls
+
+    @property
+    def python_type(self) -> Type[Enum]:
+        return self._enum_cls
+
+    def transform_python(self, value: Enum) -> Any:
+        return value.value
+
+
+class DecimalCodec(TypeCodec):
+    """Encode decimal.Decimal to Decimal128 and decode it back"""
+
+    python_type = Decimal
+    bson_type = Decimal128
+
+    def transform_python(self, value: Decimal) -> Decimal128:
+        return Decimal128(value)
+
+    def transform_bson(self, value: Decimal128) -> Decimal:
+        return value.to_decimal()
+
+
+def fallback_encoder(value: Any) -> Any:
+    """Encode values of types, which are not registered in type registry"""
+    for python_type, encoder in CODEC_ENCODERS.items():
+        if isinstance(value, python_type):
+            return encoder(value)
+    return value
+
+
+def _iter_field_types(field: ModelField, seen: Set[Type[Any]]) -> Iterator[Any]:
+    yield field.type_
+    for sub_field in field.sub_fields or []:
+        yield from _iter_field_types(sub_field, seen)
+    if isinstance(field.type_, type) and issubclass(field.type_, BaseModel):
+        yield from iter_model_types(field.type_, seen)
+
+
+def iter_field_types(field: ModelField) -> Iterator[Any]:
+    """Iterate over types of model field (with nested models)"""
+    return _iter_field_types(field, set())
+
+
+def iter_model_types(
+    model: Type[BaseModel], seen: Set[Type[Any]] = None
+) -> Iterator[Any]:
+    """Iterate over types of model fields (with nested models)"""
+    if seen is None:
+        seen = set()
+    if model in seen:
+        return
+    seen.add(model)
+    for field in model.__fields__.values():
+        yield from _iter_field_types(field, seen)
+
+
+def build_type_registry(model: Type[BaseModel]) -> TypeRegistry:
+    """
+    Build type registry with codecs for Enum and Decimal types used in model.
+
+    Enums with mixed in built-in types (like `class Foo(str, Enum)`) are encoded
+    by driver natively, so codecs are registered only for pure Enums. Values of
+    other types are encoded by `fallback_encoder`.
+    """
+    type_codecs: List[Any] = [DecimalCodec()]
+    registered: Set[Type[Any]] = set()
+    for field_type in iter_model_types(model):
+        if (
+            isinstance(field_type, type)
+            and issubclass(field_type, Enum)
+            and not issubclass(field_type, _BUILT_IN_TYPES)
+            and field_type not in registered
+        ):
+            registered.add(field_type)
+            type_codecs.append(EnumCodec(field_type))
+    return TypeRegistry(type_codecs, fallback_encoder=fallback_encoder)
+
+
+@lru_cache(maxsize=None)
+def get_type_registry(model: Type[BaseModel]) -> TypeRegistry:
+    """Return type registry of model (built once per model)"""
+    return build_type_registry(model)
+
+
+@lru_cache(maxsize=None)
+def get_codec_options(model: Type[BaseModel]) -> "CodecOptions[Any]":
+    """
+    Return default codec options with type registry of model.
+
+    Collections of model keep codec options of client and get only type
+    registry of model (see `get_type_registry`).
+    """
+    return CodecOptions(type_registry=get_type_registry(model))
+
+
+def is_covered_by_codec(encoder: AbstractMongoDBEncoder) -> bool:
+    """
+    Check that python-level encoder does nothing more, than codec.
+
+    Custom encoders (subclasses of `BaseMongoDBEncoder`) may convert other types,
+    so for them python-level encoding is not skipped.
+    """
+    return type(encoder) is BaseMongoDBEncoder
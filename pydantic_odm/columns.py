@@ -0,0 +1,233 @@
+"""Columnar export of query results"""
+from __future__ import annotations
+
+import abc
+from array import array
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Type, cast
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+    from .mixins import DBPydanticMixin
+
+# Python scalar types and their column types (array typecode, numpy dtype)
+SCALAR_COLUMN_TYPES: Dict[Type[Any], Tuple[str, str]] = {
+    bool: ("b", "bool"),
+    int: ("q", "int64"),
+    float: ("d", "float64"),
+}
+# Column types of nullable scalar fields (None is stored as NaN)
+NULLABLE_COLUMN_TYPES: Dict[Type[Any], Tuple[str, str]] = {
+    int: ("d", "float64"),
+    float: ("d", "float64"),
+}
+
+
+class AbstractColumnBuffer(abc.ABC):
+    """Abstract buffer for values of one column"""
+
+    @abc.abstractmethod
+    def extend(self, values: List[Any]) -> None:
+        """Append batch of values"""
+        raise NotImplementedError()
+
+    @abc.abstractmethod
+    def result(self) -> Any:
+        """Return filled column"""
+        raise NotImplementedError()
+
+
+class ListColumnBuffer(AbstractColumnBuffer):
+    """Column of python objects"""
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+
+    def extend(self, values: List[Any]) -> None:
+        self.values.extend(values)
+
+    def result(self) -> List[Any]:
+        return self.values
+
+
+class ArrayColumnBuffer(AbstractColumnBuffer):
+    """Column of scalar values based on `array.array`"""
+
+    def __init__(self, typecode: str, null_value: Any = None):
+        self.values: "array[Any]" = array(typecode)
+        self.null_value = null_value
+
+    def extend(self, values: List[Any]) -> None:
+        if self.null_value is not None:
+            values = [self.null_value if v is None else v for v in values]
+        self.values.extend(values)
+
+    def result(self) -> "array[Any]":
+        return self.values
+
+
+class NumpyColumnBuffer(AbstractColumnBuffer):
+    """
+    Column based on numpy array.
+
+    Buffer is preallocated with passed capacity and doubled when it is filled.
+    """
+
+    def __init__(self, dtype: str, capacity: int = 1024, null_value: Any = None):
+        self.buffer = np.empty(max(capacity, 1), dtype=dtype)
+        self.size = 0
+        self.null_value = null_value
+
+    def extend(self, values: List[Any]) -> None:
+        if self.null_value is not None:
+            values = [self.null_value if v is None else v for v in values]
+        new_size = self.size + len(values)
+        if new_size > len(self.buffer):
+            capacity = len(self.buffer)
+            while capacity < new_size:
+                capacity *= 2
+            buffer = np.empty(capacity, dtype=self.buffer.dtype)
+            buffer[: self.size] = self.buffer[: self.size]
+            self.buffer = buffer
+        self.buffer[self.size : new_size] = values
+        self.size = new_size
+
+    def result(self) -> Any:
+        return self.buffer[: self.size]
+
+
+def resolve_field(model: Type[BaseModel], path: str) -> Tuple[ModelField, List[str]]:
+    """
+    Return model field and document keys by field path.
+
+    Nested models fields are passed with dot (`author.username`).
+    """
+    if not path:
+        raise ValueError("Field path is empty")
+    field: Optional[ModelField] = None
+    keys: List[str] = []
+    current_model: Any = model
+    for name in path.split("."):
+        if not (
+            isinstance(current_model, type) and issubclass(current_model, BaseModel)
+        ):
+            raise ValueError('"%s" is not a nested model field' % path)
+        field = current_model.__fields__.get(name)
+        if field is None:
+            raise ValueError(
+                '"%s" field is not found in %s' % (path, current_model.__name__)
+            )
+        # Documents are stored by field names, only root id is stored as `_id`
+        keys.append("_id" if name == "id" and not keys else name)
+        current_model = field.type_
+    return cast(ModelField, field), keys
+
+
+def create_column_buffer(
+    field: ModelField, use_numpy: bool, capacity: int
+) -> AbstractColumnBuffer:
+    """Create column buffer by field annotation"""
+    type_ = field.type_
+    if (
+        field.shape != SHAPE_SINGLETON
+        or field.sub_fields
+        or not isinstance(type_, type)
+        or issubclass(type_, Enum)
+    ):
+        column_type = None
+        null_value = None
+    elif field.allow_none:
+        column_type = NULLABLE_COLUMN_TYPES.get(type_)
+        null_value = float("nan")
+    else:
+        column_type = SCALAR_COLUMN_TYPES.get(type_)
+        null_value = None
+
+    if use_numpy:
+        if column_type:
+            return NumpyColumnBuffer(column_type[1], capacity, null_value)
+        if type_ is datetime:
+            return NumpyColumnBuffer("datetime64[ms]", capacity)
+        return NumpyColumnBuffer("object", capacity)
+    if column_type:
+        return ArrayColumnBuffer(column_type[0], null_value)
+    return ListColumnBuffer()
+
+
+def _get_value(document: "DictStrAny", keys: List[str], default: Any) -> Any:
+    value: Any = document
+    for key in keys:
+        if not isinstance(value, dict) or key not in value:
+            return default
+        value = value[key]
+    return value
+
+
+async def find_columns(
+    model: Type["DBPydanticMixin"],
+    query: "DictStrAny",
+    fields: Sequence[str],
+    batch_size: int = 1000,
+    use_numpy: bool = None,
+    capacity: int = None,
+) -> Dict[str, Any]:
+    """
+    Find documents by query and return values of fields as columns.
+
+    Column types are taken from field annotations: `bool`, `int` and `float`
+    fields are stored in typed numpy arrays (or `array.array` without numpy),
+    nullable numbers are stored as floats with NaN instead of None. With numpy
+    datetime fields are stored as `datetime64[ms]`, other values are stored
+    in object arrays (lists without numpy). Values are not converted to
+    model field types, so enums are returned as stored values.
+
+    Parameters:
+        - `query`: pymongo query
+        - `fields`: field names (nested fields are passed with dot)
+        - `batch_size`: count of documents, which are appended to columns at once
+        - `use_numpy`: store columns in numpy arrays (by default if it installed)
+        - `capacity`: preallocated size of numpy arrays (expected documents count)
+    """
+    if use_numpy is None:
+        use_numpy = np is not None
+    elif use_numpy and np is None:
+        raise RuntimeError("numpy is not installed")
+
+    columns = []
+    for path in fields:
+        field, keys = resolve_field(model, path)
+        default = model._encode_dict_to_mongo({"value": field.default})["value"]
+        buffer = create_column_buffer(field, use_numpy, capacity or batch_size)
+        columns.append((path, keys, default, buffer))
+
+    projection: "DictStrAny" = {".".join(keys): 1 for _, keys, _, _ in columns}
+    if "_id" not in projection:
+        projection["_id"] = 0
+
+    collection = await model.get_collection()
+    cursor = collection.find(model._encode_query(query), projection)
+    cursor.batch_size(batch_size)
+
+    def flush(batch: List["DictStrAny"]) -> None:
+        for _, keys, default, buffer in columns:
+            buffer.extend([_get_value(document, keys, default) for document in batch])
+
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    return {path: buffer.result() for path, _, _, buffer in columns}
@@ -0,0 +1,98 @@
+"""Cursor wrappers"""
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional, Union
+
+if TYPE_CHECKING:
+    from motor import motor_asyncio
+
+
+class PrefetchCursor:
+    """
+    Cursor wrapper, which reads next batches while current batch is processed.
+
+    Batches are read by background task into queue of `depth` batches, so
+    network fetches (`getMore`) overlap with decoding of documents, and not
+    more than `depth + 2` batches are kept in memory (queued batches, current
+    batch and fetched batch waiting for free place in queue).
+
+    Usage::
+
+        cursor = PrefetchCursor(collection.find(query), batch_size=500, depth=2)
+        async for batch in cursor.batches():
+            ...
+    """
+
+    def __init__(
+        self,
+        cursor: motor_asyncio.AsyncIOMotorCursor,
+        batch_size: int = 1000,
+        depth: int = 2,
+    ):
+        if batch_size < 1 or depth < 1:
+            raise ValueError("Batch size and depth must be positive")
+        self.cursor = cursor
+        self.cursor.batch_size(batch_size)
+        self.batch_size = batch_size
+        self.depth = depth
+        self._queue: "asyncio.Queue[Union[List[Any], Exception, None]]" = (
+            asyncio.Queue(maxsize=depth)
+        )
+        self._task: Optional["asyncio.Future[None]"] = None
+        self._batch: List[Any] = []
+        self._finished = False
+
+    async def _fetch(self) -> None:
+        try:
+            while True:
+                batch = await self.cursor.to_list(length=self.batch_size)
+                if not batch:
+                    break
+                await self._queue.put(batch)
+            await self._queue.put(None)
+        except Exception as e:
+            await self._queue.put(e)
+
+    async def next_batch(self) -> Optional[List[Any]]:
+        """Return next batch of documents or None if cursor is exhausted"""
+        if self._finished:
+            return None
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._fetch())
+        batch = await self._queue.get()
+        if batch is None or isinstance(batch, Exception):
+            self._finished = True
+            if batch is not None:
+                raise batch
+        return batch
+
+    async def batches(self) -> AsyncIterator[List[Any]]:
+        """Iterate over batches of documents"""
+        try:
+            while True:
+                batch = await self.next_batch()
+                if batch is None:
+                    break
+                yield batch
+        finally:
+            await self.close()
+
+    def __aiter__(self) -> PrefetchCursor:
+        return self
+
+    async def __anext__(self) -> Any:
+        while not self._batch:
+            batch = await self.next_batch()
+            if batch is None:
+                raise StopAsyncIteration
+            self._batch = batch[::-1]
+        return self._batch.pop()
+
+    async def close(self) -> None:
+        """Stop reading of next batches and close cursor"""
+        self._finished = True
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        await self.cursor.close()
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import abc
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from pydantic.typing import DictStrAny
@@ -16,6 +16,10 @@ class AbstractMongoDBDecoder(abc.ABC):
         """Main mongodb encoder func"""
         raise NotImplementedError()
 
+    def decode_value(self, value: Any) -> Any:
+        """Decode single value of mongodb document"""
+        return self({"value": value})["value"]
+
 
 class BaseMongoDBDecoder(AbstractMongoDBDecoder):
     """Base MongoDB decoder"""
@@ -31,15 +35,17 @@ class BaseMongoDBDecoder(AbstractMongoDBDecoder):
         document_id = data.pop("_id", None)
         decoded_data = {"id": document_id}
         for k, v in data.items():
-            if isinstance(v, list):
-                v_list = []
-                for item in v:
-                    if isinstance(item, dict):
-                        item = self.__call__(item)
-                    v_list.append(item)
-                decoded_data[k] = v_list
-            elif isinstance(v, dict):
-                decoded_data[k] = self.__call__(v)
-            else:
-                decoded_data[k] = v
+            decoded_data[k] = self.decode_value(v)
         return decoded_data
+
+    def decode_value(self, value: Any) -> Any:
+        if isinstance(value, list):
+            v_list = []
+            for item in value:
+                if isinstance(item, dict):
+                    item = self.__call__(item)
+                v_list.append(item)
+            return v_list
+        elif isinstance(value, dict):
+            return self.__call__(value)
+        return value
@@ -0,0 +1,253 @@
+"""Code-generated encoders of pydantic models for MongoDB"""
+from __future__ import annotations
+
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from itertools import count
+from pydantic import BaseModel, Extra
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON, ModelField
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Dict, Tuple, Type
+from uuid import UUID
+
+from .mongodb import BaseMongoDBEncoder, BaseMongoDBModelEncoder
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+    from ..mixins import BaseDBMixin
+
+    ModelEncodeFunc = Callable[[BaseModel], DictStrAny]
+
+# Types, which values are passed to MongoDB as is
+PLAIN_TYPES: Tuple[Type[Any], ...] = (
+    str,
+    int,
+    float,
+    bool,
+    bytes,
+    datetime,
+    date,
+    time,
+    ObjectId,
+    UUID,
+)
+
+_value_encoder = BaseMongoDBEncoder()
+
+
+def _to_python(value: Any) -> Any:
+    """Convert value like `pydantic.BaseModel.dict()`"""
+    return BaseModel._get_value(
+        value,
+        to_dict=True,
+        by_alias=False,
+        include=None,
+        exclude=None,
+        exclude_unset=False,
+        exclude_defaults=False,
+        exclude_none=False,
+    )
+
+
+def _encode_value(value: Any) -> Any:
+    """Encode value of not specialized type like generic pipeline"""
+    return _value_encoder({"value": _to_python(value)})["value"]
+
+
+@lru_cache(maxsize=None)
+def has_custom_serialization(model_cls: Type[BaseModel]) -> bool:
+    """Check that model overrides `dict()` or `json()` of base models"""
+    from ..mixins import BaseDBMixin  # noqa: circular import
+
+    for name, defaults in (("dict", (BaseModel, BaseDBMixin)), ("json", (BaseModel,))):
+        owner = next(klass for klass in model_cls.__mro__ if name in vars(klass))
+        if owner not in defaults:
+            return True
+    return False
+
+
+def is_plain_model(model_cls: Type[BaseModel]) -> bool:
+    """Check that `dict()` of model returns only values of declared fields"""
+    return (
+        model_cls.__config__.extra is not Extra.allow
+        and getattr(model_cls, "__exclude_fields__", None) is None
+        and getattr(model_cls, "__include_fields__", None) is None
+        and not has_custom_serialization(model_cls)
+    )
+
+
+class ModelEncoderCompiler:
+    """
+    Generate encode function for pydantic model from its fields.
+
+    Generated function reads values directly from instance `__dict__`
+    and returns dict ready for MongoDB driver. Enum, Decimal and nested models
+    conversions are inlined, values of plain types are copied as is.
+    Values of other types are encoded by generic pipeline.
+
+    With `convert=False` Enum and Decimal values are left for BSON codec.
+    """
+
+    def __init__(self, convert: bool = True):
+        self.convert = convert
+        self._encoders: Dict[Type[BaseModel], "ModelEncodeFunc"] = {}
+        self._lock = Lock()
+
+    def get_encoder(self, model_cls: Type[BaseModel]) -> "ModelEncodeFunc":
+        """Return encode function of model class (generated on first use)"""
+        encoder = self._encoders.get(model_cls)
+        if encoder is None:
+            with self._lock:
+                encoder = self._encoders.get(model_cls)
+                if encoder is None:
+                    encoder = self.compile(model_cls)
+                    self._encoders[model_cls] = encoder
+        return encoder
+
+    def fallback(self, value: Any) -> Any:
+        if self.convert:
+            return _encode_value(value)
+        return _to_python(value)
+
+    def encode_nested(self, value: Any) -> Any:
+        if isinstance(value, BaseModel) and is_plain_model(value.__class__):
+            if value.__dict__.get("_raw") is not None:
+                # Lazy model loads all fields before encoding
+                value._materialize()  # type: ignore
+            return self.get_encoder(value.__class__)(value)
+        return self.fallback(value)
+
+    def compile(self, model_cls: Type[BaseModel]) -> "ModelEncodeFunc":
+        """Generate encode function of model class"""
+        names = count()
+        namespace: Dict[str, Any] = {
+            "_Enum": Enum,
+            "_Decimal": Decimal,
+            "_Decimal128": Decimal128,
+            "_fallback": self.fallback,
+            "_nested": self.encode_nested,
+        }
+        lines = ["def encode(model):", "    d = model.__dict__"]
+        items = []
+        for name, field in model_cls.__fields__.items():
+            var = "v%d" % next(names)
+            expression = self._field_expression(field, var, names)
+            if expression == var:
+                items.append("        %r: d[%r]," % (name, name))
+            else:
+                lines.append("    %s = d[%r]" % (var, name))
+                items.append("        %r: %s," % (name, expression))
+        lines.extend(["    return {", *items, "    }"])
+        source = "\n".join(lines)
+        code = compile(source, "<encoder of %s>" % model_cls.__qualname__, "exec")
+        exec(code, namespace)  # noqa: S102
+        encode = namespace["encode"]
+        encode.__source__ = source
+        return encode
+
+    def _field_expression(
+        self, field: ModelField, var: str, names: "count[int]"
+    ) -> str:
+        if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+            expression = self._type_expression(field.type_, var)
+        elif field.shape == SHAPE_LIST and field.sub_fields:
+            item_var = "v%d" % next(names)
+            item = self._field_expression(field.sub_fields[0], item_var, names)
+            if item == item_var:
+                expression = "list(%s)" % var
+            else:
+                expression = "[%s for %s in %s]" % (item, item_var, var)
+            if field.allow_none:
+                expression = "(None if %s is None else %s)" % (var, expression)
+        else:
+            expression = "_fallback(%s)" % var
+        return expression
+
+    def _type_expression(self, type_: Any, var: str) -> str:
+        if not isinstance(type_, type):
+            return "_fallback(%s)" % var
+        if issubclass(type_, Enum):
+            if not self.convert:
+                return var
+            return "(%s.value if isinstance(%s, _Enum) else %s)" % (var, var, var)
+        if issubclass(type_, Decimal):
+            if not self.convert:
+                return var
+            return "(_Decimal128(%s) if isinstance(%s, _Decimal) else %s)" % (
+                var,
+                var,
+                var,
+            )
+        if issubclass(type_, BaseModel):
+            return "(None if %s is None else _nested(%s))" % (var, var)
+        if issubclass(type_, PLAIN_TYPES):
+            return var
+        return "_fallback(%s)" % var
+
+
+class CompiledMongoDBModelEncoder(BaseMongoDBModelEncoder):
+    """
+    Model encoder based on code-generated functions.
+
+    Generated function is used when model is encoded entirely (may be without
+    some top-level fields) and model use default encoder. In other cases
+    encoding is delegated to generic pipeline.
+    """
+
+    def __init__(self) -> None:
+        self.compilers = {
+            True: ModelEncoderCompiler(convert=True),
+            False: ModelEncoderCompiler(convert=False),
+        }
+
+    def is_supported(self, model: "BaseDBMixin") -> bool:
+        """Check that generated function encode model like generic pipeline"""
+        model_cls = model.__class__
+        return type(model_cls._mongodb_encoder) is BaseMongoDBEncoder and (
+            is_plain_model(model_cls)
+        )
+
+    def __call__(
+        self,
+        model: "BaseDBMixin",
+        include: Any = None,
+        exclude: Any = None,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> "DictStrAny":
+        if (
+            include is not None
+            or exclude_unset
+            or exclude_defaults
+            or exclude_none
+            or (exclude is not None and not isinstance(exclude, (set, frozenset)))
+            or not self.is_supported(model)
+        ):
+            return super().__call__(
+                model,
+                include=include,
+                exclude=exclude,
+                exclude_unset=exclude_unset,
+                exclude_defaults=exclude_defaults,
+                exclude_none=exclude_none,
+            )
+
+        # Lazy models load all fields before encoding
+        model._materialize()
+        compiler = self.compilers[not model._is_encoded_by_codec()]
+        data = compiler.get_encoder(model.__class__)(model)
+        if exclude:
+            for field_name in exclude:
+                data.pop(field_name, None)
+        return data
+
+
+def get_encoder_source(model_cls: Type[BaseModel], convert: bool = True) -> str:
+    """Return source of generated encode function (for debug)"""
+    return ModelEncoderCompiler(convert).compile(model_cls).__source__  # type: ignore
@@ -0,0 +1,80 @@
+"""Conversion of ObjectId strings in MongoDB queries"""
+from __future__ import annotations
+
+from bson import ObjectId
+from functools import lru_cache
+from pydantic import BaseModel
+from typing import TYPE_CHECKING, Any, FrozenSet, Type
+
+from ..codecs import iter_field_types
+from ..types import OBJECT_ID_PATTERN, NativeObjectId
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+# Operators, which operands are compared with field value
+COMPARISON_OPERATORS = ("$eq", "$ne", "$gt", "$gte", "$lt", "$lte")
+# Operators, which operands are lists of compared values
+LIST_OPERATORS = ("$in", "$nin", "$all")
+# Operators, which operands are lists of queries
+LOGICAL_OPERATORS = ("$and", "$or", "$nor")
+
+
+def to_object_id(value: Any) -> Any:
+    """Return ObjectId of valid ObjectId string (other values are returned as is)"""
+    if isinstance(value, str) and OBJECT_ID_PATTERN.match(value):
+        return ObjectId(value)
+    return value
+
+
+@lru_cache(maxsize=None)
+def get_object_id_keys(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Return document keys of model, which values are stored as ObjectId"""
+    keys = {"_id"}
+    for name, field in model.__fields__.items():
+        if name != "id" and any(
+            isinstance(field_type, type) and issubclass(field_type, NativeObjectId)
+            for field_type in iter_field_types(field)
+        ):
+            keys.update((name, field.alias))
+    return frozenset(keys)
+
+
+def convert_id_condition(condition: Any) -> Any:
+    """Convert value or operators expression of ObjectId field"""
+    if not isinstance(condition, dict) or not all(
+        isinstance(k, str) and k.startswith("$") for k in condition
+    ):
+        return to_object_id(condition)
+    converted = {}
+    for operator, operand in condition.items():
+        if operator in COMPARISON_OPERATORS:
+            operand = to_object_id(operand)
+        elif operator in LIST_OPERATORS and isinstance(operand, (list, tuple, set)):
+            operand = [to_object_id(value) for value in operand]
+        elif operator == "$not":
+            operand = convert_id_condition(operand)
+        converted[operator] = operand
+    return converted
+
+
+def convert_query_ids(query: "DictStrAny", keys: FrozenSet[str]) -> "DictStrAny":
+    """
+    Return query with ObjectId instead of ObjectId strings for passed keys.
+
+    Model field `id` is renamed to `_id`. Values are converted in equality
+    conditions, comparison and `$in`/`$nin`/`$all` operators and in nested
+    queries of `$and`/`$or`/`$nor`.
+    """
+    converted = {}
+    for key, value in query.items():
+        if key == "id":
+            key = "_id"
+        if key in LOGICAL_OPERATORS and isinstance(value, (list, tuple)):
+            value = [
+                convert_query_ids(q, keys) if isinstance(q, dict) else q for q in value
+            ]
+        elif key in keys:
+            value = convert_id_condition(value)
+        converted[key] = value
+    return converted
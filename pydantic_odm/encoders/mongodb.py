@@ -7,9 +7,13 @@ from decimal import Decimal
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Callable, List, Union, cast
 
+from ..types import DateTimeRange
+
 if TYPE_CHECKING:
     from pydantic.typing import DictStrAny
 
+    from ..mixins import BaseDBMixin
+
 
 class AbstractMongoDBEncoder(abc.ABC):
     """Abstract MongoDB encoder"""
@@ -50,6 +54,26 @@ def _recursive_iterator(
     return _data
 
 
+def _enum_to_value(value: Union[Any, Enum]) -> Any:
+    if isinstance(value, Enum):
+        value = value.value
+    return value
+
+
+def _python_decimal_to_bson_decimal(
+    value: Union[Any, Decimal]
+) -> Union[Any, Decimal128]:
+    if isinstance(value, Decimal):
+        value = Decimal128(value)
+    return value
+
+
+def _range_to_operators(value: Union[Any, DateTimeRange]) -> Any:
+    if isinstance(value, DateTimeRange):
+        value = value.to_mongo()
+    return value
+
+
 def _convert_enums(
     data: Union["DictStrAny", List[Any]]
 ) -> Union["DictStrAny", List[Any]]:
@@ -58,13 +82,7 @@ def _convert_enums(
 
     Note: May be this solution not good
     """
-
-    def enum_to_value(value: Union[Any, Enum]) -> Any:
-        if isinstance(value, Enum):
-            value = value.value
-        return value
-
-    return _recursive_iterator(data, enum_to_value)
+    return _recursive_iterator(data, _enum_to_value)
 
 
 def _convert_decimals(
@@ -73,21 +91,66 @@ def _convert_decimals(
     """
     Convert decimal.Decimal to bson.decimal128.Decimal128
     """
+    return _recursive_iterator(data, _python_decimal_to_bson_decimal)
 
-    def python_decimal_to_bson_decimal(
-        value: Union[Any, Decimal]
-    ) -> Union[Any, Decimal128]:
-        if isinstance(value, Decimal):
-            value = Decimal128(value)
-        return value
 
-    return _recursive_iterator(data, python_decimal_to_bson_decimal)
+def _convert_datetime_ranges(
+    data: Union["DictStrAny", List[Any]]
+) -> Union["DictStrAny", List[Any]]:
+    """
+    Convert DateTimeRange to range operators for mongo query
+    """
+    return _recursive_iterator(data, _range_to_operators)
+
+
+def _to_mongo_value(value: Any) -> Any:
+    """Apply all conversions of `BaseMongoDBEncoder` to value"""
+    value = _range_to_operators(value)
+    value = _enum_to_value(value)
+    return _python_decimal_to_bson_decimal(value)
 
 
 class BaseMongoDBEncoder(AbstractMongoDBEncoder):
-    """Base MongoDB encoder"""
+    """Base MongoDB encoder (converts values by one pass over data)"""
 
     def __call__(self, data: "DictStrAny") -> "DictStrAny":
-        data = cast("DictStrAny", _convert_enums(data))
-        data = cast("DictStrAny", _convert_decimals(data))
-        return data
+        return cast("DictStrAny", _recursive_iterator(data, _to_mongo_value))
+
+
+class AbstractMongoDBModelEncoder(abc.ABC):
+    """Abstract encoder of model instances for MongoDB"""
+
+    @abc.abstractmethod
+    def __call__(
+        self,
+        model: "BaseDBMixin",
+        include: Any = None,
+        exclude: Any = None,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> "DictStrAny":
+        """Convert model to dict supported MongoDB (arguments like pydantic.dict())"""
+        raise NotImplementedError()
+
+
+class BaseMongoDBModelEncoder(AbstractMongoDBModelEncoder):
+    """Generic model encoder: `model.dict()` and then model dict encoder"""
+
+    def __call__(
+        self,
+        model: "BaseDBMixin",
+        include: Any = None,
+        exclude: Any = None,
+        exclude_unset: bool = False,
+        exclude_defaults: bool = False,
+        exclude_none: bool = False,
+    ) -> "DictStrAny":
+        model_as_dict = model.dict(
+            include=include,
+            exclude=exclude,
+            exclude_unset=exclude_unset,
+            exclude_defaults=exclude_defaults,
+            exclude_none=exclude_none,
+        )
+        return model._encode_dict_to_mongo(model_as_dict)
@@ -1,5 +1,6 @@
-"""Additional scheme pydantic validation errors"""
+"""Additional errors (include scheme pydantic validation errors)"""
 from pydantic.errors import PydanticValueError
+from typing import List, Tuple
 
 
 class RangeBorderCrossing(PydanticValueError):
@@ -9,3 +10,19 @@ class RangeBorderCrossing(PydanticValueError):
 
 class DatetimeBorderCrossing(RangeBorderCrossing):
     code = "datetime_range.border_crossing"
+
+
+class AdmissionRejected(RuntimeError):
+    """Operation is rejected by admission limiter (see pydantic_odm.admission)"""
+
+
+class DocumentValidationError(ValueError):
+    """
+    Pre-save validation of documents is failed (see pydantic_odm.validation).
+
+    `errors` is list of (index of document, field name, message).
+    """
+
+    def __init__(self, errors: List[Tuple[int, str, str]]):
+        self.errors = errors
+        super().__init__("; ".join('document %d, "%s": %s' % error for error in errors))
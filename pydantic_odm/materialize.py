@@ -0,0 +1,83 @@
+"""Materialization of query results in executor"""
+from __future__ import annotations
+
+import asyncio
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, List, Type
+
+if TYPE_CHECKING:
+    from motor import motor_asyncio
+    from pydantic.typing import DictStrAny
+
+    from .mixins import DBPydanticMixin
+
+
+def materialize_batch(
+    model: Type["DBPydanticMixin"],
+    data: bytes,
+    codec_options: "CodecOptions[DictStrAny]",
+    snapshot: str = None,
+) -> List["DBPydanticMixin"]:
+    """
+    Decode and validate batch of BSON documents.
+
+    Called in executor, so it is module-level function with picklable arguments
+    (models of processes pool executor must be importable).
+    """
+    return [
+        model._from_mongo_document(document, snapshot)
+        for document in bson.decode_all(data, codec_options)
+    ]
+
+
+async def find_in_executor(
+    model: Type["DBPydanticMixin"],
+    collection: motor_asyncio.AsyncIOMotorCollection,
+    query: "DictStrAny",
+    executor: Executor,
+    batch_size: int,
+    snapshot: str = None,
+) -> List["DBPydanticMixin"]:
+    """
+    Find documents and materialize models in executor.
+
+    Documents are read as raw BSON, so they are not decoded in event loop.
+    Every `batch_size` documents are sent to executor as one bytes string
+    while cursor reads next documents, remaining documents (less than batch
+    size) are sent as last batch.
+    """
+    codec_options = collection.codec_options.with_options(document_class=dict)
+    raw_collection = collection.with_options(
+        codec_options=codec_options.with_options(document_class=RawBSONDocument)
+    )
+    loop = asyncio.get_event_loop()
+    pending = []
+    batch: List[bytes] = []
+
+    def submit() -> None:
+        pending.append(
+            loop.run_in_executor(
+                executor,
+                materialize_batch,
+                model,
+                b"".join(batch),
+                codec_options,
+                snapshot,
+            )
+        )
+
+    async for document in raw_collection.find(query, batch_size=batch_size):
+        batch.append(document.raw)
+        if len(batch) >= batch_size:
+            submit()
+            batch = []
+    if batch:
+        submit()
+
+    models = []
+    for batch_models in await asyncio.gather(*pending):
+        models.extend(batch_models)
+    return models
@@ -0,0 +1,269 @@
+"""Schema versions of documents with lazy upgrade on load"""
+from __future__ import annotations
+
+import asyncio
+import bson
+import copy
+import logging
+from bson.raw_bson import RawBSONDocument
+from functools import lru_cache
+from pydantic import BaseModel
+from pymongo import UpdateOne
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Dict, Optional, Set, Tuple, Type
+from weakref import WeakKeyDictionary
+
+from .writebehind import WriteBehindBuffer
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+    from typing import Callable
+
+    from .mixins import DBPydanticMixin
+
+    SchemaUpgrade = Callable[[Type["DBPydanticMixin"], DictStrAny], DictStrAny]
+
+logger = logging.getLogger(__name__)
+
+# Attribute of function with schema version, which is upgraded by function
+UPGRADE_VERSION_ATTR = "__schema_upgrade_version__"
+
+# Write-back buffers of upgraded documents of models
+_buffers: "WeakKeyDictionary[Type[DBPydanticMixin], UpgradeBuffer]" = (
+    WeakKeyDictionary()
+)
+# Tasks, which add upgraded documents to write-back buffers
+_tasks: "Set[asyncio.Future[None]]" = set()
+
+
+class MigrationResult(BaseModel):
+    """Result of schema migration of collection"""
+
+    scanned_count: int = 0
+    modified_count: int = 0
+    # Id of last processed document (pass it as `start_after` for resume)
+    last_id: Any = None
+
+
+def schema_upgrade(from_version: int) -> Callable[["SchemaUpgrade"], "SchemaUpgrade"]:
+    """
+    Register upgrade of stored document from schema version to next version.
+
+    Upgrade is called with model class and copy of MongoDB document (as it is
+    stored, with `_id` key) and returns upgraded document. Documents without
+    version field have version 0.
+
+    Usage::
+
+        class User(DBPydanticMixin):
+            full_name: str
+
+            class Config:
+                collection = "user"
+                schema_version = 1
+
+            @schema_upgrade(0)
+            def join_name(cls, document):
+                document["full_name"] = "%s %s" % (
+                    document.pop("first_name"),
+                    document.pop("last_name"),
+                )
+                return document
+    """
+
+    def decorator(func: "SchemaUpgrade") -> "SchemaUpgrade":
+        setattr(func, UPGRADE_VERSION_ATTR, from_version)
+        return func
+
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def get_upgrades(model: Type["DBPydanticMixin"]) -> Dict[int, "SchemaUpgrade"]:
+    """Return schema upgrades of model by upgraded version (with inherited)"""
+    upgrades: Dict[int, "SchemaUpgrade"] = {}
+    for klass in reversed(model.__mro__):
+        for func in vars(klass).values():
+            version = getattr(func, UPGRADE_VERSION_ATTR, None)
+            if version is not None:
+                upgrades[version] = func
+    return upgrades
+
+
+def get_schema_version(model: Type["DBPydanticMixin"]) -> Tuple[str, int]:
+    """Return document key and current schema version of model"""
+    return (
+        getattr(model.Config, "schema_version_field", "_schema_version"),
+        getattr(model.Config, "schema_version", 0),
+    )
+
+
+def stamp_version(model: Type["DBPydanticMixin"], document: "DictStrAny") -> None:
+    """Set current schema version of model to new document"""
+    field, version = get_schema_version(model)
+    if version:
+        document[field] = version
+
+
+def upgrade_document(
+    model: Type["DBPydanticMixin"], document: "DictStrAny"
+) -> "DictStrAny":
+    """Return document upgraded to current schema version of model"""
+    field, version = get_schema_version(model)
+    current = document.get(field) or 0
+    upgrades = get_upgrades(model)
+    # Upgrades may change nested values in place, original is kept for write-back
+    upgraded = copy.deepcopy(document)
+    for from_version in range(current, version):
+        upgrade = upgrades.get(from_version)
+        if upgrade is None:
+            raise RuntimeError(
+                '"%s" model has not schema upgrade from version %d'
+                % (model.__name__, from_version)
+            )
+        upgraded = upgrade(model, upgraded)
+    upgraded[field] = version
+    return upgraded
+
+
+def build_write_back(
+    original: "DictStrAny", upgraded: "DictStrAny"
+) -> Tuple["DictStrAny", "DictStrAny"]:
+    """
+    Return filter and update of upgraded document.
+
+    Filter matches document only if upgraded keys still have original values,
+    so write-back doesn't overwrite concurrent changes of document.
+    """
+    set_fields = {
+        k: v
+        for k, v in upgraded.items()
+        if k != "_id" and (k not in original or original[k] != v)
+    }
+    unset_fields = {k: "" for k in original if k not in upgraded}
+    query: "DictStrAny" = {"_id": original["_id"]}
+    for key in (*set_fields, *unset_fields):
+        query[key] = original[key] if key in original else {"$exists": False}
+    update: "DictStrAny" = {"$set": set_fields}
+    if unset_fields:
+        update["$unset"] = unset_fields
+    return query, update
+
+
+class UpgradeBuffer(WriteBehindBuffer):
+    """Write-back buffer of upgraded documents (conditional updates)"""
+
+    def build_operation(self, document_id: Any, fields: "DictStrAny") -> UpdateOne:
+        return UpdateOne(fields["filter"], fields["update"])
+
+
+def get_upgrade_buffer(model: Type["DBPydanticMixin"]) -> UpgradeBuffer:
+    """Return write-back buffer of model (created on first use)"""
+    buffer = _buffers.get(model)
+    if buffer is None:
+        buffer = UpgradeBuffer(
+            max_size=getattr(model.Config, "write_behind_max_size", 1000),
+            max_latency=getattr(model.Config, "write_behind_max_latency", 1.0),
+            max_retries=getattr(model.Config, "write_behind_max_retries", 3),
+        )
+        _buffers[model] = buffer
+    return buffer
+
+
+async def _add_write_back(
+    model: Type["DBPydanticMixin"], original: "DictStrAny", upgraded: "DictStrAny"
+) -> None:
+    query, update = build_write_back(original, upgraded)
+    try:
+        collection = await model.get_collection()
+        await get_upgrade_buffer(model).add(
+            collection, original["_id"], {"filter": query, "update": update}
+        )
+    except Exception:
+        logger.exception("Write-back of upgraded document failed")
+
+
+def upgrade_loaded(model: Type["DBPydanticMixin"], document: "DictStrAny") -> Any:
+    """
+    Upgrade document loaded from MongoDB and queue it for write-back.
+
+    Documents of current version (including raw BSON documents) are returned
+    as is. Write-back is queued only in event loop thread (documents decoded
+    in executor are upgraded by `migrate` later).
+    """
+    field, version = get_schema_version(model)
+    if (document.get(field) or 0) >= version:
+        return document
+    if isinstance(document, RawBSONDocument):
+        document = bson.decode(document.raw)
+    upgraded = upgrade_document(model, document)
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return upgraded
+    task = asyncio.ensure_future(_add_write_back(model, document, upgraded))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return upgraded
+
+
+async def flush_upgrades() -> int:
+    """
+    Write upgraded documents of all models and return count of written documents.
+
+    Call it on application shutdown with `writebehind.flush_all`.
+    """
+    if _tasks:
+        await asyncio.gather(*_tasks)
+    written = 0
+    for buffer in list(_buffers.values()):
+        written += await buffer.flush()
+    return written
+
+
+async def migrate(
+    model: Type["DBPydanticMixin"],
+    batch_size: int = 500,
+    max_rate: Optional[float] = None,
+    start_after: Any = None,
+    progress: Optional[Callable[[MigrationResult], Any]] = None,
+) -> MigrationResult:
+    """
+    Upgrade stored documents of old schema versions by batches.
+
+    Documents are read in `_id` order and written by one unordered
+    `bulk_write` per batch of conditional updates. With `max_rate` (documents
+    per second) runner sleeps between batches. `progress` is called with
+    result after every batch, `last_id` of result can be passed as
+    `start_after` for resume of interrupted migration.
+    """
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive")
+    field, version = get_schema_version(model)
+    result = MigrationResult(last_id=start_after)
+    if not version:
+        return result
+    collection = await model.get_collection()
+    started = monotonic()
+    while True:
+        query: "DictStrAny" = {field: {"$not": {"$gte": version}}}
+        if result.last_id is not None:
+            query["_id"] = {"$gt": result.last_id}
+        cursor = collection.find(query).sort("_id", 1).limit(batch_size)
+        documents = await cursor.to_list(length=batch_size)
+        if not documents:
+            return result
+        operations = [
+            UpdateOne(*build_write_back(document, upgrade_document(model, document)))
+            for document in documents
+        ]
+        bulk_result = await collection.bulk_write(operations, ordered=False)
+        result.scanned_count += len(documents)
+        result.modified_count += bulk_result.modified_count
+        result.last_id = documents[-1]["_id"]
+        if progress is not None:
+            progress(result)
+        if max_rate:
+            delay = result.scanned_count / max_rate - (monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
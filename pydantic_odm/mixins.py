@@ -2,20 +2,99 @@
 from __future__ import annotations
 
 import abc
+import bson
 from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from functools import lru_cache
 from motor import motor_asyncio
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
+from pydantic.error_wrappers import ErrorWrapper
+from pydantic.errors import MissingError
 from pymongo.collection import Collection, ReturnDocument
-from typing import TYPE_CHECKING, Any, List, Optional, Union, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Union, cast
+from weakref import WeakKeyDictionary
 
+from . import admission, bulk, columns, materialize, pagination, scan, writebehind
+from .atomic import NOT_APPLIED, SUPPORTED_OPERATORS, apply_operation
+from .codecs import get_type_registry, is_covered_by_codec, iter_field_types
+from .cursors import PrefetchCursor
 from .db import get_db_manager
 from .decoders.mongodb import AbstractMongoDBDecoder, BaseMongoDBDecoder
+from .encoders.codegen import CompiledMongoDBModelEncoder
+from .encoders.ids import convert_query_ids, get_object_id_keys, to_object_id
 from .encoders.mongodb import AbstractMongoDBEncoder, BaseMongoDBEncoder
-from .types import ObjectIdStr
+from .migrations import (
+    MigrationResult,
+    build_write_back,
+    migrate,
+    stamp_version,
+    upgrade_loaded,
+)
+from .prepared import PreparedQuery
+from .purge import PurgeResult, purge
+from .query import Query, get_covering_projection
+from .snapshots import SNAPSHOT_NONE, changed_fields, create_snapshot, update_snapshot
+from .tenancy import CollectionLRUCache, get_current_tenant
+from .types import DateTimeRange, ObjectIdStr
+from .validation import validate_documents
 
 if TYPE_CHECKING:
     from pydantic.typing import MappingIntStrAny  # isort: skip
+    from pydantic.typing import ReprArgs, TupleGenerator  # isort: skip
+    from concurrent.futures import Executor
     from pydantic.typing import AbstractSetIntStr, DictAny, DictIntStrAny, DictStrAny
+    from typing import AsyncIterator, Callable, FrozenSet, Sequence, Type
+
+    from .admission import AdmissionLimiter
+    from .encoders.mongodb import AbstractMongoDBModelEncoder
+    from .pagination import SortType
+    from .prepared import IndexType
+    from .tenancy import AbstractTenantResolver
+
+
+# Collection handles configured by model settings (see `_configure_collection`)
+_configured_handles: "WeakKeyDictionary[Type[BaseDBMixin], CollectionLRUCache]" = (
+    WeakKeyDictionary()
+)
+
+
+def _raw_bson_to_python(value: Any) -> Any:
+    """Decode nested raw BSON documents to python dicts"""
+    if isinstance(value, RawBSONDocument):
+        return bson.decode(value.raw)
+    if isinstance(value, list):
+        return [_raw_bson_to_python(item) for item in value]
+    return value
+
+
+class EmbeddedDocument(BaseModel):
+    """
+    Base class for documents, which are only embedded to other documents.
+
+    Embedded documents have no id (if it is not declared), snapshot and lazy
+    loading state. Fields, which contain only embedded documents, are passed
+    to validation as is, without decoding pass of MongoDB decoder.
+    """
+
+    class Config:
+        allow_population_by_field_name = True
+        json_encoders: "DictAny" = {ObjectId: lambda v: ObjectIdStr(v)}
+
+
+@lru_cache(maxsize=None)
+def get_embedded_fields(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Return document keys of model fields, which contain only embedded documents"""
+    keys = set()
+    for field in model.__fields__.values():
+        models = [
+            field_type
+            for field_type in iter_field_types(field)
+            if isinstance(field_type, type) and issubclass(field_type, BaseModel)
+        ]
+        if models and all(issubclass(m, EmbeddedDocument) for m in models):
+            # Documents are stored by field names (not aliases)
+            keys.add(field.name)
+    return frozenset(keys)
 
 
 class BaseDBMixin(BaseModel, abc.ABC):
@@ -25,31 +104,178 @@ class BaseDBMixin(BaseModel, abc.ABC):
 
     # Read-only (for public) field for store MongoDB id
     _doc: "DictAny" = {}
+    # Raw BSON document of lazy model (see `DBPydanticMixin.Config.lazy`)
+    _raw: Optional[RawBSONDocument] = None
+    # Update of document upgraded on load, which is not written yet
+    # (see `DBPydanticMixin.Config.schema_version`)
+    _upgrade: Optional["DictStrAny"] = None
 
     # Encoders and decoders
     _mongodb_encoder: AbstractMongoDBEncoder = BaseMongoDBEncoder()
     _mongo_decoder: AbstractMongoDBDecoder = BaseMongoDBDecoder()
+    # Encoder of model instances (replace by `BaseMongoDBModelEncoder()`
+    # for use generic `dict()` based pipeline)
+    _model_encoder: AbstractMongoDBModelEncoder = CompiledMongoDBModelEncoder()
 
     class Config:
         allow_population_by_field_name = True
         json_encoders: "DictAny" = {ObjectId: lambda v: ObjectIdStr(v)}
 
     def __setattr__(self, key: Any, value: Any) -> Any:
-        if key not in ["_doc"]:
+        if key not in ["_doc", "_raw", "_upgrade"]:
+            if self.__dict__.get("_raw") is not None:
+                # Lazy model is changed, so raw document is not actual anymore
+                self._materialize()
+                self.__dict__["_raw"] = None
             return super(BaseDBMixin, self).__setattr__(key, value)
         self.__dict__[key] = value
         return value
 
+    def __getattr__(self, key: str) -> Any:
+        # Called only for fields not loaded yet from raw document of lazy model
+        if key in self.__fields__ and self.__dict__.get("_raw") is not None:
+            return self._load_raw_field(key)
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (self.__class__.__name__, key)
+        )
+
+    @classmethod
+    def _from_raw_document(cls, raw: RawBSONDocument) -> BaseDBMixin:
+        """
+        Create lazy model from raw BSON document.
+
+        Fields are decoded and validated on first access. Root validators
+        are not called and field validators receive only already loaded values.
+        """
+        model = cls.__new__(cls)
+        object.__setattr__(model, "__dict__", {"_raw": raw})
+        object.__setattr__(model, "__fields_set__", set())
+        return model
+
+    def _load_raw_field(self, key: str) -> Any:
+        """Decode and validate one field from raw document of lazy model"""
+        raw = self.__dict__["_raw"]
+        field = self.__fields__[key]
+        # Documents are stored by field names (not aliases)
+        document_key = "_id" if key == "id" else key
+        if document_key not in raw:
+            if field.required:
+                missing = ErrorWrapper(MissingError(), loc=key)
+                raise ValidationError([missing], self.__class__)
+            value = field.get_default()
+        elif key == "id":
+            # Keep ObjectId like in not lazy models
+            value = raw[document_key]
+            self.__fields_set__.add(key)
+        else:
+            value = _raw_bson_to_python(raw[document_key])
+            if document_key not in get_embedded_fields(self.__class__):
+                value = self._mongo_decoder.decode_value(value)
+            loaded = {k: v for k, v in self.__dict__.items() if k in self.__fields__}
+            value, error = field.validate(value, loaded, loc=key, cls=self.__class__)
+            if error:
+                raise ValidationError([error], self.__class__)
+            self.__fields_set__.add(key)
+        self.__dict__[key] = value
+        return value
+
+    def _materialize(self) -> None:
+        """Load all not loaded fields of lazy model"""
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            return
+        for key in self.__fields__:
+            if key not in self.__dict__:
+                self._load_raw_field(key)
+        if "_doc" not in self.__dict__:
+            mode = self._get_snapshot_mode()
+            if mode == SNAPSHOT_NONE:
+                self.__dict__["_doc"] = {}
+            else:
+                document = self._decode_mongo_documents(bson.decode(raw.raw))
+                self.__dict__["_doc"] = create_snapshot(document, mode)
+
+    def to_raw_bson(self) -> Optional[bytes]:
+        """
+        Return raw BSON bytes of lazy model if it is not changed after load.
+
+        Only assignment of fields is tracked, so don't use it after in-place
+        changes of mutable field values (lists, dicts, nested models).
+        """
+        raw = self.__dict__.get("_raw")
+        if raw is None:
+            return None
+        return raw.raw
+
+    def _iter(self, *args: Any, **kwargs: Any) -> "TupleGenerator":
+        self._materialize()
+        return super(BaseDBMixin, self)._iter(*args, **kwargs)
+
+    def __repr_args__(self) -> "ReprArgs":
+        self._materialize()
+        return super(BaseDBMixin, self).__repr_args__()
+
+    @classmethod
+    def _get_snapshot_mode(cls) -> str:
+        """Return snapshot mode of loaded documents (see `Config.snapshot`)"""
+        return getattr(cls.Config, "snapshot", "full")
+
     @classmethod
     def _decode_mongo_documents(cls, document: "DictStrAny") -> "DictStrAny":
-        """Decode and return MongoDB documents"""
-        return cls._mongo_decoder(document)
+        """
+        Decode and return MongoDB documents
+
+        Values of embedded documents fields are not decoded.
+        """
+        embedded_fields = get_embedded_fields(cls)
+        if not embedded_fields:
+            return cls._mongo_decoder(document)
+        decoded = cls._mongo_decoder(
+            {k: v for k, v in document.items() if k not in embedded_fields}
+        )
+        for key in embedded_fields:
+            if key in document:
+                decoded[key] = document[key]
+        return decoded
+
+    @classmethod
+    def _is_encoded_by_codec(cls) -> bool:
+        """Check that all python-level encoding is done by BSON codec"""
+        return getattr(cls.Config, "bson_codec", False) and is_covered_by_codec(
+            cls._mongodb_encoder
+        )
 
     @classmethod
     def _encode_dict_to_mongo(cls, data: "DictStrAny") -> "DictStrAny":
         """Encode any dict to mongo query"""
+        if cls._is_encoded_by_codec():
+            return data
         return cls._mongodb_encoder(data)
 
+    @classmethod
+    def _encode_query(cls, query: Union["DictStrAny", Query]) -> "DictStrAny":
+        """
+        Encode query with conversion of ObjectId strings
+        (see `DBPydanticMixin.Config.convert_query_ids`).
+        Compiled queries (see `pydantic_odm.query.Q`) are returned without encoding.
+        """
+        if isinstance(query, Query):
+            if not issubclass(cls, query.model):
+                raise ValueError(
+                    'Query of "%s" model is passed to "%s" model'
+                    % (query.model.__name__, cls.__name__)
+                )
+            return query.to_mongo()
+        if getattr(cls.Config, "convert_query_ids", True):
+            query = convert_query_ids(query, get_object_id_keys(cls))
+        return cls._encode_dict_to_mongo(query)
+
+    def _get_id_query(self) -> "DictStrAny":
+        """Return query of current model document"""
+        if getattr(self.Config, "convert_query_ids", True):
+            return {"_id": to_object_id(self.id)}
+        return {"_id": self.id}
+
     def _encode_model_to_mongo(
         self,
         include: Union["AbstractSetIntStr", "DictIntStrAny"] = None,
@@ -59,14 +285,14 @@ class BaseDBMixin(BaseModel, abc.ABC):
         exclude_none: bool = False,
     ) -> DictStrAny:
         """Encode model to mongo query like pydantic.dict()"""
-        model_as_dict = self.dict(
+        return self._model_encoder(
+            self,
             include=include,
             exclude=exclude,
             exclude_unset=exclude_unset,
             exclude_defaults=exclude_defaults,
             exclude_none=exclude_none,
         )
-        return self._mongodb_encoder(model_as_dict)
 
     def dict(
         self,
@@ -81,9 +307,9 @@ class BaseDBMixin(BaseModel, abc.ABC):
     ) -> DictStrAny:
         # Remove internal fields from serialized result
         if not exclude:
-            exclude = {"_doc"}
+            exclude = {"_doc", "_raw", "_upgrade"}
         else:
-            exclude = {"_doc", *exclude}
+            exclude = {"_doc", "_raw", "_upgrade", *exclude}
 
         return super(BaseDBMixin, self).dict(
             include=include,
@@ -94,13 +320,17 @@ class BaseDBMixin(BaseModel, abc.ABC):
             exclude_none=exclude_none,
         )
 
-    def _update_model_from__doc(self) -> BaseDBMixin:
+    def _update_model_from__doc(self, document: "DictStrAny" = None) -> BaseDBMixin:
         """
-        Update model fields from _doc dictionary
+        Update model fields from _doc dictionary or passed decoded document
         (projection of a document from DB)
         """
-        new_obj = self.parse_obj(self._doc)
-        new_obj.id = self._doc.get("id")
+        if document is None:
+            document = self._doc
+        new_obj = self.parse_obj(document)
+        new_obj.id = document.get("id")
+        # Raw document of lazy model is not actual after update
+        self.__dict__.pop("_raw", None)
         for k, field in new_obj.__fields__.items():
             field_default = getattr(field, "default", None)
             self.__dict__[k] = getattr(new_obj, k, field_default)
@@ -114,11 +344,62 @@ class DBPydanticMixin(BaseDBMixin):
         # DB
         collection: Optional[str] = None
         database: Optional[str] = None
+        # Read documents as raw BSON and decode fields on first access
+        lazy: bool = False
+        # Encode Enum and Decimal values by BSON codec in MongoDB driver
+        # instead of python-level encoder
+        bson_codec: bool = False
+        # Snapshot of loaded document for change detection in save:
+        #   - "full": decoded document (`_doc`)
+        #   - "hash": digests of field values
+        #   - "none": without snapshot (save writes all fields)
+        snapshot: str = "full"
+        # Tenant routing (see pydantic_odm.tenancy)
+        tenant_resolver: Optional[AbstractTenantResolver] = None
+        # Decode and validate documents of find_many in executor by batches
+        # (see pydantic_odm.materialize)
+        materialize_executor: Optional[Executor] = None
+        materialize_batch_size: int = 1000
+        # Read next cursor batches of find_many while current batch is decoded
+        # (count of batches read ahead, see pydantic_odm.cursors.PrefetchCursor)
+        prefetch_depth: int = 0
+        prefetch_batch_size: int = 1000
+        # Buffer writes of save and flush them by bulk_write on size or time
+        # trigger (see pydantic_odm.writebehind)
+        write_behind: bool = False
+        write_behind_max_size: int = 1000
+        write_behind_max_latency: float = 1.0
+        # Count of retries of failed flush before pending write is dropped
+        write_behind_max_retries: int = 3
+        # Limiter of concurrent operations (see pydantic_odm.admission)
+        admission_limiter: Optional[AdmissionLimiter] = None
+        # Convert ObjectId strings of `_id` and `NativeObjectId` fields in queries
+        # (see pydantic_odm.encoders.ids)
+        convert_query_ids: bool = True
+        # Referenced models of fields, which documents must exist on save
+        # (`{"author_id": User}`, see pydantic_odm.validation.Reference)
+        references: Optional[DictStrAny] = None
+        # Max count of concurrent reference queries and async validators
+        validation_concurrency: int = 10
+        # Schema version of documents: loaded documents of old versions are
+        # upgraded by `schema_upgrade` functions and written back in background
+        # (see pydantic_odm.migrations)
+        schema_version: int = 0
+        schema_version_field: str = "_schema_version"
 
     @classmethod
-    async def get_collection(cls) -> Collection:
-        db_name = getattr(cls.Config, "database", None)
+    async def get_collection(cls) -> "Collection[Any]":
         collection_name = getattr(cls.Config, "collection", None)
+        tenant_resolver = getattr(cls.Config, "tenant_resolver", None)
+        tenant = get_current_tenant()
+        if tenant_resolver and tenant is not None:
+            if not collection_name:
+                raise ValueError("Collection is not configured in Config class")
+            return cls._configure_collection(
+                tenant_resolver.get_collection(tenant, collection_name)
+            )
+
+        db_name = getattr(cls.Config, "database", None)
         if not db_name or not collection_name:
             raise ValueError("Collection or db_name is not configured in Config class")
         db_manager = get_db_manager()
@@ -131,7 +412,74 @@ class DBPydanticMixin(BaseDBMixin):
         collection = db[collection_name]
         if not collection:
             collection = await db.create_collection(collection_name)
-        return collection
+        return cls._configure_collection(collection)
+
+    @classmethod
+    def _configure_collection(
+        cls, collection: "Collection[Any]", read: bool = False
+    ) -> "Collection[Any]":
+        """
+        Configure collection handle by model settings
+
+        Configured handles are cached per model (by collection name and
+        database handle), so options are not copied on every collection access.
+        """
+        if read:
+            if not getattr(cls.Config, "lazy", False):
+                return collection
+        elif not getattr(cls.Config, "bson_codec", False):
+            return collection
+        cache = _configured_handles.get(cls)
+        if cache is None:
+            cache = _configured_handles[cls] = CollectionLRUCache()
+        key = (collection.full_name, "read" if read else "write")
+        configured = cache.get(key)
+        if configured is None or configured.database is not collection.database:
+            # Codec options of client (tz_aware, uuid_representation, etc.) are kept
+            if read:
+                codec_options = collection.codec_options.with_options(
+                    document_class=RawBSONDocument
+                )
+            else:
+                codec_options = collection.codec_options.with_options(
+                    type_registry=get_type_registry(cls)
+                )
+            configured = collection.with_options(codec_options=codec_options)
+            cache.set(key, configured)
+        return configured
+
+    @classmethod
+    async def get_read_collection(cls) -> "Collection[Any]":
+        """Return collection configured for read documents by model settings"""
+        return cls._configure_collection(await cls.get_collection(), read=True)
+
+    @classmethod
+    def _from_mongo_document(
+        cls, document: "DictStrAny", snapshot: str = None
+    ) -> DBPydanticMixin:
+        """
+        Create model instance from document received from MongoDB
+
+        Parameters:
+            - `document`: MongoDB document (or raw BSON document)
+            - `snapshot`: snapshot mode (by default from `Config.snapshot`)
+        """
+        upgrade = None
+        if getattr(cls.Config, "schema_version", 0):
+            upgraded = upgrade_loaded(cls, document)
+            if upgraded is not document:
+                # Write-back doesn't match document changed by save of model,
+                # so save writes upgrade too
+                _, upgrade = build_write_back(document, upgraded)
+                document = upgraded
+        if isinstance(document, RawBSONDocument):
+            return cast(DBPydanticMixin, cls._from_raw_document(document))
+        document = cls._decode_mongo_documents(document)
+        model = cls.parse_obj(document)
+        model._doc = create_snapshot(document, snapshot or cls._get_snapshot_mode())
+        if upgrade is not None:
+            model._upgrade = upgrade
+        return model
 
     @staticmethod
     async def pre_save_validation(
@@ -167,10 +515,22 @@ class DBPydanticMixin(BaseDBMixin):
                     if not other_model:
                         raise TypeError(f'Other model with `{id}` id not found')
                     return data
+
+        Declared references and async validators (see pydantic_odm.validation)
+        are checked before this hook in one pass for all documents.
         """
         return data
 
     @classmethod
+    async def _validate_before_save(
+        cls, data: Union["DictAny", List["DictAny"]], many: bool = False
+    ) -> Union["DictAny", List["DictAny"]]:
+        """Run declared validators of model and `pre_save_validation` hook"""
+        await validate_documents(cls, data if isinstance(data, list) else [data])
+        return await cls.pre_save_validation(data, many)
+
+    @classmethod
+    @admission.admitted
     async def create(cls, fields: Union["DictAny", BaseModel]) -> DBPydanticMixin:
         """Create document by dict or pydantic model"""
         if isinstance(fields, BaseModel):
@@ -180,65 +540,332 @@ class DBPydanticMixin(BaseDBMixin):
         return document
 
     @classmethod
-    async def count(cls, query: DictStrAny = None) -> int:
-        """Return count by query or all documents in collection"""
+    @admission.admitted
+    async def count(
+        cls,
+        query: Union[DictStrAny, Query] = None,
+        approximate: bool = False,
+        max: int = None,
+    ) -> int:
+        """
+        Return count by query or all documents in collection
+
+        Parameters:
+            - `approximate`: count all documents by collection metadata
+              (`estimated_document_count`) instead of index scan; count of
+              filtered documents is exact
+            - `max`: stop counting after `max` documents (returns `max`
+              if there are more documents), for "more than N" counters
+        """
         if not query:
             query = {}
-        query = cls._encode_dict_to_mongo(query)
+        query = cls._encode_query(query)
         collection = await cls.get_collection()
+        if approximate and not query:
+            count = await collection.estimated_document_count()
+            return count if max is None else min(count, max)
+        if max is not None:
+            return await collection.count_documents(query, limit=max)
         return await collection.count_documents(query)
 
     @classmethod
-    async def find_one(cls, query: DictStrAny) -> DBPydanticMixin:
-        """Find and return model from db by pymongo query"""
-        collection = await cls.get_collection()
-        query = cls._encode_dict_to_mongo(query)
+    @admission.admitted
+    async def exists(cls, query: DictStrAny = None) -> bool:
+        """
+        Return True if any document matches query
+
+        Document is read by `find_one` with projection of queried fields
+        only, so query is covered by index of these fields if it exists.
+        """
+        query = cls._encode_query(query or {})
+        collection = await cls.get_read_collection()
+        document = await collection.find_one(query, get_covering_projection(query))
+        return document is not None
+
+    @classmethod
+    def prepare(
+        cls, template: "DictStrAny", index: Optional["IndexType"] = None
+    ) -> PreparedQuery:
+        """
+        Prepare query template with `Param` placeholders for repeated queries
+        (see pydantic_odm.prepared.PreparedQuery)
+
+        Parameters:
+            - `template`: query with `Param` instances instead of values
+            - `index`: expected index of query (name or keys)
+
+        Usage example:
+
+            recent = User.prepare({"created": {"$gte": Param("since")}})
+            users = await recent.find(since=datetime(2020, 1, 1))
+        """
+        return PreparedQuery(cls, template, index)
+
+    @classmethod
+    @admission.admitted
+    async def find_one(
+        cls, query: Union[DictStrAny, Query], snapshot: str = None
+    ) -> DBPydanticMixin:
+        """
+        Find and return model from db by pymongo query
+
+        Pass `snapshot="none"` for read-only models (see `Config.snapshot`).
+        """
+        collection = await cls.get_read_collection()
+        query = cls._encode_query(query)
         result = await collection.find_one(query)
         if result:
-            result = cls._decode_mongo_documents(result)
-            model = cls.parse_obj(result)
-            document_id = result.get("id")
-            model._doc = result
-            model.id = document_id
+            model = cls._from_mongo_document(result, snapshot)
+            if model._raw is None and not isinstance(model.id, ObjectId):
+                model.id = result.get("_id")
             return model
         return result
 
     @classmethod
+    @admission.admitted
     async def find_many(
-        cls, query: "DictStrAny", return_cursor: bool = False
+        cls,
+        query: Union["DictStrAny", Query],
+        return_cursor: bool = False,
+        snapshot: str = None,
     ) -> Union[List[DBPydanticMixin], motor_asyncio.AsyncIOMotorCursor]:
         """
         Find documents by query and return list of model instances
-        or query cursor
+        or query cursor.
+
+        Pass `snapshot="none"` for read-only models (see `Config.snapshot`).
+
+        If `Config.materialize_executor` is set, models are decoded
+        and validated in executor by batches of `Config.materialize_batch_size`
+        documents (see `pydantic_odm.materialize.find_in_executor`).
+        If `Config.prefetch_depth` is set, next cursor batches are read while
+        current batch is decoded (see `pydantic_odm.cursors.PrefetchCursor`).
         """
-        collection = await cls.get_collection()
-        query = cls._encode_dict_to_mongo(query)
+        collection = await cls.get_read_collection()
+        query = cls._encode_query(query)
+        executor = getattr(cls.Config, "materialize_executor", None)
+        if (
+            executor is not None
+            and not return_cursor
+            and not getattr(cls.Config, "lazy", False)
+        ):
+            batch_size = getattr(cls.Config, "materialize_batch_size", 1000)
+            return await materialize.find_in_executor(
+                cls, collection, query, executor, batch_size, snapshot
+            )
+
         cursor = collection.find(query)
         if return_cursor:
             return cursor
 
-        documents = []
+        documents: List[DBPydanticMixin] = []
+        prefetch_depth = getattr(cls.Config, "prefetch_depth", 0)
+        if prefetch_depth:
+            batch_size = getattr(cls.Config, "prefetch_batch_size", 1000)
+            prefetch_cursor = PrefetchCursor(cursor, batch_size, prefetch_depth)
+            async for batch in prefetch_cursor.batches():
+                documents.extend(
+                    cls._from_mongo_document(_doc, snapshot) for _doc in batch
+                )
+            return documents
+
         async for _doc in cursor:
-            _doc = cls._decode_mongo_documents(_doc)
-            document = cls.parse_obj(_doc)
-            document._doc = _doc
-            documents.append(document)
+            documents.append(cls._from_mongo_document(_doc, snapshot))
         return documents
 
     @classmethod
+    @admission.admitted
+    async def find_columns(
+        cls,
+        query: "DictStrAny",
+        fields: Sequence[str],
+        batch_size: int = 1000,
+        use_numpy: bool = None,
+        capacity: int = None,
+    ) -> Dict[str, Any]:
+        """
+        Find documents by query and return values of fields as typed columns
+        (numpy arrays or `array.array`) without creating model instances.
+
+        See `pydantic_odm.columns.find_columns`.
+        """
+        return await columns.find_columns(
+            cls,
+            query,
+            fields,
+            batch_size=batch_size,
+            use_numpy=use_numpy,
+            capacity=capacity,
+        )
+
+    @classmethod
+    def parallel_scan(
+        cls,
+        query: "DictStrAny" = None,
+        partitions: int = 4,
+        key: str = "_id",
+        batch_size: int = 1000,
+        executor: "Executor" = None,
+        sample_size: int = None,
+    ) -> "AsyncIterator[DBPydanticMixin]":
+        """
+        Scan documents by partitions of key range over concurrent cursors
+        and yield models as partitions produce them.
+
+        See `pydantic_odm.scan.parallel_scan`.
+
+        Usage example:
+
+            async for user in User.parallel_scan({}, partitions=8):
+                ...
+        """
+        return scan.parallel_scan(
+            cls,
+            query,
+            partitions=partitions,
+            key=key,
+            batch_size=batch_size,
+            executor=executor,
+            sample_size=sample_size,
+        )
+
+    @classmethod
+    async def migrate_schema(
+        cls,
+        batch_size: int = 500,
+        max_rate: Optional[float] = None,
+        start_after: Any = None,
+        progress: Optional[Callable[[MigrationResult], Any]] = None,
+    ) -> MigrationResult:
+        """
+        Upgrade stored documents of old schema versions in background
+        (see `Config.schema_version` and pydantic_odm.migrations.migrate)
+
+        Parameters:
+            - `batch_size`: count of documents in one bulk write
+            - `max_rate`: max count of upgraded documents per second
+            - `start_after`: `_id` of last upgraded document for resume
+            - `progress`: callback of intermediate result after every batch
+
+        Usage example:
+
+            result = await User.migrate_schema(max_rate=1000, progress=print)
+        """
+        return await migrate(cls, batch_size, max_rate, start_after, progress)
+
+    @classmethod
+    def scan_time_range(
+        cls,
+        field: str,
+        time_range: Union[DateTimeRange, List[Any], "DictStrAny"],
+        slices: int = 4,
+        query: "DictStrAny" = None,
+        concurrency: int = None,
+        batch_size: int = 1000,
+        executor: "Executor" = None,
+    ) -> "AsyncIterator[DBPydanticMixin]":
+        """
+        Scan documents of time range by slices over concurrent cursors
+        and yield models in time order.
+
+        See `pydantic_odm.scan.scan_time_range`.
+
+        Usage example:
+
+            period = DateTimeRange(gte=datetime(2020, 1, 1), lte=datetime(2020, 7, 1))
+            async for event in Event.scan_time_range("created", period, slices=6):
+                ...
+        """
+        return scan.scan_time_range(
+            cls,
+            field,
+            time_range,
+            slices=slices,
+            query=query,
+            concurrency=concurrency,
+            batch_size=batch_size,
+            executor=executor,
+        )
+
+    @classmethod
+    @admission.admitted
+    async def paginate(
+        cls,
+        query: "DictStrAny" = None,
+        sort: "SortType" = "_id",
+        page_size: int = 20,
+        after: str = None,
+    ) -> pagination.Page:
+        """
+        Return page of documents by keyset (range-based) pagination.
+
+        Page is found by seek from last sort key value of previous page (with
+        `_id` as the tie-breaker), so every page fetch costs the same. For fast
+        pages use indexed sort key (compound with `_id`). Documents with null
+        (or missing) sort key are sorted first in ascending order.
+
+        Parameters:
+            - `query`: pymongo query
+            - `sort`: field name or tuple of field name and direction (1 or -1)
+            - `page_size`: count of documents in page
+            - `after`: continuation token of previous page (`Page.next_token`)
+
+        Usage example:
+
+            page = await User.paginate({}, sort=("created", -1))
+            while page.has_next:
+                page = await User.paginate(
+                    {}, sort=("created", -1), after=page.next_token
+                )
+        """
+        if page_size < 1:
+            raise ValueError("Page size must be positive")
+        key, direction = pagination.get_sort_key(cls, sort)
+        query = cls._encode_query(query or {})
+        if after:
+            value, document_id = pagination.decode_token(after, key, direction)
+            query = pagination.build_seek_query(
+                query, key, direction, value, document_id
+            )
+
+        collection = await cls.get_read_collection()
+        sort_keys = [(key, direction)]
+        if key != "_id":
+            sort_keys.append(("_id", direction))
+        cursor = collection.find(query).sort(sort_keys).limit(page_size + 1)
+        documents = await cursor.to_list(length=page_size + 1)
+
+        next_token = None
+        if len(documents) > page_size:
+            documents = documents[:page_size]
+            last_document = documents[-1]
+            next_token = pagination.encode_token(
+                key,
+                direction,
+                pagination.get_document_value(last_document, key),
+                last_document["_id"],
+            )
+        return pagination.Page(
+            items=[cls._from_mongo_document(document) for document in documents],
+            next_token=next_token,
+        )
+
+    @classmethod
+    @admission.admitted
     async def update_many(
         cls, query: "DictStrAny", fields: "DictAny", return_cursor: bool = False,
     ) -> Union[List[DBPydanticMixin], motor_asyncio.AsyncIOMotorCursor]:
         """
         Find and update documents by query
         """
-        await cls.pre_save_validation(fields, many=True)
+        await cls._validate_before_save(fields, many=True)
         collection = await cls.get_collection()
-        query = cls._encode_dict_to_mongo(query)
+        query = cls._encode_query(query)
         await collection.update_many(query, fields)
         return await cls.find_many(query, return_cursor)
 
     @classmethod
+    @admission.admitted
     async def bulk_create(
         cls, documents: Union[List[BaseModel], List["DictAny"]],
     ) -> List[DBPydanticMixin]:
@@ -250,12 +877,16 @@ class DBPydanticMixin(BaseDBMixin):
 
         if isinstance(documents[0], BaseModel):
             documents = [
-                cls._encode_dict_to_mongo(d.dict())
-                for d in cast(List[BaseModel], documents)  # noqa: types
+                d._encode_model_to_mongo()
+                if isinstance(d, BaseDBMixin)
+                else cls._encode_dict_to_mongo(d.dict())
+                for d in documents
             ]
 
         documents = cast(List["DictAny"], documents)  # noqa: types
-        await cls.pre_save_validation(documents, many=True)
+        for data in documents:
+            stamp_version(cls, data)
+        await cls._validate_before_save(documents, many=True)
 
         result = await collection.insert_many(documents)
         inserted_ids = result.inserted_ids
@@ -263,21 +894,77 @@ class DBPydanticMixin(BaseDBMixin):
         for i, document_id in enumerate(inserted_ids):
             document = cls.parse_obj(documents[i])
             document.id = document_id
-            document._doc = cls._decode_mongo_documents(documents[i])
+            document._doc = create_snapshot(
+                cls._decode_mongo_documents(documents[i]), cls._get_snapshot_mode()
+            )
             inserted_documents.append(document)
         return inserted_documents
 
+    @classmethod
+    @admission.admitted
+    async def bulk_upsert(
+        cls,
+        documents: Union[List[BaseModel], List["DictAny"]],
+        key: Sequence[str],
+        set_on_insert: Sequence[str] = (),
+        chunk_size: int = 1000,
+        skip_unchanged: bool = False,
+    ) -> bulk.BulkUpsertResult:
+        """
+        Insert or update many documents by natural key.
+
+        Parameters:
+            - `documents`: models or dicts
+            - `key`: names of natural key fields (`_id` and model id are ignored)
+            - `set_on_insert`: names of fields, which are written only on insert
+            - `chunk_size`: count of operations in one bulk write
+            - `skip_unchanged`: skip documents with same content hash as on
+              last upsert
+
+        See `pydantic_odm.bulk.bulk_upsert`.
+
+        Usage example:
+
+            result = await Product.bulk_upsert(products, key=["external_id"])
+            inserted_ids = result.upserted_ids
+        """
+        encoded_documents = [
+            d._encode_model_to_mongo(exclude={"id"})
+            if isinstance(d, BaseDBMixin)
+            else cls._encode_dict_to_mongo(
+                d.dict() if isinstance(d, BaseModel) else dict(d)
+            )
+            for d in documents
+        ]
+        for data in encoded_documents:
+            data.pop("id", None)
+            data.pop("_id", None)
+            stamp_version(cls, data)
+        await cls._validate_before_save(encoded_documents, many=True)
+        return await bulk.bulk_upsert(
+            cls,
+            encoded_documents,
+            key,
+            set_on_insert=set_on_insert,
+            chunk_size=chunk_size,
+            skip_unchanged=skip_unchanged,
+        )
+
+    @admission.admitted
     async def reload(self) -> DBPydanticMixin:
         """Reload model data from MongoDB (get new document from db)"""
         collection = await self.get_collection()
         if not self.id:
             raise ValueError("Not found id in current model instance")
-        _doc = await collection.find_one({"_id": self.id})
+        _doc = await collection.find_one(self._get_id_query())
         if _doc:
-            self._doc = self._decode_mongo_documents(_doc)
-            self._update_model_from__doc()
+            document = self._decode_mongo_documents(_doc)
+            self._doc = create_snapshot(document, self._get_snapshot_mode())
+            self.__dict__.pop("_upgrade", None)
+            self._update_model_from__doc(document)
         return self
 
+    @admission.admitted
     async def update(self, fields: Union[BaseModel, "DictAny"],) -> DBPydanticMixin:
         """
         Update Mongo document and pydantic instance.
@@ -287,48 +974,256 @@ class DBPydanticMixin(BaseDBMixin):
         """
         if isinstance(fields, BaseModel):
             fields = fields.dict(exclude_unset=True)
-        await self.pre_save_validation(fields)
+        await self._validate_before_save(fields)
         collection = await self.get_collection()
         if not self.id:
             raise ValueError("Not found id in current model instance")
         fields = self._encode_dict_to_mongo(fields)
         _doc = await collection.find_one_and_update(
-            {"_id": self.id}, {"$set": fields}, return_document=ReturnDocument.AFTER
+            self._get_id_query(),
+            self._build_set_update(fields),
+            return_document=ReturnDocument.AFTER,
         )
         if _doc:
-            self._doc.update(self._decode_mongo_documents(_doc))
-            self._update_model_from__doc()
+            document = self._decode_mongo_documents(_doc)
+            self._doc = create_snapshot(document, self._get_snapshot_mode())
+            self.__dict__.pop("_upgrade", None)
+            self._update_model_from__doc(document)
         return self
 
+    def _build_set_update(self, fields: "DictStrAny") -> "DictStrAny":
+        """
+        Return `$set` update of fields.
+
+        Update of document upgraded on load is included, so current schema
+        version is written with fields (write-back of upgrade is skipped
+        for changed document).
+        """
+        upgrade = self._upgrade
+        if not upgrade:
+            return {"$set": fields}
+        update = {"$set": {**upgrade["$set"], **fields}}
+        unset_fields = dict(upgrade.get("$unset", {}))
+        for key in fields:
+            unset_fields.pop(key, None)
+        if unset_fields:
+            update["$unset"] = unset_fields
+        return update
+
+    @admission.admitted
+    async def atomic(
+        self, operations: "DictStrAny", refresh: str = "local"
+    ) -> DBPydanticMixin:
+        """
+        Update document by atomic operators (`$inc`, `$push`, `$addToSet`,
+        `$min`, `$max`, `$unset`) and refresh only changed fields of model.
+
+        Refresh modes:
+            - `local`: apply operators to model fields without fetch of document
+              (only where result is deterministic, other fields are fetched
+              by projection). Local result is based on model values, so it may
+              differ from document changed by other clients.
+            - `projection`: fetch changed fields of updated document
+
+        Usage example:
+
+            await post.atomic({"$inc": {"views": 1}, "$addToSet": {"tags": "a"}})
+        """
+        if refresh not in ("local", "projection"):
+            raise ValueError('"%s" refresh mode is not supported' % refresh)
+        if not self.id:
+            raise ValueError("Not found id in current model instance")
+
+        update: "DictStrAny" = {}
+        values: "DictStrAny" = {}
+        fetch_fields = set()
+        for operator, fields in operations.items():
+            if operator not in SUPPORTED_OPERATORS:
+                raise ValueError('"%s" operator is not supported' % operator)
+            update[operator] = self._encode_dict_to_mongo(dict(fields))
+            for path, operand in fields.items():
+                name = self._get_atomic_field_name(operator, path)
+                value = NOT_APPLIED
+                if (
+                    refresh == "local"
+                    and path == name
+                    and name not in values
+                    and name not in fetch_fields
+                ):
+                    value = apply_operation(
+                        operator, getattr(self, name), operand, self.__fields__[name]
+                    )
+                if value is NOT_APPLIED:
+                    fetch_fields.add(name)
+                    values.pop(name, None)
+                else:
+                    values[name] = value
+
+        collection = await self.get_collection()
+        if fetch_fields:
+            document = await collection.find_one_and_update(
+                self._get_id_query(),
+                update,
+                projection={name: 1 for name in fetch_fields},
+                return_document=ReturnDocument.AFTER,
+            )
+            if document is None:
+                return self
+            document = self._decode_mongo_documents(document)
+            for name in fetch_fields:
+                if name in document:
+                    values[name] = document[name]
+                else:
+                    values[name] = self.__fields__[name].get_default()
+        else:
+            result = await collection.update_one(self._get_id_query(), update)
+            if not result.matched_count:
+                return self
+        self._set_field_values(values)
+        return self
+
+    @classmethod
+    def _get_atomic_field_name(cls, operator: str, path: str) -> str:
+        """Return name of model field updated by atomic operator on path"""
+        name = path.split(".")[0]
+        if name == "id" or name not in cls.__fields__:
+            raise ValueError('"%s" field is not found in %s' % (name, cls.__name__))
+        if operator == "$unset" and path == name and cls.__fields__[name].required:
+            # Server write can not be reverted after failed validation
+            raise ValueError('"%s" field is required and can not be unset' % name)
+        return name
+
+    def _set_field_values(self, values: "DictStrAny") -> None:
+        """Validate and set values of fields and update `_doc` of them"""
+        self._materialize()
+        errors = []
+        for name, value in values.items():
+            field = self.__fields__[name]
+            value, error = field.validate(
+                value, self.__dict__, loc=name, cls=self.__class__
+            )
+            if error:
+                errors.append(error)
+            else:
+                self.__dict__[name] = value
+                self.__fields_set__.add(name)
+        if errors:
+            raise ValidationError(errors, self.__class__)
+        self.__dict__["_raw"] = None
+        encoded = self._encode_model_to_mongo(include=set(values))
+        self._doc = update_snapshot(self._doc, encoded)
+
+    @admission.admitted
     async def save(self) -> DBPydanticMixin:
         collection = await self.get_collection()
+        if getattr(self.Config, "write_behind", False):
+            return await self._save_behind(collection)
         if not self.id:
             data = self._encode_model_to_mongo()
-            await self.pre_save_validation(data)
+            stamp_version(self.__class__, data)
+            await self._validate_before_save(data)
             instance = await collection.insert_one(data)
             if instance:
                 self.id = instance.inserted_id
-                self._doc = {"id": self.id, **self.dict()}
+                self._doc = create_snapshot(
+                    {"id": self.id, **self.dict()}, self._get_snapshot_mode()
+                )
         else:
-            updated = {}
             data = self._encode_model_to_mongo(exclude={"id"})
-            await self.pre_save_validation(data)
-            for field, value in data.items():
-                if self._doc.get(field) != value:
-                    updated[field] = value
-            if updated:
+            await self._validate_before_save(data)
+            updated = changed_fields(self._doc, data)
+            if updated or self._upgrade:
                 instance = await collection.update_one(
-                    {"_id": self.id}, {"$set": updated}
+                    self._get_id_query(), self._build_set_update(updated)
                 )
                 if instance:
-                    self._doc.update(updated)
+                    self._doc = update_snapshot(self._doc, updated)
+                    self.__dict__.pop("_upgrade", None)
+        return self
+
+    async def _save_behind(self, collection: "Collection[Any]") -> DBPydanticMixin:
+        """
+        Add changed fields to write-behind buffer of model.
+
+        New document gets id on client side and is inserted by upsert on flush.
+        """
+        data = self._encode_model_to_mongo(exclude={"id"})
+        await self._validate_before_save(data)
+        if not self.id:
+            document_id = ObjectId()
+            # Id is set as value of id field type (string or `NativeObjectId`)
+            self.id, _ = self.__fields__["id"].validate(document_id, {}, loc="id")
+            updated = data
+            stamp_version(self.__class__, updated)
+            self._doc = create_snapshot(
+                {"id": self.id, **self.dict()}, self._get_snapshot_mode()
+            )
+        else:
+            # Document is written by id like in `save` (see `_get_id_query`)
+            document_id = self._get_id_query()["_id"]
+            updated = changed_fields(self._doc, data)
+            self._doc = update_snapshot(self._doc, updated)
+            if self._upgrade:
+                # Buffer writes only `$set`, so keys removed by upgrade are kept
+                updated = self._build_set_update(updated)["$set"]
+                self.__dict__.pop("_upgrade", None)
+        if updated:
+            buffer = writebehind.get_write_behind_buffer(self.__class__)
+            await buffer.add(collection, document_id, updated)
         return self
 
+    @classmethod
+    @admission.admitted
+    async def flush(cls) -> int:
+        """
+        Write pending documents of write-behind buffer of model
+        and return count of written documents
+        """
+        return await writebehind.get_write_behind_buffer(cls).flush()
+
+    @classmethod
+    async def purge(
+        cls,
+        query: DictStrAny,
+        chunk_size: int = 1000,
+        max_rate: Optional[float] = None,
+        max_lag: Optional[float] = None,
+        start_after: Any = None,
+        progress: Optional[Callable[[PurgeResult], Any]] = None,
+    ) -> PurgeResult:
+        """
+        Delete documents by query in throttled batches of `_id`
+        (see pydantic_odm.purge.purge)
+
+        Parameters:
+            - `chunk_size`: count of documents deleted by one `delete_many`
+            - `max_rate`: max count of deleted documents per second
+            - `max_lag`: max replication lag of secondaries (seconds) before batch
+            - `start_after`: `_id` of last processed document for resume
+            - `progress`: callback of intermediate result after every batch
+
+        Usage example:
+
+            result = await Session.purge(
+                {"expired": {"$lt": datetime.utcnow()}}, max_rate=5000, max_lag=2
+            )
+        """
+        return await purge(
+            cls,
+            query,
+            chunk_size=chunk_size,
+            max_rate=max_rate,
+            max_lag=max_lag,
+            start_after=start_after,
+            progress=progress,
+        )
+
+    @admission.admitted
     async def delete(self) -> int:
         """Delete document from db"""
         collection = await self.get_collection()
         if not self.id:
             raise ValueError("Not found id in current model instance")
-        result = await collection.delete_one({"_id": self.id})
+        result = await collection.delete_one(self._get_id_query())
         self._doc = {}
         return result.deleted_count
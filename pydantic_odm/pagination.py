@@ -0,0 +1,103 @@
+"""Keyset (range-based) pagination"""
+from __future__ import annotations
+
+import base64
+import bson
+from bson.errors import BSONError
+from pydantic import BaseModel
+from pymongo import ASCENDING, DESCENDING
+from typing import TYPE_CHECKING, Any, List, Optional, Tuple, Type, Union
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+    SortType = Union[str, Tuple[str, int]]
+
+
+class Page(BaseModel):
+    """Page of documents with continuation token of next page"""
+
+    items: List[Any]
+    next_token: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_token is not None
+
+
+def get_sort_key(model: Type[BaseModel], sort: "SortType") -> Tuple[str, int]:
+    """Return document key and direction of sort by model field"""
+    if isinstance(sort, str):
+        field_name, direction = sort, ASCENDING
+    else:
+        field_name, direction = sort
+    if direction not in (ASCENDING, DESCENDING):
+        raise ValueError("Sort direction must be 1 or -1")
+    if field_name in ("id", "_id"):
+        return "_id", direction
+    if field_name not in model.__fields__:
+        # Documents are stored by field names, aliases are mapped to them
+        for field in model.__fields__.values():
+            if field.alias == field_name:
+                return field.name, direction
+    return field_name, direction
+
+
+def encode_token(key: str, direction: int, value: Any, document_id: Any) -> str:
+    """Encode last sort key value and id of page to continuation token"""
+    data = bson.encode({"k": key, "d": direction, "v": value, "i": document_id})
+    return base64.urlsafe_b64encode(data).decode()
+
+
+def decode_token(token: str, key: str, direction: int) -> Tuple[Any, Any]:
+    """Decode continuation token and return last sort key value and id"""
+    try:
+        data: "DictStrAny" = bson.decode(base64.urlsafe_b64decode(token.encode()))
+    except (BSONError, ValueError, TypeError):
+        raise ValueError("Invalid continuation token")
+    if data.get("k") != key or data.get("d") != direction:
+        raise ValueError("Continuation token does not match sort")
+    return data.get("v"), data.get("i")
+
+
+def get_document_value(document: "DictStrAny", key: str) -> Any:
+    """Return value from document by key (nested keys are passed with dot)"""
+    value: Any = document
+    for part in key.split("."):
+        if value is None:
+            return None
+        value = value.get(part)
+    return value
+
+
+def build_seek_query(
+    query: "DictStrAny", key: str, direction: int, value: Any, document_id: Any
+) -> "DictStrAny":
+    """
+    Add to query condition for documents after last document of previous page.
+
+    Documents are compared by sort key and by `_id` for documents
+    with same values of sort key. Null (or missing) values of sort key are
+    sorted first in ascending order, comparison operators don't match them,
+    so they are matched explicitly.
+    """
+    operator = "$gt" if direction == ASCENDING else "$lt"
+    if key == "_id":
+        seek: "DictStrAny" = {"_id": {operator: document_id}}
+    elif value is None:
+        same_value = {key: None, "_id": {operator: document_id}}
+        if direction == ASCENDING:
+            seek = {"$or": [{key: {"$ne": None}}, same_value]}
+        else:
+            seek = same_value
+    else:
+        conditions = [
+            {key: {operator: value}},
+            {key: value, "_id": {operator: document_id}},
+        ]
+        if direction != ASCENDING:
+            conditions.append({key: None})
+        seek = {"$or": conditions}
+    if not query:
+        return seek
+    return {"$and": [query, seek]}
@@ -0,0 +1,172 @@
+"""Prepared parameterized queries"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .encoders.ids import LOGICAL_OPERATORS, convert_id_condition, get_object_id_keys
+from .query import Query
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+    from typing import Iterator, Type
+
+    from .mixins import DBPydanticMixin
+
+    IndexType = Union[str, Sequence[Tuple[str, int]]]
+
+
+class Param:
+    """Placeholder of value in prepared query"""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __repr__(self) -> str:
+        return "Param(%r)" % self.name
+
+
+def get_index_name(index: IndexType) -> str:
+    """Return name of index by name or keys (like default MongoDB index name)"""
+    if isinstance(index, str):
+        return index
+    return "_".join("%s_%s" % (key, direction) for key, direction in index)
+
+
+def get_plan_indexes(plan: Any) -> List[str]:
+    """Return names of indexes used by query plan (from `explain` output)"""
+    indexes = []
+    if isinstance(plan, dict):
+        if "indexName" in plan:
+            indexes.append(plan["indexName"])
+        for value in plan.values():
+            indexes.extend(get_plan_indexes(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            indexes.extend(get_plan_indexes(value))
+    return indexes
+
+
+def _iter_params(
+    node: Any, path: Tuple[Any, ...] = ()
+) -> Iterator[Tuple[Tuple[Any, ...], Param]]:
+    items = node.items() if isinstance(node, dict) else enumerate(node)
+    for key, value in items:
+        if isinstance(value, Param):
+            yield path + (key,), value
+        elif isinstance(value, (dict, list)):
+            yield from _iter_params(value, path + (key,))
+
+
+def _get_field_key(path: Tuple[Any, ...]) -> Optional[str]:
+    """Return document key of field, which condition contains parameter"""
+    for key in path:
+        if isinstance(key, str) and key not in LOGICAL_OPERATORS:
+            return key
+    return None
+
+
+def _fill(node: Any, tree: "DictStrAny", values: "DictStrAny") -> Any:
+    """Copy containers of query on paths to parameters and set parameter values"""
+    result = node.copy()
+    for key, subtree in tree.items():
+        if isinstance(subtree, Param):
+            result[key] = values[subtree.name]
+        else:
+            result[key] = _fill(node[key], subtree, values)
+    return result
+
+
+class PreparedQuery:
+    """
+    Query template with parameters.
+
+    Fixed parts of template are encoded once on prepare. Query is built
+    by copy of containers on paths to parameters, other parts are shared
+    between built queries, and only parameter values are encoded.
+
+    Usage::
+
+        by_type = User.prepare(
+            {"type": Param("type"), "created": {"$gte": Param("since")}},
+            index=[("type", 1), ("created", 1)],
+        )
+        users = await by_type.find(type=UserType.Admin, since=since)
+        assert await by_type.check_index(type=UserType.Admin, since=since)
+    """
+
+    def __init__(
+        self,
+        model: Type["DBPydanticMixin"],
+        template: "DictStrAny",
+        index: Optional[IndexType] = None,
+    ) -> None:
+        self.model = model
+        # Expected index of query
+        self.index = get_index_name(index) if index is not None else None
+        self.document = model._encode_query(template)
+        self._tree: "DictStrAny" = {}
+        # Names of parameters, which values are ObjectId (or not)
+        self._params: Dict[str, bool] = {}
+        id_keys = get_object_id_keys(model)
+        for path, param in _iter_params(self.document):
+            subtree = self._tree
+            for key in path[:-1]:
+                subtree = subtree.setdefault(key, {})
+            subtree[path[-1]] = param
+            is_id = _get_field_key(path) in id_keys
+            if self._params.get(param.name, is_id) != is_id:
+                raise ValueError(
+                    '"%s" parameter is used for ObjectId and other fields' % param.name
+                )
+            self._params[param.name] = is_id
+
+    @property
+    def params(self) -> List[str]:
+        return list(self._params)
+
+    def _encode_value(self, value: Any, is_id: bool) -> Any:
+        if is_id and getattr(self.model.Config, "convert_query_ids", True):
+            if isinstance(value, (list, tuple)):
+                value = [convert_id_condition(item) for item in value]
+            else:
+                value = convert_id_condition(value)
+        return self.model._encode_dict_to_mongo({"value": value})["value"]
+
+    def build(self, **params: Any) -> Query:
+        """Return compiled query with parameter values"""
+        for name in params:
+            if name not in self._params:
+                raise ValueError('"%s" parameter is not used in query' % name)
+        values = {}
+        for name, is_id in self._params.items():
+            try:
+                values[name] = self._encode_value(params[name], is_id)
+            except KeyError:
+                raise ValueError('"%s" parameter is not passed' % name)
+        return Query(self.model, _fill(self.document, self._tree, values))
+
+    async def find(self, **params: Any) -> List[DBPydanticMixin]:
+        return await self.model.find_many(self.build(**params))
+
+    async def find_one(self, **params: Any) -> Optional[DBPydanticMixin]:
+        return await self.model.find_one(self.build(**params))
+
+    async def count(self, **params: Any) -> int:
+        return await self.model.count(self.build(**params))
+
+    async def explain(self, **params: Any) -> "DictStrAny":
+        """Return query plan of query with parameter values"""
+        collection = await self.model.get_read_collection()
+        return await collection.find(self.build(**params).to_mongo()).explain()
+
+    async def check_index(self, **params: Any) -> bool:
+        """Check that query plan uses expected index"""
+        if self.index is None:
+            raise ValueError("Expected index of query is not set")
+        plan = (await self.explain(**params)).get("queryPlanner", {})
+        return self.index in get_plan_indexes(plan.get("winningPlan"))
+
+    def __repr__(self) -> str:
+        return "PreparedQuery(%s, %r)" % (self.model.__name__, self.document)
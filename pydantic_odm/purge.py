@@ -0,0 +1,120 @@
+"""Chunked and throttled deletion of documents"""
+from __future__ import annotations
+
+import asyncio
+from pydantic import BaseModel
+from pymongo.errors import OperationFailure
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Callable, Optional, Type
+
+from . import admission
+
+if TYPE_CHECKING:
+    from motor import motor_asyncio
+    from pydantic.typing import DictStrAny
+
+    from .mixins import DBPydanticMixin
+
+# Error codes of `replSetGetStatus` of server without replication
+# (NoReplicationEnabled and NotYetInitialized)
+STANDALONE_ERROR_CODES = frozenset({76, 94})
+
+
+class PurgeResult(BaseModel):
+    """Result of purge"""
+
+    deleted_count: int = 0
+    batches: int = 0
+    # Time of waiting for replication of secondaries (seconds)
+    lag_wait: float = 0.0
+    # Id of last processed document (pass it as `start_after` for resume)
+    last_id: Any = None
+
+
+def compute_replication_lag(status: "DictStrAny") -> float:
+    """Return max lag of secondaries (seconds) by `replSetGetStatus` result"""
+    members = status.get("members", [])
+    primary = next(
+        (m["optimeDate"] for m in members if m.get("stateStr") == "PRIMARY"), None
+    )
+    if primary is None:
+        return 0.0
+    lags = [
+        (primary - m["optimeDate"]).total_seconds()
+        for m in members
+        if m.get("stateStr") == "SECONDARY"
+    ]
+    return max(lags, default=0.0)
+
+
+async def get_replication_lag(database: motor_asyncio.AsyncIOMotorDatabase) -> float:
+    """Return max replication lag of database (0 for standalone server)"""
+    try:
+        status = await database.client.admin.command("replSetGetStatus")
+    except OperationFailure as e:
+        if e.code in STANDALONE_ERROR_CODES:
+            return 0.0
+        raise
+    return compute_replication_lag(status)
+
+
+async def purge(
+    model: Type["DBPydanticMixin"],
+    query: "DictStrAny",
+    chunk_size: int = 1000,
+    max_rate: Optional[float] = None,
+    max_lag: Optional[float] = None,
+    lag_interval: float = 1.0,
+    start_after: Any = None,
+    progress: Optional[Callable[[PurgeResult], Any]] = None,
+) -> PurgeResult:
+    """
+    Delete documents by query in batches of `_id`.
+
+    Every batch reads `chunk_size` ids in `_id` order and deletes them by one
+    `delete_many` (with query, so changed documents are not deleted). With
+    `max_rate` (documents per second) purge sleeps between batches, with
+    `max_lag` (seconds) it waits by `lag_interval` before batch until
+    secondaries catch up. `progress` is called with result after every batch,
+    `last_id` of result can be passed as `start_after` for resume.
+
+    Every `delete_many` is admitted by admission limiter of model separately,
+    so long purge doesn't hold slot of limiter between batches.
+    """
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+    query = model._encode_query(query)
+    collection = await model.get_collection()
+    limiter = admission.get_admission_limiter(model)
+    result = PurgeResult(last_id=start_after)
+    started = monotonic()
+    while True:
+        chunk_query = query
+        if result.last_id is not None:
+            chunk_query = {"$and": [query, {"_id": {"$gt": result.last_id}}]}
+        cursor = collection.find(chunk_query, {"_id": 1}).sort("_id", 1)
+        documents = await cursor.limit(chunk_size).to_list(length=chunk_size)
+        if not documents:
+            return result
+        if max_lag is not None:
+            while await get_replication_lag(collection.database) > max_lag:
+                await asyncio.sleep(lag_interval)
+                result.lag_wait += lag_interval
+        ids = [document["_id"] for document in documents]
+        batch_query = (
+            {"$and": [query, {"_id": {"$in": ids}}]} if query else {"_id": {"$in": ids}}
+        )
+        if limiter is None:
+            deleted = await collection.delete_many(batch_query)
+        else:
+            async with limiter.acquire():
+                deleted = await collection.delete_many(batch_query)
+        result.deleted_count += deleted.deleted_count
+        result.batches += 1
+        result.last_id = ids[-1]
+        if progress is not None:
+            progress(result)
+        if max_rate:
+            delay = result.deleted_count / max_rate - (monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
@@ -0,0 +1,223 @@
+"""Typed query expressions compiled against model fields"""
+from __future__ import annotations
+
+from functools import lru_cache
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from typing import TYPE_CHECKING, Any, Iterable, Union
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+    from typing import Type
+
+    from .mixins import DBPydanticMixin
+
+    QueryOperand = Union["Query", "DictStrAny"]
+
+
+def get_model_field(model: Type[BaseModel], name: str) -> ModelField:
+    """Return model field by name or alias"""
+    field = model.__fields__.get(name)
+    if field is None:
+        for model_field in model.__fields__.values():
+            if model_field.alias == name:
+                return model_field
+        raise AttributeError(
+            '"%s" field is not found in "%s" model' % (name, model.__name__)
+        )
+    return field
+
+
+def get_document_key(model: Type[BaseModel], field: ModelField) -> str:
+    """Return document key of model field (documents are stored by field names)"""
+    # Models decoded by MongoDB decoder store id as `_id`
+    if field.name == "id" and hasattr(model, "_mongo_decoder"):
+        return "_id"
+    return field.name
+
+
+def get_covering_projection(query: "DictStrAny") -> "DictStrAny":
+    """
+    Return projection of queried fields, which is covered by index of them.
+
+    `_id` is excluded unless it is queried. Queries without plain field
+    conditions (empty or with top-level operators only) project `_id`.
+    """
+    projection = {key: 1 for key in query if not key.startswith("$")}
+    if not projection:
+        return {"_id": 1}
+    projection.setdefault("_id", 0)
+    return projection
+
+
+class Query:
+    """
+    Compiled query of model.
+
+    Query document is encoded once on build, so query can be passed to query
+    methods of model many times without encoding. Queries are combined by
+    `&` (`$and`), `|` (`$or`) and `~` (`$nor`), plain dict queries are encoded
+    on combination.
+    """
+
+    __slots__ = ("model", "document")
+
+    def __init__(self, model: Type["DBPydanticMixin"], document: "DictStrAny"):
+        self.model = model
+        self.document = document
+
+    def to_mongo(self) -> "DictStrAny":
+        """Return encoded query document"""
+        return self.document
+
+    def _get_document(self, other: QueryOperand) -> "DictStrAny":
+        if isinstance(other, Query):
+            if not issubclass(self.model, other.model) and not issubclass(
+                other.model, self.model
+            ):
+                raise ValueError(
+                    'Query of "%s" model can\'t be combined with query of "%s" model'
+                    % (self.model.__name__, other.model.__name__)
+                )
+            return other.document
+        return self.model._encode_query(other)
+
+    def _combine(self, operator: str, other: QueryOperand) -> Query:
+        documents = []
+        for document in (self.document, self._get_document(other)):
+            if list(document) == [operator]:
+                documents.extend(document[operator])
+            else:
+                documents.append(document)
+        return Query(self.model, {operator: documents})
+
+    def __and__(self, other: QueryOperand) -> Query:
+        return self._combine("$and", other)
+
+    def __or__(self, other: QueryOperand) -> Query:
+        return self._combine("$or", other)
+
+    def __invert__(self) -> Query:
+        return Query(self.model, {"$nor": [self.document]})
+
+    def __repr__(self) -> str:
+        return "Query(%s, %r)" % (self.model.__name__, self.document)
+
+
+class FieldExpression:
+    """
+    Field of model in query expression.
+
+    Values of conditions are validated by field (items of list fields are
+    validated by item field), so they are converted to field type before
+    encoding. Fields of nested models are accessed as attributes
+    (or by item for names of expression methods).
+    """
+
+    def __init__(
+        self, model: Type["DBPydanticMixin"], field: ModelField, path: str
+    ) -> None:
+        self._model = model
+        self._field = field
+        self._path = path
+
+    def __getattr__(self, name: str) -> FieldExpression:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> FieldExpression:
+        nested_model = self._field.type_
+        if not isinstance(nested_model, type) or not issubclass(
+            nested_model, BaseModel
+        ):
+            raise AttributeError('"%s" field has no nested fields' % self._path)
+        field = get_model_field(nested_model, name)
+        # Only root id is stored as `_id`, nested models store it by field name
+        path = "%s.%s" % (self._path, field.name)
+        return FieldExpression(self._model, field, path)
+
+    def _convert(self, value: Any) -> Any:
+        if value is None:
+            return None
+        field = self._field
+        if field.shape != SHAPE_SINGLETON and not isinstance(value, (list, tuple, set)):
+            # Condition by item of list field
+            field = field.sub_fields[0] if field.sub_fields else field
+        validated, error = field.validate(value, {}, loc=self._path)
+        if error:
+            raise ValueError(
+                '"%s" value is not valid for "%s" field' % (value, self._path)
+            )
+        if isinstance(validated, BaseModel):
+            validated = validated.dict()
+        return validated
+
+    def _build(self, condition: Any) -> Query:
+        return Query(self._model, self._model._encode_query({self._path: condition}))
+
+    def _compare(self, operator: str, value: Any) -> Query:
+        return self._build({operator: self._convert(value)})
+
+    def __eq__(self, value: Any) -> Query:  # type: ignore
+        return self._build(self._convert(value))
+
+    def __ne__(self, value: Any) -> Query:  # type: ignore
+        return self._compare("$ne", value)
+
+    def __gt__(self, value: Any) -> Query:
+        return self._compare("$gt", value)
+
+    def __ge__(self, value: Any) -> Query:
+        return self._compare("$gte", value)
+
+    def __lt__(self, value: Any) -> Query:
+        return self._compare("$lt", value)
+
+    def __le__(self, value: Any) -> Query:
+        return self._compare("$lte", value)
+
+    def in_(self, values: Iterable[Any]) -> Query:
+        return self._build({"$in": [self._convert(value) for value in values]})
+
+    def not_in(self, values: Iterable[Any]) -> Query:
+        return self._build({"$nin": [self._convert(value) for value in values]})
+
+    def exists(self, exists: bool = True) -> Query:
+        return self._build({"$exists": exists})
+
+    def __repr__(self) -> str:
+        return "FieldExpression(%s, %r)" % (self._model.__name__, self._path)
+
+
+class ModelFields:
+    """Fields of model for build query expressions (see `Q`)"""
+
+    def __init__(self, model: Type["DBPydanticMixin"]) -> None:
+        self._model = model
+
+    def __getattr__(self, name: str) -> FieldExpression:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def __getitem__(self, name: str) -> FieldExpression:
+        field = get_model_field(self._model, name)
+        return FieldExpression(self._model, field, get_document_key(self._model, field))
+
+
+@lru_cache(maxsize=None)
+def Q(model: Type["DBPydanticMixin"]) -> ModelFields:
+    """
+    Return fields of model for build query expressions.
+
+    Function is used instead of model attribute, which could collide
+    with field names of model.
+
+    Usage::
+
+        query = (Q(User).age > 30) & Q(User).type.in_([UserType.Admin])
+        users = await User.find_many(query)
+        count = await User.count(Q(User).username == "admin")
+    """
+    return ModelFields(model)
@@ -0,0 +1,288 @@
+"""Parallel partitioned scan of collection"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor
+from typing import TYPE_CHECKING, Any, AsyncIterator, List, Optional, Tuple, Type, Union
+
+from .pagination import get_sort_key
+from .types import DateTimeRange
+
+if TYPE_CHECKING:
+    from motor import motor_asyncio
+    from pydantic.typing import DictStrAny
+
+    from .mixins import DBPydanticMixin
+
+    # Queue of decoded batches of partition (`None` ends partition)
+    BatchQueue = asyncio.Queue[Union[List[DBPydanticMixin], Exception, None]]
+
+# Count of sampled documents per partition for partition boundaries by default
+SAMPLES_PER_PARTITION = 100
+
+
+async def get_partition_bounds(
+    collection: motor_asyncio.AsyncIOMotorCollection,
+    query: "DictStrAny",
+    key: str,
+    partitions: int,
+    sample_size: int = None,
+) -> List[Any]:
+    """
+    Return boundaries, which split documents by key to partitions.
+
+    Boundaries are found as quantiles of `$sample` of matched documents
+    (`SAMPLES_PER_PARTITION` documents per partition by default). With zero
+    `sample_size` exact boundaries are found by `$bucketAuto` aggregation
+    over all matched documents: it reads and sorts whole matched set (on disk
+    for large collections), so it is as expensive as full scan. Returned list
+    contains lower boundaries of all partitions except first.
+    """
+    if sample_size is None:
+        sample_size = partitions * SAMPLES_PER_PARTITION
+    pipeline: List["DictStrAny"] = []
+    if query:
+        pipeline.append({"$match": query})
+    if sample_size:
+        pipeline.extend(
+            [
+                {"$sample": {"size": sample_size}},
+                {"$project": {"_id": 0, "value": "$" + key}},
+            ]
+        )
+        samples = await collection.aggregate(pipeline).to_list(length=None)
+        values = sorted(s["value"] for s in samples if s.get("value") is not None)
+        bounds: List[Any] = []
+        for i in range(1, partitions):
+            value = values[len(values) * i // partitions] if values else None
+            if value is not None and (not bounds or value > bounds[-1]):
+                bounds.append(value)
+        return bounds
+    pipeline.append({"$bucketAuto": {"groupBy": "$" + key, "buckets": partitions}})
+    cursor = collection.aggregate(pipeline, allowDiskUse=True)
+    buckets = await cursor.to_list(length=None)
+    return [bucket["_id"]["min"] for bucket in buckets[1:]]
+
+
+def get_partition_queries(
+    query: "DictStrAny", key: str, bounds: List[Any]
+) -> List["DictStrAny"]:
+    """Return queries of partitions by key boundaries"""
+    if not bounds:
+        return [query]
+    ranges: List["DictStrAny"] = []
+    lower = None
+    for upper in [*bounds, None]:
+        condition = {}
+        if lower is not None:
+            condition["$gte"] = lower
+        if upper is not None:
+            condition["$lt"] = upper
+        ranges.append({key: condition})
+        lower = upper
+    if not query:
+        return ranges
+    return [{"$and": [query, key_range]} for key_range in ranges]
+
+
+def decode_batch(
+    model: Type["DBPydanticMixin"], documents: List["DictStrAny"]
+) -> List["DBPydanticMixin"]:
+    """Create models from batch of documents (may be called in executor)"""
+    return [model._from_mongo_document(document) for document in documents]
+
+
+async def scan_partition(
+    model: Type["DBPydanticMixin"],
+    collection: motor_asyncio.AsyncIOMotorCollection,
+    query: "DictStrAny",
+    queue: "BatchQueue",
+    batch_size: int,
+    executor: Optional[Executor],
+    sort: Optional[List[Tuple[str, int]]] = None,
+) -> None:
+    """
+    Read documents of partition and put batches of models to queue.
+
+    `None` is put to queue when partition is finished, exception is put
+    instead of it if reading is failed.
+    """
+    loop = asyncio.get_event_loop()
+
+    async def put(documents: List["DictStrAny"]) -> None:
+        if executor is None:
+            models = decode_batch(model, documents)
+        else:
+            models = await loop.run_in_executor(
+                executor, decode_batch, model, documents
+            )
+        await queue.put(models)
+
+    try:
+        cursor = collection.find(query, batch_size=batch_size, sort=sort)
+        documents = []
+        async for document in cursor:
+            documents.append(document)
+            if len(documents) >= batch_size:
+                await put(documents)
+                documents = []
+        if documents:
+            await put(documents)
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+
+
+async def parallel_scan(
+    model: Type["DBPydanticMixin"],
+    query: "DictStrAny" = None,
+    partitions: int = 4,
+    key: str = "_id",
+    batch_size: int = 1000,
+    executor: Executor = None,
+    sample_size: int = None,
+    queue_size: int = None,
+) -> AsyncIterator["DBPydanticMixin"]:
+    """
+    Scan documents by partitions of key range concurrently.
+
+    Every partition is read by own cursor (so partitions are read over several
+    pooled connections) and models are yielded as partitions produce them,
+    so order of models is not defined. Documents must have non-null values
+    of key. Documents are decoded in `executor` (if it is passed), models
+    of processes pool executor must be importable.
+
+    Parameters:
+        - `query`: pymongo query
+        - `partitions`: count of partitions (concurrent cursors)
+        - `key`: field name, which values are split to partitions
+        - `batch_size`: count of documents, which are decoded at once
+        - `executor`: executor for decoding documents
+        - `sample_size`: count of sampled documents for partition boundaries
+          (zero for exact boundaries by aggregation over all matched documents)
+        - `queue_size`: count of decoded batches waiting for consumer
+    """
+    if partitions < 1:
+        raise ValueError("Partitions count must be positive")
+    key, _ = get_sort_key(model, key)
+    query = model._encode_query(query or {})
+    collection = await model.get_read_collection()
+    bounds: List[Any] = []
+    if partitions > 1:
+        bounds = await get_partition_bounds(
+            collection, query, key, partitions, sample_size
+        )
+
+    queue: "BatchQueue" = asyncio.Queue(maxsize=queue_size or partitions * 2)
+    tasks = [
+        asyncio.ensure_future(
+            scan_partition(
+                model, collection, partition_query, queue, batch_size, executor
+            )
+        )
+        for partition_query in get_partition_queries(query, key, bounds)
+    ]
+    try:
+        finished = 0
+        while finished < len(tasks):
+            batch = await queue.get()
+            if batch is None:
+                finished += 1
+                continue
+            if isinstance(batch, Exception):
+                raise batch
+            for item in batch:
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def get_time_slices(time_range: DateTimeRange, slices: int) -> List["DictStrAny"]:
+    """
+    Return range conditions of equal time slices of range.
+
+    Slices include lower border, last slice includes upper border of range.
+    """
+    if time_range.gte is None or time_range.lte is None:
+        raise ValueError("Time range must have both borders")
+    step = (time_range.lte - time_range.gte) / slices
+    if not step:
+        return [time_range.to_mongo()]
+    conditions = []
+    lower = time_range.gte
+    for i in range(1, slices):
+        upper = time_range.gte + step * i
+        conditions.append({"$gte": lower, "$lt": upper})
+        lower = upper
+    conditions.append({"$gte": lower, "$lte": time_range.lte})
+    return conditions
+
+
+async def scan_time_range(
+    model: Type["DBPydanticMixin"],
+    field: str,
+    time_range: Union[DateTimeRange, List[Any], "DictStrAny"],
+    slices: int = 4,
+    query: "DictStrAny" = None,
+    concurrency: int = None,
+    batch_size: int = 1000,
+    executor: Executor = None,
+    queue_size: int = 2,
+) -> AsyncIterator["DBPydanticMixin"]:
+    """
+    Scan documents of time range by slices concurrently in time order.
+
+    Range is split to equal time slices, every slice is read by own cursor
+    sorted by field (index on field is expected), so slices are read
+    concurrently and models are yielded in time order.
+
+    Parameters:
+        - `field`: field name of datetime values
+        - `time_range`: `DateTimeRange` (or value validated by it) with both borders
+        - `slices`: count of time slices
+        - `query`: pymongo query (additional to time range)
+        - `concurrency`: count of concurrently read slices (all slices by default)
+        - `batch_size`: count of documents, which are decoded at once
+        - `executor`: executor for decoding documents
+        - `queue_size`: count of decoded batches read ahead by every slice
+    """
+    if slices < 1:
+        raise ValueError("Slices count must be positive")
+    time_range = DateTimeRange.validate(time_range)
+    key, _ = get_sort_key(model, field)
+    query = model._encode_query(query or {})
+    collection = await model.get_read_collection()
+    # Slices wait for free slot in order, so earliest not finished slice
+    # (which is consumed) is always read
+    semaphore = asyncio.Semaphore(concurrency or slices)
+
+    async def scan_slice(condition: "DictStrAny", queue: "BatchQueue") -> None:
+        slice_query: "DictStrAny" = {key: condition}
+        if query:
+            slice_query = {"$and": [query, slice_query]}
+        async with semaphore:
+            await scan_partition(
+                model, collection, slice_query, queue, batch_size, executor, [(key, 1)]
+            )
+
+    queues = []
+    tasks = []
+    for condition in get_time_slices(time_range, slices):
+        queue: "BatchQueue" = asyncio.Queue(maxsize=queue_size)
+        queues.append(queue)
+        tasks.append(asyncio.ensure_future(scan_slice(condition, queue)))
+    try:
+        for queue in queues:
+            batch = await queue.get()
+            while batch is not None:
+                if isinstance(batch, Exception):
+                    raise batch
+                for item in batch:
+                    yield item
+                batch = await queue.get()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,72 @@
+"""Snapshots of loaded documents for change detection"""
+from __future__ import annotations
+
+import bson
+import hashlib
+from bson.errors import InvalidDocument
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+
+# Snapshot modes (see `DBPydanticMixin.Config.snapshot`)
+SNAPSHOT_FULL = "full"
+SNAPSHOT_HASH = "hash"
+SNAPSHOT_NONE = "none"
+SNAPSHOT_MODES = (SNAPSHOT_FULL, SNAPSHOT_HASH, SNAPSHOT_NONE)
+
+
+def hash_value(value: Any) -> bytes:
+    """Return short digest of document value"""
+    try:
+        data = bson.encode({"v": value})
+    except (InvalidDocument, TypeError, OverflowError):
+        data = repr(value).encode()
+    return hashlib.blake2b(data, digest_size=8).digest()
+
+
+class FieldHashes(Dict[str, Any]):
+    """
+    Snapshot of document, which contains digests of field values instead
+    of values (id is stored as is).
+    """
+
+    @classmethod
+    def from_document(cls, document: "DictStrAny") -> FieldHashes:
+        snapshot = cls()
+        snapshot.update_values(document)
+        return snapshot
+
+    def update_values(self, values: "DictStrAny") -> None:
+        for key, value in values.items():
+            self[key] = value if key == "id" else hash_value(value)
+
+    def is_changed(self, key: str, value: Any) -> bool:
+        return key not in self or self[key] != hash_value(value)
+
+
+def create_snapshot(document: "DictStrAny", mode: str) -> "DictStrAny":
+    """Return snapshot of decoded document by mode"""
+    if mode == SNAPSHOT_FULL:
+        return document
+    if mode == SNAPSHOT_HASH:
+        return FieldHashes.from_document(document)
+    if mode == SNAPSHOT_NONE:
+        return {}
+    raise ValueError('"%s" snapshot mode is not supported' % mode)
+
+
+def changed_fields(snapshot: "DictStrAny", data: "DictStrAny") -> "DictStrAny":
+    """Return fields of encoded data, which are changed from snapshot"""
+    if isinstance(snapshot, FieldHashes):
+        return {k: v for k, v in data.items() if snapshot.is_changed(k, v)}
+    return {k: v for k, v in data.items() if k not in snapshot or snapshot[k] != v}
+
+
+def update_snapshot(snapshot: "DictStrAny", values: "DictStrAny") -> "DictStrAny":
+    """Return new snapshot with updated values"""
+    if isinstance(snapshot, FieldHashes):
+        new_snapshot = FieldHashes(snapshot)
+        new_snapshot.update_values(values)
+        return new_snapshot
+    return {**snapshot, **values}
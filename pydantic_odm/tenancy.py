@@ -0,0 +1,189 @@
+"""Tenant-aware database routing"""
+from __future__ import annotations
+
+import abc
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from motor import motor_asyncio
+from threading import Lock
+from typing import Dict, Generator, Optional, Tuple
+
+from .db import get_db_manager
+
+# Tenant of current context (request, task, etc.)
+current_tenant: ContextVar[Optional[str]] = ContextVar("current_tenant", default=None)
+
+
+def get_current_tenant() -> Optional[str]:
+    """Return tenant of current context"""
+    return current_tenant.get()
+
+
+def set_current_tenant(tenant: Optional[str]) -> Token[Optional[str]]:
+    """Set tenant for current context and return token for reset it"""
+    return current_tenant.set(tenant)
+
+
+def reset_current_tenant(token: Token[Optional[str]]) -> None:
+    """Restore tenant, which was before `set_current_tenant` call"""
+    current_tenant.reset(token)
+
+
+@contextmanager
+def use_tenant(tenant: Optional[str]) -> Generator[None, None, None]:
+    """
+    Route all models with configured tenant resolver to tenant database
+    inside context.
+
+    Usage::
+
+        with use_tenant("acme"):
+            users = await User.find_many({})
+    """
+    token = set_current_tenant(tenant)
+    try:
+        yield
+    finally:
+        reset_current_tenant(token)
+
+
+class CollectionLRUCache:
+    """Bounded LRU cache for collection handles"""
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError("Cache size must be positive")
+        self.maxsize = maxsize
+        self._data: OrderedDict[
+            Tuple[str, str], motor_asyncio.AsyncIOMotorCollection
+        ] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Tuple[str, str]) -> bool:
+        return key in self._data
+
+    def get(
+        self, key: Tuple[str, str]
+    ) -> Optional[motor_asyncio.AsyncIOMotorCollection]:
+        with self._lock:
+            collection = self._data.get(key)
+            if collection is not None:
+                self._data.move_to_end(key)
+            return collection
+
+    def set(
+        self, key: Tuple[str, str], collection: motor_asyncio.AsyncIOMotorCollection
+    ) -> None:
+        with self._lock:
+            self._data[key] = collection
+            self._data.move_to_end(key)
+            # Drop least recently used handles
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class AbstractTenantResolver(abc.ABC):
+    """
+    Abstract tenant resolver.
+
+    Resolver returns database of tenant and keeps collection handles
+    in bounded LRU cache.
+    """
+
+    def __init__(self, cache_size: int = 1024):
+        self.cache = CollectionLRUCache(cache_size)
+
+    @abc.abstractmethod
+    def get_database(self, tenant: str) -> motor_asyncio.AsyncIOMotorDatabase:
+        """Return database for passed tenant"""
+        raise NotImplementedError()
+
+    def get_collection(
+        self, tenant: str, collection_name: str
+    ) -> motor_asyncio.AsyncIOMotorCollection:
+        """Return cached collection handle of tenant database"""
+        key = (tenant, collection_name)
+        collection = self.cache.get(key)
+        if collection is None:
+            collection = self.get_database(tenant)[collection_name]
+            self.cache.set(key, collection)
+        return collection
+
+
+class TenantDatabaseResolver(AbstractTenantResolver):
+    """
+    Resolve tenant to own database in one connection.
+
+    Database is created by MongoDB on first write, so new tenants
+    don't need any preparation.
+
+    Usage::
+
+        class User(DBPydanticMixin):
+            class Config:
+                collection = "users"
+                tenant_resolver = TenantDatabaseResolver("default", "tenant_{tenant}")
+    """
+
+    def __init__(
+        self,
+        alias: str = "default",
+        name_template: str = "{tenant}",
+        cache_size: int = 1024,
+    ):
+        super().__init__(cache_size)
+        self.alias = alias
+        self.name_template = name_template
+
+    def get_database(self, tenant: str) -> motor_asyncio.AsyncIOMotorDatabase:
+        db_manager = get_db_manager()
+        if not db_manager:
+            raise RuntimeError("MongoDBManager not initialized")
+        connection = db_manager.connections.get(self.alias)
+        if connection is None:
+            raise ValueError(
+                '"%s" is not found in MongoDBManager.connections' % self.alias
+            )
+        return connection[self.name_template.format(tenant=tenant)]
+
+
+class TenantAliasResolver(AbstractTenantResolver):
+    """
+    Resolve tenant to database configured in MongoDBManager by fixed mapping.
+
+    Usage::
+
+        class User(DBPydanticMixin):
+            class Config:
+                collection = "users"
+                tenant_resolver = TenantAliasResolver(
+                    {"acme": "acme_db", "globex": "globex_db"}, default="default"
+                )
+    """
+
+    def __init__(
+        self, mapping: Dict[str, str], default: str = None, cache_size: int = 1024,
+    ):
+        super().__init__(cache_size)
+        self.mapping = mapping
+        self.default = default
+
+    def get_database(self, tenant: str) -> motor_asyncio.AsyncIOMotorDatabase:
+        alias = self.mapping.get(tenant, self.default)
+        if not alias:
+            raise ValueError('Tenant "%s" is not mapped to database alias' % tenant)
+        db_manager = get_db_manager()
+        if not db_manager:
+            raise RuntimeError("MongoDBManager not initialized")
+        db = db_manager[alias]
+        if db is None:
+            raise ValueError('"%s" is not found in MongoDBManager.databases' % alias)
+        return db
@@ -1,11 +1,12 @@
 """Types for pydantic models"""
 from __future__ import annotations
 
+import re
 from bson import ObjectId
 from bson.errors import InvalidId
 from datetime import datetime
 from pydantic import BaseModel
-from typing import TYPE_CHECKING, Any, Callable, Generator, List, Union
+from typing import TYPE_CHECKING, Any, Callable, Generator, List, Optional, Union
 
 from .errors import DatetimeBorderCrossing
 
@@ -15,6 +16,10 @@ if TYPE_CHECKING:
     ValidatorClsMethod = Callable[[Any], Any]
 
 
+# Pattern of ObjectId string (same check as in `ObjectId.is_valid` for strings)
+OBJECT_ID_PATTERN = re.compile(r"^[0-9a-fA-F]{24}\Z")
+
+
 class ObjectIdStr(str):
     """Field for validate string like ObjectId"""
 
@@ -26,12 +31,45 @@ class ObjectIdStr(str):
     def validate(cls, v: Union[ObjectId, str]) -> str:
         if isinstance(v, ObjectId):
             return str(v)
-        else:
-            try:
-                ObjectId(str(v))
-            except InvalidId:
-                raise ValueError("Not a valid ObjectId")
+        if not OBJECT_ID_PATTERN.match(v if isinstance(v, str) else str(v)):
+            raise ValueError("Not a valid ObjectId")
+        return v
+
+
+class NativeObjectId(ObjectId):
+    """
+    Field for store ObjectId as is (with cached string form).
+
+    Values are stored to MongoDB as ObjectId, so queries by fields of this type
+    are converted from strings (see `pydantic_odm.encoders.ids`).
+    """
+
+    __slots__ = ("_str",)
+
+    def __str__(self) -> str:
+        try:
+            return self._str
+        except AttributeError:
+            self._str: str = super().__str__()
+            return self._str
+
+    def __reduce__(self) -> Any:
+        return self.__class__, (self.binary,)
+
+    @classmethod
+    def __get_validators__(cls) -> Generator["ValidatorClsMethod", None, None]:
+        yield cls.validate
+
+    @classmethod
+    def validate(cls, v: Union[ObjectId, str, bytes]) -> NativeObjectId:
+        if isinstance(v, cls):
             return v
+        if isinstance(v, ObjectId):
+            return cls(v.binary)
+        try:
+            return cls(v)
+        except (InvalidId, TypeError):
+            raise ValueError("Not a valid ObjectId")
 
 
 class DateTimeRange(BaseModel):
@@ -40,21 +78,37 @@ class DateTimeRange(BaseModel):
 
     First elem - lower bound.
     Second elem - upper bound.
+
+    In queries range is encoded to `{"$gte": gte, "$lte": lte}` (borders
+    without value are omitted).
     """
 
-    gte: datetime
-    lte: datetime
+    gte: Optional[datetime] = None
+    lte: Optional[datetime] = None
+
+    def to_mongo(self) -> "DictStrAny":
+        """Return range operators of query"""
+        operators = {}
+        if self.gte is not None:
+            operators["$gte"] = self.gte
+        if self.lte is not None:
+            operators["$lte"] = self.lte
+        return operators
 
     @classmethod
     def __get_validators__(cls) -> Generator["ValidatorClsMethod", None, None]:
         yield cls.validate
 
     @classmethod
-    def validate(cls, v: Union[List[Any], "DictStrAny"]) -> DateTimeRange:
+    def validate(
+        cls, v: Union[DateTimeRange, List[Any], "DictStrAny"]
+    ) -> DateTimeRange:
         """Check border crossing"""
         gte, lte = None, None
         try:
-            if isinstance(v, list):
+            if isinstance(v, DateTimeRange):
+                gte, lte = v.gte, v.lte
+            elif isinstance(v, list):
                 gte, lte = v
             elif isinstance(v, dict):
                 gte = v.get("gte")
@@ -0,0 +1,221 @@
+"""Declarative async validation of documents before save"""
+from __future__ import annotations
+
+import asyncio
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
+
+from .encoders.ids import get_object_id_keys, to_object_id
+from .errors import DocumentValidationError
+from .query import get_document_key
+
+if TYPE_CHECKING:
+    from pydantic.typing import DictStrAny
+    from typing import Awaitable, Callable, Union
+
+    from .mixins import DBPydanticMixin
+
+    AsyncValidator = Callable[..., Awaitable[Any]]
+    # Positions of reference values: (index of document, field name)
+    Positions = List[Tuple[int, str]]
+
+# Attribute of function with names of validated fields
+VALIDATOR_FIELDS_ATTR = "__async_validator_fields__"
+
+
+class Reference:
+    """
+    Reference to document of other model by field value (by default by id).
+
+    Usage::
+
+        class Post(DBPydanticMixin):
+            author_id: ObjectIdStr
+            category: str
+
+            class Config:
+                references = {
+                    "author_id": User,
+                    "category": Reference(Category, field="slug"),
+                }
+    """
+
+    __slots__ = ("model", "field")
+
+    def __init__(self, model: Type["DBPydanticMixin"], field: str = "id"):
+        if field not in model.__fields__:
+            raise ValueError(
+                '"%s" field is not found in "%s" model' % (field, model.__name__)
+            )
+        self.model = model
+        self.field = field
+
+    @property
+    def key(self) -> str:
+        """Document key of referenced field"""
+        return get_document_key(self.model, self.model.__fields__[self.field])
+
+    def convert(self, value: Any) -> Any:
+        """Return value of reference as it is stored in referenced documents"""
+        if self.key in get_object_id_keys(self.model):
+            return to_object_id(value)
+        return value
+
+
+def async_validator(*fields: str) -> Callable[["AsyncValidator"], "AsyncValidator"]:
+    """
+    Register async validator of model fields.
+
+    Validator is called with model class, field value and validated document
+    for every document with field, raises `ValueError`, `TypeError` or
+    `AssertionError` for invalid value. Validators of many documents are
+    run concurrently (not more than `Config.validation_concurrency`).
+
+    Usage::
+
+        class User(DBPydanticMixin):
+            email: str
+
+            @async_validator("email")
+            async def check_email(cls, value, document):
+                if await Blacklist.count({"email": value}):
+                    raise ValueError("Email is blacklisted")
+    """
+    if not fields:
+        raise ValueError("Validated fields are not passed")
+
+    def decorator(func: "AsyncValidator") -> "AsyncValidator":
+        setattr(func, VALIDATOR_FIELDS_ATTR, fields)
+        return func
+
+    return decorator
+
+
+@lru_cache(maxsize=None)
+def get_validators(
+    model: Type["DBPydanticMixin"],
+) -> Dict[str, Tuple["AsyncValidator", ...]]:
+    """Return async validators of model by field names (with inherited)"""
+    validators: Dict[str, List["AsyncValidator"]] = {}
+    seen = set()
+    for klass in model.__mro__:
+        for name, func in vars(klass).items():
+            fields = getattr(func, VALIDATOR_FIELDS_ATTR, None)
+            if not fields or name in seen:
+                continue
+            seen.add(name)
+            for field in fields:
+                validators.setdefault(field, []).append(func)
+    return {field: tuple(funcs) for field, funcs in validators.items()}
+
+
+@lru_cache(maxsize=None)
+def get_references(model: Type["DBPydanticMixin"]) -> Dict[str, Reference]:
+    """Return references of model by field names (see `Config.references`)"""
+    references: Dict[str, Union[Reference, Type["DBPydanticMixin"]]] = getattr(
+        model.Config, "references", None
+    ) or {}
+    return {
+        field: reference if isinstance(reference, Reference) else Reference(reference)
+        for field, reference in references.items()
+    }
+
+
+def get_validated_fields(data: "DictStrAny") -> "DictStrAny":
+    """Return fields of document or `$set` fields of update document"""
+    if any(key.startswith("$") for key in data):
+        return data.get("$set") or {}
+    return data
+
+
+def collect_references(
+    model: Type["DBPydanticMixin"], documents: List["DictStrAny"]
+) -> Dict[Tuple[Type["DBPydanticMixin"], str], Dict[Any, "Positions"]]:
+    """
+    Return positions of reference values by referenced model and key.
+
+    Values of many fields referencing one model key are checked together,
+    values of list fields are checked by items.
+    """
+    grouped: Dict[Tuple[Type["DBPydanticMixin"], str], Dict[Any, "Positions"]] = {}
+    for field, reference in get_references(model).items():
+        values = grouped.setdefault((reference.model, reference.key), {})
+        for index, document in enumerate(documents):
+            value = document.get(field)
+            if value is None:
+                continue
+            for item in value if isinstance(value, (list, tuple, set)) else (value,):
+                values.setdefault(reference.convert(item), []).append((index, field))
+    return {group: values for group, values in grouped.items() if values}
+
+
+async def find_missing(
+    model: Type["DBPydanticMixin"], key: str, values: List[Any]
+) -> List[Any]:
+    """Return values, which are not found in referenced collection (one query)"""
+    collection = await model.get_collection()
+    cursor = collection.find({key: {"$in": values}}, {key: 1})
+    found = {document.get(key) for document in await cursor.to_list(length=None)}
+    return [value for value in values if value not in found]
+
+
+async def validate_documents(
+    model: Type["DBPydanticMixin"],
+    documents: List["DictStrAny"],
+    concurrency: Optional[int] = None,
+) -> None:
+    """
+    Check references and run async validators of model for documents.
+
+    References are checked by one `$in` query per referenced model key,
+    queries and validators are run concurrently (not more than `concurrency`,
+    by default `Config.validation_concurrency`). All errors are raised
+    together by `DocumentValidationError`.
+    """
+    validators = get_validators(model)
+    references = get_references(model)
+    if not documents or not (validators or references):
+        return
+    documents = [get_validated_fields(document) for document in documents]
+    if concurrency is None:
+        concurrency = getattr(model.Config, "validation_concurrency", 10)
+    semaphore = asyncio.Semaphore(concurrency)
+    errors: List[Tuple[int, str, str]] = []
+
+    async def check_references(
+        ref_model: Type["DBPydanticMixin"], key: str, values: Dict[Any, "Positions"]
+    ) -> None:
+        async with semaphore:
+            missing = await find_missing(ref_model, key, list(values))
+        for value in missing:
+            for index, field in values[value]:
+                errors.append(
+                    (
+                        index,
+                        field,
+                        "%s with %s %r is not found" % (ref_model.__name__, key, value),
+                    )
+                )
+
+    async def run_validator(
+        func: "AsyncValidator", index: int, field: str, document: "DictStrAny"
+    ) -> None:
+        async with semaphore:
+            try:
+                await func(model, document[field], document)
+            except (ValueError, TypeError, AssertionError) as e:
+                errors.append((index, field, str(e)))
+
+    tasks = [
+        check_references(ref_model, key, values)
+        for (ref_model, key), values in collect_references(model, documents).items()
+    ]
+    for index, document in enumerate(documents):
+        for field, funcs in validators.items():
+            if field in document:
+                tasks.extend(
+                    run_validator(func, index, field, document) for func in funcs
+                )
+    await asyncio.gather(*tasks)
+    if errors:
+        raise DocumentValidationError(sorted(errors, key=lambda e: e[:2]))
@@ -0,0 +1,192 @@
+"""Write-behind buffering of model saves"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from motor import motor_asyncio
+    from pydantic.typing import DictStrAny
+
+    from .mixins import DBPydanticMixin
+
+    PendingWrites = Dict[
+        str, Tuple[motor_asyncio.AsyncIOMotorCollection, Dict[Any, DictStrAny]]
+    ]
+
+logger = logging.getLogger(__name__)
+
+# Write-behind buffers of models
+_buffers: "WeakKeyDictionary[Type[DBPydanticMixin], WriteBehindBuffer]" = (
+    WeakKeyDictionary()
+)
+
+
+class WriteBehindBuffer:
+    """
+    Buffer of pending writes of documents.
+
+    Writes of one document are coalesced (last write wins for each field)
+    and flushed by one unordered `bulk_write` of upserts when buffer contains
+    `max_size` documents or after `max_latency` seconds since first pending
+    write. Writes rejected by server (write errors of bulk result) are dropped
+    by `drop_write`, writes of failed flush are returned to buffer and retried
+    by next flush (not more than `max_retries` times).
+    """
+
+    def __init__(
+        self, max_size: int = 1000, max_latency: float = 1.0, max_retries: int = 3
+    ):
+        if max_size < 1 or max_latency <= 0:
+            raise ValueError("Max size and max latency must be positive")
+        self.max_size = max_size
+        self.max_latency = max_latency
+        self.max_retries = max_retries
+        self.pending: "PendingWrites" = {}
+        # Count of failed flushes of pending documents by collection name and id
+        self.attempts: Dict[Tuple[str, Any], int] = {}
+        self._timer: Optional["asyncio.Future[None]"] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(documents) for _, documents in self.pending.values())
+
+    async def add(
+        self,
+        collection: motor_asyncio.AsyncIOMotorCollection,
+        document_id: Any,
+        fields: "DictStrAny",
+    ) -> None:
+        """
+        Add fields of document to buffer.
+
+        Errors of flush by size are logged (writes are kept for retry), so they
+        are not raised to unrelated save.
+        """
+        _, documents = self.pending.setdefault(collection.full_name, (collection, {}))
+        documents.setdefault(document_id, {}).update(fields)
+        if len(self) >= self.max_size:
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Write-behind flush failed")
+        if self.pending and (self._timer is None or self._timer.done()):
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.max_latency)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Write-behind flush failed")
+
+    def _restore(self, pending: "PendingWrites", error: Exception) -> None:
+        for name, (collection, documents) in pending.items():
+            for document_id, fields in documents.items():
+                attempts = self.attempts.get((name, document_id), 0) + 1
+                if attempts > self.max_retries:
+                    self.attempts.pop((name, document_id), None)
+                    self.drop_write(collection, document_id, fields, error)
+                    continue
+                self.attempts[name, document_id] = attempts
+                _, current = self.pending.setdefault(name, (collection, {}))
+                current[document_id] = {**fields, **current.get(document_id, {})}
+
+    def drop_write(
+        self,
+        collection: motor_asyncio.AsyncIOMotorCollection,
+        document_id: Any,
+        fields: "DictStrAny",
+        error: Any,
+    ) -> None:
+        """Drop failed write of document (override it for dead-letter storage)"""
+        logger.error(
+            'Write-behind of document %r to "%s" is dropped: %s',
+            document_id,
+            collection.full_name,
+            error,
+        )
+
+    def build_operation(self, document_id: Any, fields: "DictStrAny") -> UpdateOne:
+        """Return write operation of pending document fields"""
+        return UpdateOne({"_id": document_id}, {"$set": fields}, upsert=True)
+
+    async def flush(self) -> int:
+        """Write pending documents and return count of written documents"""
+        async with self._lock:
+            pending, self.pending = self.pending, {}
+            if self._timer is not None and self._timer is not asyncio.current_task():
+                self._timer.cancel()
+            self._timer = None
+            written = 0
+            try:
+                for name in list(pending):
+                    collection, documents = pending[name]
+                    written += await self._write(name, collection, documents)
+                    del pending[name]
+            except Exception as e:
+                self._restore(pending, e)
+                raise
+            return written
+
+    async def _write(
+        self,
+        name: str,
+        collection: motor_asyncio.AsyncIOMotorCollection,
+        documents: Dict[Any, "DictStrAny"],
+    ) -> int:
+        """Write documents of collection and return count of written documents"""
+        document_ids = list(documents)
+        operations: List[UpdateOne] = [
+            self.build_operation(document_id, documents[document_id])
+            for document_id in document_ids
+        ]
+        if not operations:
+            return 0
+        write_errors = []
+        try:
+            await collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Other writes of unordered bulk are applied, rejected writes
+            # would fail again, so they are not retried
+            write_errors = e.details.get("writeErrors", [])
+        for document_id in document_ids:
+            self.attempts.pop((name, document_id), None)
+        for error in write_errors:
+            document_id = document_ids[error["index"]]
+            self.drop_write(
+                collection, document_id, documents[document_id], error.get("errmsg")
+            )
+        return len(operations) - len(write_errors)
+
+
+def get_write_behind_buffer(model: Type["DBPydanticMixin"]) -> WriteBehindBuffer:
+    """Return write-behind buffer of model (created on first use)"""
+    buffer = _buffers.get(model)
+    if buffer is None:
+        buffer = WriteBehindBuffer(
+            max_size=getattr(model.Config, "write_behind_max_size", 1000),
+            max_latency=getattr(model.Config, "write_behind_max_latency", 1.0),
+            max_retries=getattr(model.Config, "write_behind_max_retries", 3),
+        )
+        _buffers[model] = buffer
+    return buffer
+
+
+async def flush_all() -> int:
+    """
+    Flush write-behind buffers of all models.
+
+    Call it on application shutdown for write pending documents::
+
+        async def shutdown():
+            await writebehind.flush_all()
+    """
+    written = 0
+    for buffer in list(_buffers.values()):
+        written += await buffer.flush()
+    return written
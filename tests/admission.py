@@ -0,0 +1,103 @@
+"""Tests for admission control of database operations"""
+import asyncio
+import pytest
+from datetime import datetime
+
+from pydantic_odm import admission, mixins
+from pydantic_odm.errors import AdmissionRejected
+
+pytestmark = pytest.mark.asyncio
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+
+    class Config:
+        database = "default"
+        collection = "test_admission_user"
+
+
+class AdmissionLimiterTestCase:
+    async def _hold(self, limiter, event):
+        async with limiter.acquire():
+            await event.wait()
+
+    async def test_limit_concurrency(self):
+        limiter = admission.AdmissionLimiter(max_concurrency=1)
+        event = asyncio.Event()
+        holder = asyncio.ensure_future(self._hold(limiter, event))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(self._hold(limiter, asyncio.Event()))
+        await asyncio.sleep(0)
+        assert limiter.stats()["active"] == 1
+        assert limiter.stats()["waiting"] == 1
+
+        event.set()
+        await holder
+        await asyncio.sleep(0)
+        assert limiter.stats()["active"] == 1
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert limiter.stats()["admitted"] == 2
+        assert limiter.stats()["max_wait"] > 0
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"max_queue": 0}, id="full_queue"),
+            pytest.param({"timeout": 0.01}, id="timeout"),
+        ],
+    )
+    async def test_reject(self, kwargs):
+        limiter = admission.AdmissionLimiter(max_concurrency=1, **kwargs)
+        event = asyncio.Event()
+        holder = asyncio.ensure_future(self._hold(limiter, event))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected):
+            async with limiter.acquire():
+                pass
+        assert limiter.stats()["rejected"] == 1
+        event.set()
+        await holder
+
+    async def test_nested_acquire(self):
+        limiter = admission.AdmissionLimiter(max_concurrency=1, max_queue=0)
+        async with limiter.acquire():
+            async with limiter.acquire():
+                assert limiter.stats()["active"] == 1
+        assert limiter.stats()["active"] == 0
+
+
+class AdmittedOperationsTestCase:
+    async def test_model_limiter(self, init_test_db, monkeypatch):
+        limiter = admission.AdmissionLimiter(max_concurrency=2)
+        monkeypatch.setattr(User.Config, "admission_limiter", limiter, raising=False)
+        user = await User.create({"username": "test", "created": datetime.now()})
+        # update_many calls find_many in slot of outer operation
+        await User.update_many({}, {"$set": {"username": "new"}})
+        assert (await User.find_one({"_id": user.id})).username == "new"
+        assert limiter.stats()["admitted"] == 3
+        assert limiter.stats()["active"] == 0
+
+    async def test_alias_limiter(self, init_test_db):
+        limiter = admission.AdmissionLimiter(max_concurrency=1, max_queue=0)
+        admission.set_alias_limiter("default", limiter)
+        try:
+            event = asyncio.Event()
+            holder = asyncio.ensure_future(self._hold(limiter, event))
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected):
+                await User.count()
+            event.set()
+            await holder
+            assert await User.count() == 0
+        finally:
+            admission.set_alias_limiter("default", None)
+        assert admission.get_admission_limiter(User) is None
+
+    async def _hold(self, limiter, event):
+        async with limiter.acquire():
+            await event.wait()
@@ -0,0 +1,136 @@
+"""Tests for atomic update operators"""
+import pytest
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic_odm import mixins
+from pydantic_odm.atomic import NOT_APPLIED, apply_operation
+
+pytestmark = pytest.mark.asyncio
+
+
+class Comment(mixins.BaseDBMixin):
+    """Example comment model"""
+
+    body: str
+
+
+class Post(mixins.DBPydanticMixin):
+    """Example post model"""
+
+    title: str
+    views: int = 0
+    rating: Optional[float]
+    tags: List[str] = []
+    comments: List[Comment] = []
+    updated: Optional[datetime]
+
+    class Config:
+        database = "default"
+        collection = "test_atomic_post"
+
+
+class ApplyOperationTestCase:
+    @pytest.mark.parametrize(
+        "operator,value,operand,expected",
+        [
+            pytest.param("$inc", 1, 2, 3, id="inc"),
+            pytest.param("$inc", None, 2, NOT_APPLIED, id="inc_none"),
+            pytest.param("$inc", 1, 0.5, NOT_APPLIED, id="inc_float_to_int"),
+            pytest.param("$inc", 1.5, 1, 2.5, id="inc_int_to_float"),
+            pytest.param("$inc", 1, True, NOT_APPLIED, id="inc_bool"),
+            pytest.param("$inc", 1, "1", NOT_APPLIED, id="inc_str"),
+            pytest.param("$min", 5, 3, 3, id="min"),
+            pytest.param("$max", 5, 3, 5, id="max"),
+            pytest.param("$max", 5, "a", NOT_APPLIED, id="max_incomparable"),
+            pytest.param("$push", ["a"], "a", ["a", "a"], id="push"),
+            pytest.param("$push", [], {"$each": ["a", "b"]}, ["a", "b"], id="each"),
+            pytest.param(
+                "$push", [], {"$each": ["a"], "$slice": 1}, NOT_APPLIED, id="slice"
+            ),
+            pytest.param("$addToSet", ["a"], {"$each": ["a", "b"]}, ["a", "b"]),
+            pytest.param("$unset", ["a"], "", [], id="unset"),
+        ],
+    )
+    async def test_apply_operation(self, operator, value, operand, expected):
+        field = Post.__fields__["tags"]
+        assert apply_operation(operator, value, operand, field) == expected
+
+    async def test_unset_required_field(self):
+        field = Post.__fields__["title"]
+        assert apply_operation("$unset", "test", "", field) is NOT_APPLIED
+
+
+class AtomicTestCase:
+    async def _create_post(self):
+        return await Post.create({"title": "test", "tags": ["a"], "rating": 2.5})
+
+    @pytest.mark.parametrize("refresh", ["local", "projection"])
+    async def test_atomic(self, init_test_db, refresh):
+        post = await self._create_post()
+        await post.atomic(
+            {
+                "$inc": {"views": 2},
+                "$addToSet": {"tags": {"$each": ["a", "b"]}},
+                "$push": {"comments": Comment(body="first")},
+                "$max": {"rating": 4.0},
+                "$unset": {"updated": ""},
+            },
+            refresh=refresh,
+        )
+        assert post.views == 2
+        assert post.tags == ["a", "b"]
+        assert isinstance(post.comments[0], Comment)
+        assert post.comments[0].body == "first"
+        assert post.rating == 4.0
+
+        stored = await Post.find_one({"_id": post.id})
+        assert stored.views == 2
+        assert stored.tags == ["a", "b"]
+        assert stored.rating == 4.0
+        assert stored.comments[0].body == "first"
+
+    async def test_not_deterministic_field_is_fetched(self, init_test_db):
+        post = await self._create_post()
+        collection = await Post.get_collection()
+        await collection.update_one({"_id": post.id}, {"$push": {"tags": "b"}})
+        await post.atomic(
+            {"$inc": {"views": 1}, "$push": {"tags": {"$each": ["c"], "$slice": -2}}}
+        )
+        assert post.views == 1
+        # Tags are fetched from document, which is changed by other client
+        assert post.tags == ["b", "c"]
+
+    async def test_required_field_is_not_unset(self, init_test_db):
+        post = await self._create_post()
+        with pytest.raises(ValueError, match="required"):
+            await post.atomic({"$inc": {"views": 1}, "$unset": {"title": ""}})
+        # Error is raised before write is sent
+        stored = await Post.find_one({"_id": post.id})
+        assert stored.title == "test" and stored.views == 0
+
+    async def test_changed_fields_are_not_saved_again(self, init_test_db):
+        post = await self._create_post()
+        await post.atomic({"$inc": {"views": 1}})
+        collection = await Post.get_collection()
+        await collection.update_one({"_id": post.id}, {"$inc": {"views": 10}})
+        await post.save()
+        assert (await Post.find_one({"_id": post.id})).views == 11
+
+    @pytest.mark.parametrize(
+        "operations,refresh,error",
+        [
+            pytest.param({"$set": {"views": 1}}, "local", "operator", id="operator"),
+            pytest.param({"$inc": {"unknown": 1}}, "local", "field", id="field"),
+            pytest.param({"$inc": {"views": 1}}, "full", "refresh", id="refresh"),
+            pytest.param({"$unset": {"title": ""}}, "local", "required", id="unset"),
+        ],
+    )
+    async def test_atomic_errors(self, init_test_db, operations, refresh, error):
+        post = await self._create_post()
+        with pytest.raises(ValueError, match=error):
+            await post.atomic(operations, refresh=refresh)
+
+    async def test_atomic_without_id(self):
+        with pytest.raises(ValueError, match="Not found id"):
+            await Post(title="test", id=None).atomic({"$inc": {"views": 1}})
@@ -0,0 +1,85 @@
+"""Tests for runner of benchmarks"""
+import pytest
+
+from benchmarks import micro, runner, workload
+from benchmarks.models import Post, make_post_data
+from pydantic_odm.encoders.codegen import ModelEncoderCompiler
+from pydantic_odm.encoders.mongodb import BaseMongoDBModelEncoder
+
+pytestmark = pytest.mark.asyncio
+
+
+def _result(key, median):
+    return runner.BenchmarkResult(
+        key=key,
+        name=key,
+        group="micro",
+        rounds=1,
+        iterations=1,
+        min=median,
+        median=median,
+        mean=median,
+        stdev=0.0,
+        ops=1 / median if median else 0.0,
+    )
+
+
+class CompareResultsTestCase:
+    @pytest.mark.parametrize(
+        "median, threshold, regressed",
+        [
+            pytest.param(1.1, 0.2, False, id="within_threshold"),
+            pytest.param(1.2, 0.2, False, id="on_threshold"),
+            pytest.param(1.3, 0.2, True, id="regression"),
+            pytest.param(1.3, 0.5, False, id="custom_threshold"),
+            pytest.param(0.5, 0.2, False, id="speedup"),
+        ],
+    )
+    async def test_threshold(self, median, threshold, regressed):
+        baseline = {"encode": _result("encode", 1.0)}
+        regressions = runner.compare_results(
+            [_result("encode", median)], baseline, threshold
+        )
+        assert bool(regressions) is regressed
+        if regressed:
+            assert regressions[0].key == "encode"
+            assert regressions[0].ratio == pytest.approx(median)
+
+    async def test_without_baseline(self):
+        baseline = {"decode": _result("decode", 0.0)}
+        results = [_result("encode", 2.0), _result("decode", 2.0)]
+        assert runner.compare_results(results, baseline) == []
+
+
+class MicroBenchmarksTestCase:
+    async def test_model_encoders(self):
+        benchmarks = [
+            benchmark
+            for benchmark in micro.get_document_benchmarks("small", 1)
+            if benchmark.name == "encode_model"
+        ]
+        assert [b.params["encoder"] for b in benchmarks] == ["generic", "compiled"]
+        # Both encoders produce same document
+        assert benchmarks[0].func() == benchmarks[1].func()
+
+
+class InstrumentModelTestCase:
+    async def test_compiled_encoder_is_used(self, mocker):
+        model = workload.instrument_model(Post)
+        post = model.parse_obj(make_post_data("small", 1))
+        compiled = mocker.spy(ModelEncoderCompiler, "get_encoder")
+        generic = mocker.spy(BaseMongoDBModelEncoder, "__call__")
+        times = {}
+        token = workload._stage_times.set(times)
+        try:
+            document = post._encode_model_to_mongo(exclude={"id"})
+            model._encode_query({"title": "test"})
+        finally:
+            workload._stage_times.reset(token)
+        # Generated function of instrumented model (and of nested models)
+        assert compiled.call_args_list[0][0][1] is model
+        assert generic.call_count == 0
+        assert document == Post.parse_obj(post.dict())._encode_model_to_mongo(
+            exclude={"id"}
+        )
+        assert set(times) == {"encode"}
@@ -0,0 +1,103 @@
+"""Tests for bulk operations by natural key"""
+import pytest
+from datetime import datetime
+
+from pydantic_odm import bulk, mixins
+
+pytestmark = pytest.mark.asyncio
+
+
+class Product(mixins.DBPydanticMixin):
+    """Example product model"""
+
+    external_id: str
+    title: str
+    price: int
+    created: datetime = None
+
+    class Config:
+        database = "default"
+        collection = "test_bulk_product"
+
+
+def _products(count, price=10):
+    return [
+        Product(
+            external_id="ext_%d" % i,
+            title="product_%d" % i,
+            price=price,
+            created=datetime(2020, 1, 1),
+        )
+        for i in range(count)
+    ]
+
+
+class BuildOperationsTestCase:
+    async def test_build_upsert_operation(self):
+        operation = bulk.build_upsert_operation(
+            {"external_id": "a", "title": "b", "created": 1},
+            ["external_id"],
+            ["created"],
+        )
+        assert operation._filter == {"external_id": "a"}
+        assert operation._doc == {
+            "$set": {"title": "b"},
+            "$setOnInsert": {"created": 1},
+        }
+        assert operation._upsert
+
+    async def test_build_key_query(self):
+        assert bulk.build_key_query(["a"], [(1,), (2,)]) == {"a": {"$in": [1, 2]}}
+        assert bulk.build_key_query(["a", "b"], [(1, 2)]) == {"$or": [{"a": 1, "b": 2}]}
+
+    async def test_missing_key(self):
+        with pytest.raises(ValueError, match='"external_id" key field is not found'):
+            bulk.get_key({"title": "test"}, ["external_id"])
+
+    async def test_content_hash_ignores_order(self):
+        assert bulk.content_hash({"a": 1, "b": 2}) == bulk.content_hash(
+            {"b": 2, "a": 1}
+        )
+
+
+class BulkUpsertTestCase:
+    async def test_insert_and_update(self, init_test_db):
+        result = await Product.bulk_upsert(
+            _products(3), key=["external_id"], set_on_insert=["created"], chunk_size=2
+        )
+        assert result.upserted_count == 3
+        assert sorted(result.upserted_ids) == [0, 1, 2]
+
+        products = _products(4, price=20)
+        products[0].created = datetime(2021, 1, 1)
+        result = await Product.bulk_upsert(
+            products, key=["external_id"], set_on_insert=["created"]
+        )
+        assert result.matched_count == 3
+        assert result.upserted_count == 1
+        inserted = await Product.find_one({"external_id": "ext_3"})
+        assert list(result.upserted_ids.values()) == [inserted.id]
+
+        stored = await Product.find_one({"external_id": "ext_0"})
+        assert stored.price == 20
+        assert stored.created == datetime(2020, 1, 1)
+        assert await Product.count() == 4
+
+    async def test_upsert_dicts(self, init_test_db):
+        result = await Product.bulk_upsert(
+            [{"external_id": "a", "title": "a", "price": 1}], key=["external_id"]
+        )
+        assert (await Product.find_one({"_id": result.upserted_ids[0]})).title == "a"
+
+    async def test_skip_unchanged(self, init_test_db):
+        await Product.bulk_upsert(
+            _products(3), key=["external_id"], skip_unchanged=True
+        )
+        products = _products(3)
+        products[1].price = 30
+        result = await Product.bulk_upsert(
+            products, key=["external_id"], skip_unchanged=True
+        )
+        assert result.skipped_count == 2
+        assert result.matched_count == 1
+        assert (await Product.find_one({"external_id": "ext_1"})).price == 30
@@ -0,0 +1,129 @@
+"""Tests for BSON codecs"""
+import bson
+import pytest
+from bson.codec_options import CodecOptions, TypeRegistry
+from bson.decimal128 import Decimal128
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from typing import List, Optional
+
+from pydantic_odm import codecs, mixins
+from pydantic_odm.encoders.mongodb import BaseMongoDBEncoder
+
+pytestmark = pytest.mark.asyncio
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Reader = "reader"
+
+
+class UserStatusEnum(str, Enum):
+    """Example enum with mixed in built-in type"""
+
+    Active = "active"
+    Banned = "banned"
+
+
+class Wallet(mixins.BaseDBMixin):
+    """Example nested model"""
+
+    amount: Decimal
+    status: Optional[UserStatusEnum]
+
+
+class CodecUser(mixins.DBPydanticMixin):
+    """Example user model encoded by BSON codec"""
+
+    username: str
+    created: datetime
+    type: UserTypesEnum = UserTypesEnum.Reader
+    wallets: List[Wallet] = []
+
+    class Config:
+        database = "default"
+        collection = "test_codec_user"
+        bson_codec = True
+
+
+class CustomEncoder(BaseMongoDBEncoder):
+    """Example custom encoder"""
+
+
+class CustomEncoderUser(CodecUser):
+    """Example user model with custom encoder"""
+
+    _mongodb_encoder = CustomEncoder()
+
+
+class TypeRegistryTestCase:
+    async def test_build_type_registry(self):
+        registry = codecs.build_type_registry(CodecUser)
+        assert UserTypesEnum in registry._encoder_map
+        # Enums with built-in types are encoded natively
+        assert UserStatusEnum not in registry._encoder_map
+        assert Decimal in registry._encoder_map
+        assert Decimal128 in registry._decoder_map
+        assert registry._fallback_encoder is codecs.fallback_encoder
+
+    async def test_encode_and_decode_with_codec(self):
+        codec_options = codecs.get_codec_options(CodecUser)
+        assert codecs.get_codec_options(CodecUser) is codec_options
+        data = {
+            "type": UserTypesEnum.Admin,
+            "wallets": [{"amount": Decimal("13.37"), "status": UserStatusEnum.Active}],
+        }
+
+        encoded = bson.encode(data, codec_options=codec_options)
+        assert bson.decode(encoded) == {
+            "type": "admin",
+            "wallets": [{"amount": Decimal128("13.37"), "status": "active"}],
+        }
+        decoded = bson.decode(encoded, codec_options=codec_options)
+        assert decoded["wallets"][0]["amount"] == Decimal("13.37")
+
+    async def test_fallback_encoder(self):
+        codec_options = codecs.get_codec_options(CodecUser)
+
+        class OtherEnum(Enum):
+            """Enum which is not used in model"""
+
+            Value = 1
+
+        encoded = bson.encode({"value": OtherEnum.Value}, codec_options=codec_options)
+        assert bson.decode(encoded) == {"value": 1}
+
+
+class SkipPythonEncoderTestCase:
+    async def test_skip_encoder(self):
+        data = {"type": UserTypesEnum.Admin}
+        assert CodecUser._is_encoded_by_codec()
+        assert CodecUser._encode_dict_to_mongo(data) is data
+
+    async def test_not_skip_custom_encoder(self):
+        data = {"type": UserTypesEnum.Admin}
+        assert not CustomEncoderUser._is_encoded_by_codec()
+        assert CustomEncoderUser._encode_dict_to_mongo(data) == {"type": "admin"}
+
+    async def test_get_collection_with_codec(self, init_test_db):
+        collection = await CodecUser.get_collection()
+        registry = codecs.get_type_registry(CodecUser)
+        assert collection.codec_options.type_registry is registry
+
+    async def test_client_codec_options_are_kept(self, mocker):
+        collection = mocker.Mock(full_name="test.codec_options")
+        collection.codec_options = CodecOptions(tz_aware=True, uuid_representation=4)
+        CodecUser._configure_collection(collection)
+        codec_options = collection.with_options.call_args[1]["codec_options"]
+        assert codec_options.tz_aware
+        assert codec_options.uuid_representation == 4
+        assert codec_options.type_registry is codecs.get_type_registry(CodecUser)
+
+    async def test_configured_collection_is_cached(self, init_test_db, mocker):
+        mocker.patch.object(mixins, "get_type_registry", return_value=TypeRegistry())
+        collection = await CodecUser.get_collection()
+        assert await CodecUser.get_collection() is collection
+        assert await CodecUser.get_read_collection() is collection
@@ -0,0 +1,143 @@
+"""Tests for columnar export of query results"""
+import pytest
+from array import array
+from datetime import datetime, timedelta
+from enum import Enum
+from pydantic import Field
+from typing import Optional
+
+from pydantic_odm import columns, mixins
+
+pytestmark = pytest.mark.asyncio
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Reader = "reader"
+
+
+class Profile(mixins.BaseDBMixin):
+    """Example nested model"""
+
+    rating: float
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+    age: Optional[int]
+    is_active: bool = True
+    type: UserTypesEnum = UserTypesEnum.Reader
+    profile: Optional[Profile]
+    nickname: Optional[str] = Field(None, alias="nick")
+
+    class Config:
+        database = "default"
+        collection = "test_columns_user"
+
+
+class ColumnBufferTestCase:
+    async def test_array_buffer(self):
+        buffer = columns.ArrayColumnBuffer("d", null_value=float("nan"))
+        buffer.extend([1.0, None])
+        buffer.extend([3.0])
+        result = buffer.result()
+        assert isinstance(result, array)
+        assert result[0] == 1.0 and result[2] == 3.0
+        assert result[1] != result[1]
+
+    async def test_numpy_buffer_grows(self):
+        np = pytest.importorskip("numpy")
+        buffer = columns.NumpyColumnBuffer("int64", capacity=2)
+        buffer.extend([1, 2])
+        buffer.extend([3, 4, 5])
+        assert len(buffer.buffer) == 8
+        assert np.array_equal(buffer.result(), np.array([1, 2, 3, 4, 5]))
+
+    @pytest.mark.parametrize(
+        "path,buffer_cls,typecode",
+        [
+            pytest.param("age", columns.ArrayColumnBuffer, "d", id="nullable_int"),
+            pytest.param("is_active", columns.ArrayColumnBuffer, "b", id="bool"),
+            pytest.param("profile.rating", columns.ArrayColumnBuffer, "d", id="nested"),
+            pytest.param("type", columns.ListColumnBuffer, None, id="enum"),
+            pytest.param("username", columns.ListColumnBuffer, None, id="str"),
+        ],
+    )
+    async def test_column_type_from_annotation(self, path, buffer_cls, typecode):
+        field, _ = columns.resolve_field(User, path)
+        buffer = columns.create_column_buffer(field, use_numpy=False, capacity=10)
+        assert isinstance(buffer, buffer_cls)
+        if typecode:
+            assert buffer.values.typecode == typecode
+
+    @pytest.mark.parametrize(
+        "path,keys",
+        [
+            pytest.param("id", ["_id"], id="id"),
+            pytest.param("nickname", ["nickname"], id="aliased"),
+            pytest.param("profile.id", ["profile", "id"], id="nested_id"),
+        ],
+    )
+    async def test_document_keys(self, path, keys):
+        assert columns.resolve_field(User, path)[1] == keys
+
+    async def test_unknown_field(self):
+        with pytest.raises(ValueError, match='"unknown" field is not found in User'):
+            columns.resolve_field(User, "unknown")
+
+
+class FindColumnsTestCase:
+    async def _create_users(self, count):
+        created = datetime(2020, 1, 1)
+        await User.bulk_create(
+            [
+                User(
+                    username="user_%d" % i,
+                    created=created + timedelta(days=i),
+                    age=i if i % 2 else None,
+                    is_active=bool(i % 3),
+                    profile=Profile(rating=i / 2),
+                    nick="nick_%d" % i,
+                )
+                for i in range(count)
+            ]
+        )
+        return created
+
+    async def test_find_columns_to_arrays(self, init_test_db):
+        created = await self._create_users(5)
+        result = await User.find_columns(
+            {"age": {"$ne": 4}},
+            [
+                "username",
+                "nickname",
+                "age",
+                "is_active",
+                "type",
+                "profile.rating",
+                "created",
+            ],
+            batch_size=2,
+            use_numpy=False,
+        )
+        assert result["username"] == ["user_%d" % i for i in range(5)]
+        assert result["nickname"] == ["nick_%d" % i for i in range(5)]
+        assert list(result["is_active"]) == [0, 1, 1, 0, 1]
+        assert result["age"][1] == 1.0 and result["age"][0] != result["age"][0]
+        assert list(result["profile.rating"]) == [0.0, 0.5, 1.0, 1.5, 2.0]
+        assert result["type"] == ["reader"] * 5
+        assert result["created"][0] == created
+
+    async def test_find_columns_to_numpy(self, init_test_db):
+        np = pytest.importorskip("numpy")
+        await self._create_users(3)
+        result = await User.find_columns({}, ["id", "age", "created"], batch_size=2)
+        assert result["age"].dtype == np.float64
+        assert result["created"].dtype == np.dtype("datetime64[ms]")
+        assert len(result["id"]) == 3
+        assert np.isnan(result["age"][0])
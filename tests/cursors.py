@@ -0,0 +1,83 @@
+"""Tests for cursor wrappers"""
+import asyncio
+import pytest
+from datetime import datetime
+
+from pydantic_odm import mixins
+from pydantic_odm.cursors import PrefetchCursor
+
+pytestmark = pytest.mark.asyncio
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+
+    class Config:
+        database = "default"
+        collection = "test_cursors_user"
+        prefetch_depth = 2
+        prefetch_batch_size = 3
+
+
+class FakeCursor:
+    """Cursor, which returns documents by batches and records fetches"""
+
+    def __init__(self, documents, error=None):
+        self.documents = list(documents)
+        self.error = error
+        self.fetched = 0
+        self.closed = False
+
+    def batch_size(self, batch_size):
+        self._batch_size = batch_size
+        return self
+
+    async def to_list(self, length):
+        await asyncio.sleep(0)
+        if self.error and not self.documents:
+            raise self.error
+        batch, self.documents = self.documents[:length], self.documents[length:]
+        self.fetched += 1
+        return batch
+
+    async def close(self):
+        self.closed = True
+
+
+class PrefetchCursorTestCase:
+    async def test_batches(self):
+        cursor = FakeCursor(range(7))
+        batches = [batch async for batch in PrefetchCursor(cursor, 3).batches()]
+        assert batches == [[0, 1, 2], [3, 4, 5], [6]]
+        assert cursor._batch_size == 3
+        assert cursor.closed
+
+    async def test_iterate_documents(self):
+        cursor = PrefetchCursor(FakeCursor(range(5)), batch_size=2)
+        assert [document async for document in cursor] == [0, 1, 2, 3, 4]
+
+    async def test_read_ahead_is_bounded(self):
+        cursor = FakeCursor(range(100))
+        prefetch_cursor = PrefetchCursor(cursor, batch_size=1, depth=2)
+        assert await prefetch_cursor.next_batch() == [0]
+        for _ in range(10):
+            await asyncio.sleep(0)
+        # Current batch, two batches in queue and one waiting for place in queue
+        assert cursor.fetched == 4
+        await prefetch_cursor.close()
+        assert cursor.closed
+
+    async def test_fetch_error(self):
+        cursor = PrefetchCursor(FakeCursor(range(2), error=RuntimeError("failed")))
+        with pytest.raises(RuntimeError, match="failed"):
+            [batch async for batch in cursor.batches()]
+
+    async def test_find_many_with_prefetch(self, init_test_db):
+        await User.bulk_create(
+            [User(username="user_%d" % i, created=datetime.now()) for i in range(7)]
+        )
+        users = await User.find_many({})
+        assert [user.username for user in users] == ["user_%d" % i for i in range(7)]
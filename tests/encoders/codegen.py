@@ -0,0 +1,190 @@
+"""Tests for code-generated model encoders"""
+import pytest
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from pydantic import Extra
+from typing import Any, Dict, List, Optional
+
+from pydantic_odm import mixins
+from pydantic_odm.encoders import codegen
+from pydantic_odm.encoders.mongodb import BaseMongoDBEncoder, BaseMongoDBModelEncoder
+
+pytestmark = pytest.mark.asyncio
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Reader = "reader"
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+    age: Optional[int]
+    type: UserTypesEnum = UserTypesEnum.Reader
+    balance: Optional[Decimal]
+
+
+class Comment(mixins.BaseDBMixin):
+    """Example comment model"""
+
+    body: str
+    parent: Optional[List[mixins.BaseDBMixin]] = list()
+
+
+class Post(mixins.DBPydanticMixin):
+    """Example post model"""
+
+    title: str
+    author: User
+    editor: Optional[User]
+    comments: Optional[List[Comment]]
+    tags: List[str] = []
+    types: List[List[UserTypesEnum]] = []
+    extra: Dict[str, Any] = {}
+    anything: Any
+
+
+class ExtraPost(Post):
+    """Example model with extra fields"""
+
+    class Config:
+        extra = Extra.allow
+
+
+class CustomEncoderUser(User):
+    """Example model with custom encoder"""
+
+    _mongodb_encoder = type("CustomEncoder", (BaseMongoDBEncoder,), {})()
+
+
+def _user(**kwargs):
+    data = {
+        "username": "test",
+        "created": datetime(2020, 1, 1),
+        "age": 10,
+        "type": UserTypesEnum.Admin,
+        "balance": Decimal("13.37"),
+    }
+    data.update(kwargs)
+    return User(**data)
+
+
+def _post(model=Post, **kwargs):
+    return model(
+        title="test",
+        author=_user(),
+        comments=[
+            Comment(body="first"),
+            Comment(body="second", parent=[Comment(body="a")]),
+        ],
+        tags=["a", "b"],
+        types=[[UserTypesEnum.Admin], [UserTypesEnum.Reader]],
+        extra={"type": UserTypesEnum.Admin, "nested": [{"amount": Decimal("1.5")}]},
+        anything=[UserTypesEnum.Reader],
+        **kwargs
+    )
+
+
+class CustomDictUser(User):
+    """Example model with overridden dict()"""
+
+    def dict(self, **kwargs):
+        data = super().dict(**kwargs)
+        data["username"] = data["username"].upper()
+        return data
+
+
+class CustomDictComment(Comment):
+    """Example nested model with overridden dict()"""
+
+    def dict(self, **kwargs):
+        return {**super().dict(**kwargs), "body": "hidden"}
+
+
+class CompiledMongoDBModelEncoderTestCase:
+    @pytest.mark.parametrize(
+        "model",
+        [
+            pytest.param(_user(), id="simple"),
+            pytest.param(_user(age=None, balance=None), id="with_none"),
+            pytest.param(_post(), id="nested"),
+            pytest.param(_post(ExtraPost, unknown=UserTypesEnum.Admin), id="extra"),
+            pytest.param(
+                CustomEncoderUser(username="test", created=datetime(2020, 1, 1)),
+                id="custom_encoder",
+            ),
+            pytest.param(
+                CustomDictUser(username="test", created=datetime(2020, 1, 1)),
+                id="custom_dict",
+            ),
+            pytest.param(
+                Post(
+                    title="test", author=_user(), comments=[CustomDictComment(body="a")]
+                ),
+                id="nested_custom_dict",
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("exclude", [None, {"id"}])
+    async def test_same_result_as_generic_pipeline(self, model, exclude):
+        compiled = codegen.CompiledMongoDBModelEncoder()(model, exclude=exclude)
+        generic = BaseMongoDBModelEncoder()(model, exclude=exclude)
+        assert compiled == generic
+
+    async def test_encode_values(self):
+        model_id = ObjectId()
+        post = _post(id=model_id)
+        data = codegen.CompiledMongoDBModelEncoder()(post)
+        assert data["id"] == str(model_id)
+        assert data["author"]["type"] == "admin"
+        assert data["author"]["balance"] == Decimal128("13.37")
+        assert data["comments"][1]["parent"] == [
+            {"id": None, "body": "a", "parent": []}
+        ]
+        assert data["types"] == [["admin"], ["reader"]]
+        assert data["extra"] == {
+            "type": "admin",
+            "nested": [{"amount": Decimal128("1.5")}],
+        }
+        assert data["anything"] == ["reader"]
+        assert data["editor"] is None
+
+    async def test_not_compiled_for_partial_encoding(self, mocker):
+        encoder = codegen.CompiledMongoDBModelEncoder()
+        spy = mocker.spy(BaseMongoDBModelEncoder, "__call__")
+        user = _user()
+        assert encoder(user, exclude_none=True) == user._encode_model_to_mongo(
+            exclude_none=True
+        )
+        assert spy.call_count == 2
+
+    async def test_custom_serialization(self):
+        assert not codegen.has_custom_serialization(User)
+        assert codegen.has_custom_serialization(CustomDictUser)
+        assert not codegen.CompiledMongoDBModelEncoder().is_supported(
+            CustomDictUser(username="test", created=datetime(2020, 1, 1))
+        )
+
+    async def test_generated_source(self):
+        source = codegen.get_encoder_source(User)
+        # Values of plain types are copied as is
+        assert "'username': d['username']" in source
+        assert "_Enum" in source
+        assert "_Decimal128" in source
+
+        # Enum and Decimal are encoded by BSON codec
+        source = codegen.get_encoder_source(User, convert=False)
+        assert "_Enum" not in source
+        assert "_Decimal128" not in source
+
+    async def test_encoder_is_generated_once(self):
+        compiler = codegen.ModelEncoderCompiler()
+        assert compiler.get_encoder(User) is compiler.get_encoder(User)
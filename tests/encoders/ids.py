@@ -0,0 +1,66 @@
+"""Tests for conversion of ObjectId strings in queries"""
+import pytest
+from bson import ObjectId
+from pydantic import BaseModel, Field
+from typing import List, Optional
+
+from pydantic_odm.encoders import ids
+from pydantic_odm.types import NativeObjectId
+
+pytestmark = pytest.mark.asyncio
+
+OID = "5f0c7b0a9b1e8a1b2c3d4e5f"
+
+
+class Comment(BaseModel):
+    """Example model with ObjectId references"""
+
+    id: Optional[NativeObjectId] = None
+    author_id: NativeObjectId = Field(..., alias="author")
+    tag_ids: List[NativeObjectId] = []
+    body: str = ""
+
+
+class ConvertQueryIdsTestCase:
+    async def test_get_object_id_keys(self):
+        keys = ids.get_object_id_keys(Comment)
+        assert keys == frozenset({"_id", "author_id", "author", "tag_ids"})
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            pytest.param({"id": OID}, {"_id": ObjectId(OID)}, id="id_field"),
+            pytest.param(
+                {"_id": {"$in": [OID, "not_id"]}},
+                {"_id": {"$in": [ObjectId(OID), "not_id"]}},
+                id="in",
+            ),
+            pytest.param(
+                {"author": {"$ne": OID, "$exists": True}},
+                {"author": {"$ne": ObjectId(OID), "$exists": True}},
+                id="operators",
+            ),
+            pytest.param(
+                {"_id": {"$not": {"$eq": OID}}},
+                {"_id": {"$not": {"$eq": ObjectId(OID)}}},
+                id="not",
+            ),
+            pytest.param(
+                {"$or": [{"tag_ids": OID}, {"body": OID}]},
+                {"$or": [{"tag_ids": ObjectId(OID)}, {"body": OID}]},
+                id="logical",
+            ),
+            pytest.param({"body": OID}, {"body": OID}, id="other_field"),
+        ],
+    )
+    async def test_convert_query_ids(self, query, expected):
+        converted = ids.convert_query_ids(query, ids.get_object_id_keys(Comment))
+        assert converted == expected
+        assert all(
+            type(a) is type(b) for a, b in zip(converted.values(), expected.values())
+        )
+
+    async def test_to_object_id(self):
+        assert ids.to_object_id(OID) == ObjectId(OID)
+        assert ids.to_object_id(OID[:-1]) == OID[:-1]
+        assert ids.to_object_id(1) == 1
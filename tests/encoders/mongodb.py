@@ -1,10 +1,12 @@
 """Tests for mongodb encoders"""
 import pytest
 from bson.decimal128 import Decimal128
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
 from pydantic_odm.encoders import mongodb as mongodb_encoders
+from pydantic_odm.types import DateTimeRange
 
 pytestmark = pytest.mark.asyncio
 
@@ -118,6 +120,35 @@ class EncodeDecimalsTestCase:
         assert mongodb_encoders._convert_decimals(data) == expected
 
 
+class EncodeDateTimeRangesTestCase:
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            pytest.param(
+                {
+                    "created": DateTimeRange(
+                        gte=datetime(2020, 1, 1), lte=datetime(2021, 1, 1)
+                    )
+                },
+                {
+                    "created": {
+                        "$gte": datetime(2020, 1, 1),
+                        "$lte": datetime(2021, 1, 1),
+                    }
+                },
+                id="both_borders",
+            ),
+            pytest.param(
+                {"$or": [{"created": DateTimeRange(lte=datetime(2020, 1, 1))}]},
+                {"$or": [{"created": {"$lte": datetime(2020, 1, 1)}}]},
+                id="upper_border",
+            ),
+        ],
+    )
+    async def test__convert_datetime_ranges(self, data, expected):
+        assert mongodb_encoders._convert_datetime_ranges(data) == expected
+
+
 class BaseMongoDBEncoderTestCase:
     @pytest.mark.parametrize(
         "data, expected",
@@ -146,6 +177,21 @@ class BaseMongoDBEncoderTestCase:
                 },
                 id="nested",
             ),
+            pytest.param(
+                {
+                    "$and": [
+                        {"created": DateTimeRange(gte=datetime(2020, 1, 1))},
+                        {"price": Decimal("1.5"), "type": UserTypesEnum.Admin},
+                    ]
+                },
+                {
+                    "$and": [
+                        {"created": {"$gte": datetime(2020, 1, 1)}},
+                        {"price": Decimal128("1.5"), "type": "admin"},
+                    ]
+                },
+                id="all_conversions",
+            ),
         ],
     )
     async def test_encode(self, data, expected):
@@ -0,0 +1,65 @@
+"""Tests for materialization of query results in executor"""
+import bson
+import pytest
+from bson.codec_options import CodecOptions
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from enum import Enum
+
+from pydantic_odm import materialize, mixins
+
+pytestmark = pytest.mark.asyncio
+
+executor = ThreadPoolExecutor(2)
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Reader = "reader"
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+    type: UserTypesEnum = UserTypesEnum.Reader
+
+    class Config:
+        database = "default"
+        collection = "test_materialize_user"
+        materialize_executor = executor
+        materialize_batch_size = 3
+
+
+class MaterializeTestCase:
+    async def test_materialize_batch(self):
+        documents = [
+            {
+                "_id": bson.ObjectId(),
+                "username": "user_%d" % i,
+                "created": datetime(2020, 1, 1),
+                "type": "admin",
+            }
+            for i in range(3)
+        ]
+        data = b"".join(bson.encode(document) for document in documents)
+        users = materialize.materialize_batch(User, data, CodecOptions())
+        assert [user.username for user in users] == ["user_0", "user_1", "user_2"]
+        assert all(user.type is UserTypesEnum.Admin for user in users)
+        assert users[0]._doc["id"] == documents[0]["_id"]
+
+    async def test_find_many_in_executor(self, init_test_db, mocker):
+        await User.bulk_create(
+            [User(username="user_%d" % i, created=datetime.now()) for i in range(7)]
+        )
+        spy = mocker.spy(materialize, "materialize_batch")
+        submit = mocker.spy(executor, "submit")
+        users = await User.find_many({})
+        assert [user.username for user in users] == ["user_%d" % i for i in range(7)]
+        assert all(isinstance(user.id, str) for user in users)
+        # Two full batches and remaining document, all decoded in executor
+        assert spy.call_count == 3
+        assert submit.call_count == 3
@@ -0,0 +1,194 @@
+"""Tests for schema versions and lazy upgrade of documents"""
+import pytest
+from bson import ObjectId
+
+from pydantic_odm import migrations, mixins
+
+pytestmark = pytest.mark.asyncio
+
+
+class Person(mixins.DBPydanticMixin):
+    """Example model with two schema upgrades"""
+
+    full_name: str
+    age: int = 0
+
+    class Config:
+        database = "default"
+        collection = "test_migrations_person"
+        schema_version = 2
+        write_behind_max_latency = 60
+
+    @migrations.schema_upgrade(0)
+    def join_name(cls, document):
+        document["full_name"] = "%s %s" % (
+            document.pop("first_name"),
+            document.pop("last_name"),
+        )
+        return document
+
+    @migrations.schema_upgrade(1)
+    def add_age(cls, document):
+        document.setdefault("age", 18)
+        return document
+
+
+async def _insert_old_documents(count):
+    collection = await Person.get_collection()
+    documents = [
+        {"_id": ObjectId(), "first_name": "John", "last_name": "Doe #%d" % i}
+        for i in range(count)
+    ]
+    await collection.insert_many(documents)
+    return collection, documents
+
+
+class UpgradeDocumentTestCase:
+    async def test_upgrade_document(self):
+        document = {"_id": 1, "first_name": "John", "last_name": "Doe"}
+        upgraded = migrations.upgrade_document(Person, document)
+        assert upgraded == {
+            "_id": 1,
+            "full_name": "John Doe",
+            "age": 18,
+            "_schema_version": 2,
+        }
+        assert document == {"_id": 1, "first_name": "John", "last_name": "Doe"}
+        assert migrations.upgrade_document(
+            Person, {"_id": 1, "full_name": "a", "_schema_version": 1}
+        ) == {"_id": 1, "full_name": "a", "age": 18, "_schema_version": 2}
+
+    async def test_nested_values_are_copied(self):
+        class Profile(Person):
+            class Config:
+                schema_version = 3
+
+            @migrations.schema_upgrade(2)
+            def add_tag(cls, document):
+                document["tags"].append("upgraded")
+                return document
+
+        document = {"_id": 1, "full_name": "a", "_schema_version": 2, "tags": []}
+        upgraded = migrations.upgrade_document(Profile, document)
+        assert upgraded["tags"] == ["upgraded"]
+        assert document["tags"] == []
+        # Write-back sets changed nested value
+        query, update = migrations.build_write_back(document, upgraded)
+        assert query == {"_id": 1, "tags": [], "_schema_version": 2}
+        assert update == {"$set": {"tags": ["upgraded"], "_schema_version": 3}}
+
+    async def test_missing_upgrade(self):
+        class Child(Person):
+            class Config:
+                schema_version = 3
+
+        with pytest.raises(RuntimeError, match="has not schema upgrade from version 2"):
+            migrations.upgrade_document(Child, {"_id": 1, "_schema_version": 2})
+
+    async def test_build_write_back(self):
+        original = {"_id": 1, "first_name": "John", "last_name": "Doe", "age": 18}
+        upgraded = migrations.upgrade_document(Person, original)
+        query, update = migrations.build_write_back(original, upgraded)
+        assert query == {
+            "_id": 1,
+            "full_name": {"$exists": False},
+            "_schema_version": {"$exists": False},
+            "first_name": "John",
+            "last_name": "Doe",
+        }
+        assert update == {
+            "$set": {"full_name": "John Doe", "_schema_version": 2},
+            "$unset": {"first_name": "", "last_name": ""},
+        }
+
+
+class LazyUpgradeTestCase:
+    async def test_upgrade_on_load(self, init_test_db):
+        collection, documents = await _insert_old_documents(3)
+        person = await Person.find_one({"_id": documents[0]["_id"]})
+        assert person.full_name == "John Doe #0"
+        assert person.age == 18
+        people = await Person.find_many({})
+        assert [p.full_name for p in people] == ["John Doe #%d" % i for i in range(3)]
+
+        assert await migrations.flush_upgrades() == 3
+        stored = await collection.find_one({"_id": documents[0]["_id"]})
+        assert stored == {
+            "_id": documents[0]["_id"],
+            "full_name": "John Doe #0",
+            "age": 18,
+            "_schema_version": 2,
+        }
+
+    async def test_write_back_skips_changed_document(self, init_test_db):
+        collection, documents = await _insert_old_documents(1)
+        await Person.find_one({})
+        await collection.update_one(
+            {"_id": documents[0]["_id"]}, {"$set": {"last_name": "Smith"}}
+        )
+        await migrations.flush_upgrades()
+        stored = await collection.find_one({"_id": documents[0]["_id"]})
+        assert stored["last_name"] == "Smith"
+        assert "_schema_version" not in stored
+
+    @pytest.mark.parametrize("method", ["save", "update"])
+    async def test_save_before_write_back(self, init_test_db, method):
+        collection, documents = await _insert_old_documents(1)
+        person = await Person.find_one({})
+        if method == "save":
+            person.full_name = "Jane Doe"
+            await person.save()
+        else:
+            await person.update({"full_name": "Jane Doe"})
+        # Write-back doesn't match changed document
+        await migrations.flush_upgrades()
+        stored = await collection.find_one({"_id": documents[0]["_id"]})
+        assert stored == {
+            "_id": documents[0]["_id"],
+            "full_name": "Jane Doe",
+            "age": 18,
+            "_schema_version": 2,
+        }
+        assert (await Person.find_one({})).full_name == "Jane Doe"
+
+    async def test_stamp_new_documents(self, init_test_db):
+        collection = await Person.get_collection()
+        person = await Person.create({"full_name": "Jane Doe", "age": 30})
+        await Person.bulk_create([Person(full_name="Jack Doe")])
+        assert await collection.count_documents({"_schema_version": 2}) == 2
+        await Person.find_many({})
+        assert await migrations.flush_upgrades() == 0
+        assert (await Person.find_one({"_id": person.id})).age == 30
+
+
+class MigrateTestCase:
+    async def test_migrate(self, init_test_db):
+        collection, documents = await _insert_old_documents(5)
+        await Person.create({"full_name": "Jane Doe", "age": 30})
+        results = []
+        result = await Person.migrate_schema(
+            batch_size=2, progress=lambda r: results.append(r.scanned_count)
+        )
+        assert results == [2, 4, 5]
+        assert result.scanned_count == result.modified_count == 5
+        assert result.last_id == documents[-1]["_id"]
+        assert await collection.count_documents({"_schema_version": 2}) == 6
+        assert await collection.count_documents({"first_name": {"$exists": True}}) == 0
+
+    async def test_resume_migration(self, init_test_db):
+        collection, documents = await _insert_old_documents(4)
+        result = await Person.migrate_schema(start_after=documents[1]["_id"])
+        assert result.scanned_count == 2
+        assert await collection.count_documents({"_schema_version": 2}) == 2
+
+    async def test_migrate_with_rate_limit(self, init_test_db, mocker):
+        await _insert_old_documents(4)
+        sleep = mocker.patch("asyncio.sleep")
+        result = await Person.migrate_schema(batch_size=2, max_rate=1)
+        assert result.scanned_count == 4
+        assert sleep.call_count == 2
+        assert sleep.call_args_list[-1][0][0] > 3
+
+    async def test_batch_size(self):
+        with pytest.raises(ValueError, match="Batch size must be positive"):
+            await migrations.migrate(Person, batch_size=0)
@@ -1,11 +1,13 @@
 """Tests for pydantic models mixins"""
+import bson
 import pytest
 import re
 from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
 from datetime import datetime, timedelta
 from enum import Enum
 from motor import motor_asyncio
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ValidationError
 from pymongo.collection import ReturnDocument
 from typing import List, Optional
 from unittest import mock
@@ -58,6 +60,37 @@ class Post(mixins.DBPydanticMixin):
         collection = "test_post"
 
 
+class LazyPost(Post):
+    """Example post model with lazy loading"""
+
+    class Config:
+        database = "default"
+        collection = "test_post"
+        lazy = True
+
+
+class EmbeddedComment(mixins.EmbeddedDocument):
+    """Example embedded comment model"""
+
+    body: str
+    replies: List["EmbeddedComment"] = []
+
+
+EmbeddedComment.update_forward_refs()
+
+
+class Article(mixins.DBPydanticMixin):
+    """Example model with embedded documents"""
+
+    title: str
+    comments: List[EmbeddedComment] = []
+    author: Optional[Comment]
+
+    class Config:
+        database = "default"
+        collection = "test_article"
+
+
 class UserSerializer(BaseModel):
     """Scheme (serializer) for update example model"""
 
@@ -237,6 +270,129 @@ class BaseDBMixinTestCase:
         assert user_as_dict.get("id") == user.id
 
 
+class EmbeddedDocumentTestCase:
+    async def test_embedded_document_state(self):
+        comment = EmbeddedComment(body="test")
+        assert "id" not in comment.__fields__
+        assert comment.dict() == {"body": "test", "replies": []}
+        assert mixins.get_embedded_fields(Article) == frozenset({"comments"})
+
+    async def test_embedded_fields_by_name(self):
+        class AliasedArticle(Article):
+            notes: List[EmbeddedComment] = Field([], alias="noteList")
+
+        assert mixins.get_embedded_fields(AliasedArticle) == frozenset(
+            {"comments", "notes"}
+        )
+
+    async def test_embedded_values_are_not_decoded(self):
+        document = {
+            "_id": ObjectId(),
+            "title": "test",
+            "comments": [{"body": "a", "replies": [{"body": "b", "replies": []}]}],
+            "author": {"_id": None, "body": "c", "created": datetime(2020, 1, 1)},
+        }
+        decoded = Article._decode_mongo_documents(document)
+        assert decoded["comments"] is document["comments"]
+        assert "id" in decoded["author"]
+
+    async def test_save_and_find(self, init_test_db):
+        comments = [{"body": "a", "replies": [{"body": "b"}]}]
+        article = await Article.create({"title": "test", "comments": comments})
+        assert article._encode_model_to_mongo()["comments"] == [
+            {"body": "a", "replies": [{"body": "b", "replies": []}]}
+        ]
+        found = await Article.find_one({"_id": article.id})
+        assert isinstance(found.comments[0], EmbeddedComment)
+        assert found.comments[0].replies[0].body == "b"
+
+
+class LazyModelTestCase:
+    def _raw_post(self):
+        return RawBSONDocument(
+            bson.encode(
+                {
+                    "_id": ObjectId(),
+                    "title": "test_title",
+                    "body": "test_body",
+                    "author": {
+                        "_id": ObjectId(),
+                        "username": "test",
+                        "created": datetime(2020, 1, 1),
+                        "type": UserTypesEnum.Admin.value,
+                    },
+                    "comments": [{"body": "comment", "created": datetime(2020, 1, 2)}],
+                }
+            )
+        )
+
+    async def test_load_fields_on_access(self):
+        raw = self._raw_post()
+        post = LazyPost._from_mongo_document(raw)
+        assert isinstance(post, LazyPost)
+        assert "title" not in post.__dict__
+
+        assert post.title == "test_title"
+        assert "title" in post.__dict__
+        assert "author" not in post.__dict__
+        assert post.id == raw["_id"]
+        assert isinstance(post.author, User)
+        assert post.author.type == UserTypesEnum.Admin
+        assert isinstance(post.comments[0], Comment)
+        assert post.comments[0].created == datetime(2020, 1, 2)
+
+    async def test_materialize(self):
+        raw = self._raw_post()
+        post = LazyPost._from_mongo_document(raw)
+        post_as_dict = post.dict()
+        assert post_as_dict["body"] == "test_body"
+        assert post_as_dict["author"]["username"] == "test"
+        assert "_raw" not in post_as_dict
+        assert post._doc.get("id") == raw["_id"]
+
+    async def test_raw_bson_pass_through(self):
+        raw = self._raw_post()
+        post = LazyPost._from_mongo_document(raw)
+        assert post.title
+        assert post.to_raw_bson() == raw.raw
+
+        post.title = "new_title"
+        assert post.to_raw_bson() is None
+        assert post.title == "new_title"
+        assert post.body == "test_body"
+
+    async def test_aliased_field(self):
+        class AliasedLazyPost(LazyPost):
+            summary: str = Field(..., alias="shortBody")
+
+        raw = RawBSONDocument(
+            bson.encode({"_id": ObjectId(), "title": "test", "summary": "short"})
+        )
+        post = AliasedLazyPost._from_mongo_document(raw)
+        assert post.summary == "short"
+
+    async def test_missing_required_field(self):
+        raw = RawBSONDocument(bson.encode({"_id": ObjectId(), "title": "test"}))
+        post = LazyPost._from_mongo_document(raw)
+        assert post.title == "test"
+        with pytest.raises(ValidationError, match="field required"):
+            _ = post.body
+
+    async def test_find_lazy_model(self, init_test_db):
+        user = User(username="test", created=datetime.now())
+        post = Post(title="test", body="test_body", author=user)
+        await post.save()
+
+        lazy_post = await LazyPost.find_one({"_id": post.id})
+        assert lazy_post.id == post.id
+        assert lazy_post.title == post.title
+        assert lazy_post.to_raw_bson()
+
+        lazy_posts = await LazyPost.find_many({})
+        assert len(lazy_posts) == 1
+        assert lazy_posts[0].author.username == user.username
+
+
 class DBPydanticMixinTestCase:
     async def test_jsonable_model(self, init_test_db):
         user = User(username="test", created=datetime.now(), age=10)
@@ -385,6 +541,35 @@ class DBPydanticMixinTestCase:
         await User.bulk_create(models[3::])
         assert await User.count() == 5
 
+    async def test_count_approximate_and_max(self, init_test_db, mocker):
+        models = [
+            User(username="test_user_#%d" % i, created=datetime.now(), age=i)
+            for i in range(1, 6)
+        ]
+        await User.bulk_create(models)
+        collection = await User.get_collection()
+        spy = mocker.spy(type(collection), "estimated_document_count")
+        assert await User.count(approximate=True) == 5
+        assert await User.count(approximate=True, max=2) == 2
+        assert spy.call_count == 2
+        assert await User.count({"age": {"$gt": 2}}, approximate=True) == 3
+        assert spy.call_count == 2
+        assert await User.count({"age": {"$gt": 2}}, max=2) == 2
+        assert await User.count({"age": {"$gt": 2}}, max=10) == 3
+
+    async def test_exists(self, init_test_db, mocker):
+        assert not await User.exists()
+        user = await User.create(
+            {"username": "test", "created": datetime.now(), "age": 10}
+        )
+        collection = await User.get_read_collection()
+        spy = mocker.spy(type(collection), "find_one")
+        assert await User.exists()
+        assert await User.exists({"username": "test", "age": 10})
+        assert await User.exists({"id": str(user.id)})
+        assert not await User.exists({"username": "other"})
+        assert spy.call_args_list[1][0][2] == {"username": 1, "age": 1, "_id": 0}
+
     async def test_find_one(self, init_test_db):
         model_data = {
             "username": "test",
@@ -449,6 +634,67 @@ class DBPydanticMixinTestCase:
             assert document.created == document._doc.get("created")
             assert document.age == document._doc.get("age")
 
+    @pytest.mark.parametrize("direction", [1, -1])
+    async def test_paginate(self, init_test_db, direction):
+        created = datetime(2020, 1, 1)
+        # Pairs of users with same created date check tie-breaker by `_id`
+        await User.bulk_create(
+            [
+                User(username="test_user_%d" % i, created=created, age=i // 2)
+                for i in range(7)
+            ]
+        )
+
+        pages = []
+        page = await User.paginate(
+            {"age": {"$gte": 0}}, sort=("age", direction), page_size=3
+        )
+        pages.append(page)
+        while page.has_next:
+            page = await User.paginate(
+                {"age": {"$gte": 0}},
+                sort=("age", direction),
+                page_size=3,
+                after=page.next_token,
+            )
+            pages.append(page)
+
+        assert [len(page.items) for page in pages] == [3, 3, 1]
+        users = [user for page in pages for user in page.items]
+        assert all(isinstance(user, User) for user in users)
+        assert len({user.id for user in users}) == 7
+        ages = [user.age for user in users]
+        assert ages == sorted(ages, reverse=direction == -1)
+
+    @pytest.mark.parametrize("direction", [1, -1])
+    async def test_paginate_with_null_values(self, init_test_db, direction):
+        await User.bulk_create(
+            [
+                User(username="test_user_%d" % i, created=datetime.now(), age=age)
+                for i, age in enumerate([None, 1, None, 2, None])
+            ]
+        )
+        users = []
+        page = await User.paginate(sort=("age", direction), page_size=2)
+        users.extend(page.items)
+        while page.has_next:
+            page = await User.paginate(
+                sort=("age", direction), page_size=2, after=page.next_token
+            )
+            users.extend(page.items)
+        assert len({user.id for user in users}) == 5
+        ages = [None, None, None, 1, 2]
+        assert [user.age for user in users] == (ages if direction == 1 else ages[::-1])
+
+    async def test_paginate_with_foreign_token(self, init_test_db):
+        await User.bulk_create(
+            [User(username="test", created=datetime.now()) for _ in range(2)]
+        )
+        page = await User.paginate(page_size=1)
+        assert page.has_next
+        with pytest.raises(ValueError, match="does not match sort"):
+            await User.paginate(sort="age", after=page.next_token)
+
     async def test_update_many(self, init_test_db):
         models = [
             User(username="test_user_%d" % i, created=datetime.now(), age=i)
@@ -543,6 +789,28 @@ class DBPydanticMixinTestCase:
         with pytest.raises(ValueError, match=raise_msg):
             await user.reload()
 
+    async def test_query_by_id_str(self, init_test_db):
+        users = await User.bulk_create(
+            [{"username": f"test #{i}", "created": datetime.now()} for i in range(3)]
+        )
+        ids = [str(user.id) for user in users]
+        found = await User.find_one({"id": ids[0]})
+        assert found.id == users[0].id
+        assert await User.count({"_id": {"$in": ids[1:]}}) == 2
+
+        # Models of find_many have string ids (validated by ObjectIdStr)
+        models = await User.find_many({"_id": {"$in": ids}})
+        assert {type(model.id) for model in models} == {str}
+        await models[0].reload()
+        await models[0].delete()
+        assert await User.count({}) == 2
+
+    async def test_query_by_id_str_without_conversion(self, init_test_db, monkeypatch):
+        user = await User.create({"username": "test", "created": datetime.now()})
+        monkeypatch.setattr(User.Config, "convert_query_ids", False, raising=False)
+        assert await User.find_one({"_id": str(user.id)}) is None
+        assert await User.find_one({"_id": user.id})
+
     async def test_serialize_to_json_when_model_is_deeply_nested(self, init_test_db):
         """
         When you have a BaseDBMixin container model with children that are
@@ -0,0 +1,81 @@
+"""Tests for keyset pagination helpers"""
+import pytest
+from bson import ObjectId
+from datetime import datetime
+
+from pydantic_odm import mixins, pagination
+
+pytestmark = pytest.mark.asyncio
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime = None
+
+    class Config:
+        fields = {"username": "login"}
+
+
+class PaginationTestCase:
+    @pytest.mark.parametrize(
+        "sort,expected",
+        [
+            pytest.param("id", ("_id", 1), id="id"),
+            pytest.param(("created", -1), ("created", -1), id="descending"),
+            pytest.param("username", ("username", 1), id="field"),
+            pytest.param("login", ("username", 1), id="alias"),
+            pytest.param("profile.rating", ("profile.rating", 1), id="nested"),
+        ],
+    )
+    async def test_get_sort_key(self, sort, expected):
+        assert pagination.get_sort_key(User, sort) == expected
+
+    async def test_token(self):
+        value, document_id = datetime(2020, 1, 1), ObjectId()
+        token = pagination.encode_token("created", -1, value, document_id)
+        assert pagination.decode_token(token, "created", -1) == (value, document_id)
+        with pytest.raises(ValueError, match="does not match sort"):
+            pagination.decode_token(token, "created", 1)
+        with pytest.raises(ValueError, match="Invalid continuation token"):
+            pagination.decode_token("invalid", "created", -1)
+
+    async def test_build_seek_query(self):
+        document_id = ObjectId()
+        assert pagination.build_seek_query({}, "_id", -1, None, document_id) == {
+            "_id": {"$lt": document_id}
+        }
+        assert pagination.build_seek_query(
+            {"age": 1}, "created", 1, 10, document_id
+        ) == {
+            "$and": [
+                {"age": 1},
+                {
+                    "$or": [
+                        {"created": {"$gt": 10}},
+                        {"created": 10, "_id": {"$gt": document_id}},
+                    ]
+                },
+            ]
+        }
+        assert pagination.build_seek_query({}, "created", -1, 10, document_id) == {
+            "$or": [
+                {"created": {"$lt": 10}},
+                {"created": 10, "_id": {"$lt": document_id}},
+                {"created": None},
+            ]
+        }
+
+    async def test_build_seek_query_after_null(self):
+        document_id = ObjectId()
+        assert pagination.build_seek_query({}, "created", 1, None, document_id) == {
+            "$or": [
+                {"created": {"$ne": None}},
+                {"created": None, "_id": {"$gt": document_id}},
+            ]
+        }
+        assert pagination.build_seek_query({}, "created", -1, None, document_id) == {
+            "created": None,
+            "_id": {"$lt": document_id},
+        }
@@ -0,0 +1,101 @@
+"""Tests for prepared queries"""
+import pytest
+from bson import ObjectId
+from datetime import datetime
+from enum import Enum
+
+from pydantic_odm import mixins, prepared
+from pydantic_odm.prepared import Param
+
+pytestmark = pytest.mark.asyncio
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Reader = "reader"
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime = None
+    type: UserTypesEnum = UserTypesEnum.Reader
+
+    class Config:
+        database = "default"
+        collection = "test_prepared_user"
+
+
+class PreparedQueryTestCase:
+    async def test_build(self):
+        query = User.prepare(
+            {
+                "type": Param("type"),
+                "created": {"$gte": Param("since")},
+                "username": {"$ne": "admin"},
+                "$or": [{"id": {"$in": Param("ids")}}, {"_id": Param("id")}],
+            }
+        )
+        assert query.params == ["type", "since", "ids", "id"]
+        document_id = ObjectId()
+        compiled = query.build(
+            type=UserTypesEnum.Admin,
+            since=datetime(2020, 1, 1),
+            ids=[str(document_id)],
+            id=document_id,
+        )
+        assert compiled.to_mongo() == {
+            "type": "admin",
+            "created": {"$gte": datetime(2020, 1, 1)},
+            "username": {"$ne": "admin"},
+            "$or": [{"_id": {"$in": [document_id]}}, {"_id": document_id}],
+        }
+        # Fixed parts are shared, template is not changed
+        assert compiled.to_mongo()["username"] is query.document["username"]
+        assert isinstance(query.document["type"], Param)
+
+    async def test_invalid_params(self):
+        query = User.prepare({"type": Param("type")})
+        with pytest.raises(ValueError, match='"type" parameter is not passed'):
+            query.build()
+        with pytest.raises(ValueError, match='"since" parameter is not used'):
+            query.build(type="admin", since=None)
+        with pytest.raises(ValueError, match="used for ObjectId and other fields"):
+            User.prepare({"_id": Param("value"), "username": Param("value")})
+
+    async def test_find(self, init_test_db):
+        await User.bulk_create(
+            [{"username": "user #%s" % i, "type": "admin"} for i in range(3)]
+        )
+        await User.create({"username": "reader"})
+        query = User.prepare({"type": Param("type")})
+        assert len(await query.find(type=UserTypesEnum.Admin)) == 3
+        assert await query.count(type=UserTypesEnum.Reader) == 1
+        user = await query.find_one(type=UserTypesEnum.Reader)
+        assert user.username == "reader"
+
+    @pytest.mark.parametrize(
+        "index, plan, expected",
+        [
+            pytest.param(
+                [("type", 1)],
+                {"stage": "FETCH", "inputStage": {"indexName": "type_1"}},
+                True,
+                id="used",
+            ),
+            pytest.param("type_1", {"stage": "COLLSCAN"}, False, id="not_used"),
+        ],
+    )
+    async def test_check_index(self, mocker, index, plan, expected):
+        query = User.prepare({"type": Param("type")}, index=index)
+        assert query.index == "type_1"
+        explain = mocker.patch.object(
+            prepared.PreparedQuery, "explain", return_value={}
+        )
+        explain.return_value = {"queryPlanner": {"winningPlan": plan}}
+        assert await query.check_index(type="admin") is expected
+        with pytest.raises(ValueError, match="Expected index of query is not set"):
+            await User.prepare({}).check_index()
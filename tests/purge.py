@@ -0,0 +1,122 @@
+"""Tests for chunked and throttled deletion of documents"""
+import pytest
+from datetime import datetime, timedelta
+from pymongo.errors import OperationFailure
+
+from pydantic_odm import admission, mixins, purge
+
+pytestmark = pytest.mark.asyncio
+
+
+class Session(mixins.DBPydanticMixin):
+    """Example session model"""
+
+    user: str
+    expired: bool = False
+
+    class Config:
+        database = "default"
+        collection = "test_purge_session"
+
+
+async def _create_sessions(count, expired=True):
+    return await Session.bulk_create(
+        [Session(user="user_%d" % i, expired=expired) for i in range(count)]
+    )
+
+
+class ReplicationLagTestCase:
+    @pytest.mark.parametrize(
+        "states, lag",
+        [
+            pytest.param([], 0.0, id="standalone"),
+            pytest.param(["PRIMARY"], 0.0, id="primary"),
+            pytest.param(["PRIMARY", "SECONDARY", "SECONDARY"], 2.0, id="secondaries"),
+            pytest.param(["SECONDARY", "ARBITER"], 0.0, id="without_primary"),
+        ],
+    )
+    async def test_compute_replication_lag(self, states, lag):
+        now = datetime(2021, 1, 1)
+        status = {
+            "members": [
+                {"stateStr": state, "optimeDate": now - timedelta(seconds=i)}
+                for i, state in enumerate(states)
+            ]
+        }
+        assert purge.compute_replication_lag(status) == lag
+
+    @pytest.mark.parametrize("code", [76, 94])
+    async def test_standalone_server(self, mocker, code):
+        database = mocker.Mock()
+        database.client.admin.command = mocker.AsyncMock(
+            side_effect=OperationFailure("not running with --replSet", code)
+        )
+        assert await purge.get_replication_lag(database) == 0.0
+
+    async def test_status_error(self, mocker):
+        database = mocker.Mock()
+        database.client.admin.command = mocker.AsyncMock(
+            side_effect=OperationFailure("not authorized", 13)
+        )
+        with pytest.raises(OperationFailure, match="not authorized"):
+            await purge.get_replication_lag(database)
+
+
+class PurgeTestCase:
+    async def test_purge_by_chunks(self, init_test_db):
+        await _create_sessions(5)
+        await _create_sessions(2, expired=False)
+        results = []
+        result = await Session.purge(
+            {"expired": True},
+            chunk_size=2,
+            progress=lambda r: results.append(r.deleted_count),
+        )
+        assert results == [2, 4, 5]
+        assert result.deleted_count == 5
+        assert result.batches == 3
+        assert await Session.count() == 2
+        assert await Session.count({"expired": True}) == 0
+
+    async def test_resume(self, init_test_db):
+        sessions = await _create_sessions(4)
+        result = await Session.purge({}, start_after=sessions[1].id)
+        assert result.deleted_count == 2
+        assert result.last_id == sessions[-1].id
+        assert sorted(s.user for s in await Session.find_many({})) == [
+            "user_0",
+            "user_1",
+        ]
+
+    async def test_rate_limit(self, init_test_db, mocker):
+        await _create_sessions(4)
+        sleep = mocker.patch("asyncio.sleep")
+        result = await Session.purge({}, chunk_size=2, max_rate=1)
+        assert result.deleted_count == 4
+        assert sleep.call_count == 2
+        assert sleep.call_args_list[-1][0][0] > 3
+
+    async def test_wait_replication_lag(self, init_test_db, mocker):
+        await _create_sessions(3)
+        sleep = mocker.patch("asyncio.sleep")
+        lag = mocker.patch.object(
+            purge, "get_replication_lag", side_effect=[5, 3, 0, 0]
+        )
+        result = await Session.purge({}, chunk_size=2, max_lag=1)
+        assert result.deleted_count == 3
+        assert result.lag_wait == 2.0
+        assert lag.call_count == 4
+        assert sleep.call_count == 2
+
+    async def test_admission_limiter(self, init_test_db, monkeypatch):
+        limiter = admission.AdmissionLimiter(max_concurrency=1)
+        monkeypatch.setattr(Session.Config, "admission_limiter", limiter, raising=False)
+        await _create_sessions(3)
+        limiter.reset_stats()
+        result = await Session.purge({}, chunk_size=1)
+        # Every batch is admitted separately
+        assert limiter.stats()["admitted"] == result.batches == 3
+
+    async def test_chunk_size(self):
+        with pytest.raises(ValueError, match="Chunk size must be positive"):
+            await Session.purge({}, chunk_size=0)
@@ -0,0 +1,163 @@
+"""Tests for typed query expressions"""
+import pytest
+from bson import ObjectId
+from datetime import datetime
+from enum import Enum
+from pydantic import BaseModel
+from typing import List, Optional
+
+from pydantic_odm import mixins, query
+from pydantic_odm.query import Q
+
+pytestmark = pytest.mark.asyncio
+
+
+class UserTypesEnum(Enum):
+    """Example user enum"""
+
+    Admin = "admin"
+    Reader = "reader"
+
+
+class Profile(BaseModel):
+    """Example nested model"""
+
+    rating: int = 0
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    age: Optional[int]
+    created: datetime = None
+    type: UserTypesEnum = UserTypesEnum.Reader
+    tags: List[str] = []
+    profile: Profile = Profile()
+
+    class Config:
+        database = "default"
+        collection = "test_query_user"
+        fields = {"username": "login"}
+
+
+class Post(mixins.DBPydanticMixin):
+    """Example post model"""
+
+    title: str
+    author: Optional[User]
+
+    class Config:
+        database = "default"
+        collection = "test_query_post"
+
+
+class Search(mixins.DBPydanticMixin):
+    """Example model with field named as query attribute of other ODMs"""
+
+    q: str
+
+    class Config:
+        database = "default"
+        collection = "test_query_search"
+
+
+class QueryExpressionTestCase:
+    @pytest.mark.parametrize(
+        "expression, expected",
+        [
+            pytest.param(Q(User).age > "30", {"age": {"$gt": 30}}, id="converted"),
+            pytest.param(Q(User).age == None, {"age": None}, id="none"),  # noqa: E711
+            pytest.param(
+                Q(User).login != "test", {"username": {"$ne": "test"}}, id="alias"
+            ),
+            pytest.param(
+                Q(User).username <= "test", {"username": {"$lte": "test"}}, id="name"
+            ),
+            pytest.param(
+                Q(User).type.in_(["admin", UserTypesEnum.Reader]),
+                {"type": {"$in": ["admin", "reader"]}},
+                id="enum",
+            ),
+            pytest.param(Q(User).tags == "python", {"tags": "python"}, id="list_item"),
+            pytest.param(
+                Q(User).profile.rating >= 5,
+                {"profile.rating": {"$gte": 5}},
+                id="nested",
+            ),
+            pytest.param(
+                Q(User).id.not_in(["5f0c7b0a9b1e8a1b2c3d4e5f"]),
+                {"_id": {"$nin": [ObjectId("5f0c7b0a9b1e8a1b2c3d4e5f")]}},
+                id="id",
+            ),
+            pytest.param(
+                Q(Post).author.id == "5f0c7b0a9b1e8a1b2c3d4e5f",
+                {"author.id": "5f0c7b0a9b1e8a1b2c3d4e5f"},
+                id="nested_id",
+            ),
+            pytest.param(
+                ~Q(User).created.exists(),
+                {"$nor": [{"created": {"$exists": True}}]},
+                id="exists",
+            ),
+        ],
+    )
+    async def test_expression(self, expression, expected):
+        assert isinstance(expression, query.Query)
+        assert expression.to_mongo() == expected
+
+    async def test_combine(self):
+        expression = (
+            (Q(User).age > 1) & (Q(User).age < 10) & {"type": UserTypesEnum.Admin}
+        )
+        assert expression.to_mongo() == {
+            "$and": [{"age": {"$gt": 1}}, {"age": {"$lt": 10}}, {"type": "admin"}]
+        }
+        expression = (Q(User).age == 1) | (Q(User).age == 2) & (Q(User).tags == "a")
+        assert expression.to_mongo() == {
+            "$or": [{"age": 1}, {"$and": [{"age": 2}, {"tags": "a"}]}]
+        }
+
+    async def test_invalid_expression(self, init_test_db):
+        with pytest.raises(AttributeError, match='"ages" field is not found'):
+            Q(User).ages
+        with pytest.raises(AttributeError, match='"age" field has no nested fields'):
+            Q(User).age.value
+        with pytest.raises(ValueError, match='"x" value is not valid for "age" field'):
+            Q(User).age > "x"
+        with pytest.raises(ValueError, match="can't be combined"):
+            (Q(User).age > 1) & (Q(Post).title == "test")
+        with pytest.raises(ValueError, match='is passed to "Post" model'):
+            await Post.find_one(Q(User).age > 1)
+
+    async def test_find_by_query(self, init_test_db):
+        await User.bulk_create(
+            [{"username": "user #%s" % i, "age": i, "tags": ["a"]} for i in range(5)]
+        )
+        compiled = (Q(User).age >= 2) & (Q(User).tags == "a")
+        assert await User.count(compiled) == 3
+        users = await User.find_many(compiled)
+        assert sorted(user.age for user in users) == [2, 3, 4]
+        user = await User.find_one(Q(User).username == "user #1")
+        assert user.age == 1
+        assert compiled.to_mongo() == {"$and": [{"age": {"$gte": 2}}, {"tags": "a"}]}
+
+    async def test_model_with_q_field(self, init_test_db):
+        await Search.create({"q": "python"})
+        search = await Search.find_one(Q(Search).q == "python")
+        assert search.q == "python"
+        assert Q(Search) is Q(Search)
+
+
+class CoveringProjectionTestCase:
+    @pytest.mark.parametrize(
+        "document, projection",
+        [
+            pytest.param({}, {"_id": 1}, id="empty"),
+            pytest.param({"$or": [{"a": 1}, {"b": 2}]}, {"_id": 1}, id="operators"),
+            pytest.param({"a": 1, "b.c": 2}, {"a": 1, "b.c": 1, "_id": 0}, id="fields"),
+            pytest.param({"_id": 1, "a": 1}, {"_id": 1, "a": 1}, id="id"),
+        ],
+    )
+    async def test_get_covering_projection(self, document, projection):
+        assert query.get_covering_projection(document) == projection
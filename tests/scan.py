@@ -0,0 +1,180 @@
+"""Tests for parallel partitioned scan"""
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from pydantic_odm import mixins, scan
+from pydantic_odm.types import DateTimeRange
+
+pytestmark = pytest.mark.asyncio
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+    age: int
+
+    class Config:
+        database = "default"
+        collection = "test_scan_user"
+
+
+async def _create_users(count):
+    await User.bulk_create(
+        [
+            User(username="user_%d" % i, created=datetime.now(), age=i % 10)
+            for i in range(count)
+        ]
+    )
+
+
+class PartitionQueriesTestCase:
+    async def test_get_partition_queries(self):
+        assert scan.get_partition_queries({"age": 1}, "_id", []) == [{"age": 1}]
+        assert scan.get_partition_queries({}, "_id", [10, 20]) == [
+            {"_id": {"$lt": 10}},
+            {"_id": {"$gte": 10, "$lt": 20}},
+            {"_id": {"$gte": 20}},
+        ]
+        assert scan.get_partition_queries({"age": 1}, "_id", [10]) == [
+            {"$and": [{"age": 1}, {"_id": {"$lt": 10}}]},
+            {"$and": [{"age": 1}, {"_id": {"$gte": 10}}]},
+        ]
+
+    @pytest.mark.parametrize("sample_size", [None, 0, 100])
+    async def test_get_partition_bounds(self, init_test_db, sample_size):
+        await _create_users(20)
+        collection = await User.get_collection()
+        bounds = await scan.get_partition_bounds(
+            collection, {"age": {"$gte": 2}}, "age", 4, sample_size
+        )
+        assert bounds == [4, 6, 8]
+
+    @pytest.mark.parametrize(
+        "sample_size, stage, options",
+        [
+            pytest.param(None, {"$sample": {"size": 400}}, {}, id="default"),
+            pytest.param(
+                0,
+                {"$bucketAuto": {"groupBy": "$age", "buckets": 4}},
+                {"allowDiskUse": True},
+                id="exact",
+            ),
+        ],
+    )
+    async def test_get_partition_bounds_pipeline(
+        self, mocker, sample_size, stage, options
+    ):
+        collection = mocker.Mock()
+        collection.aggregate.return_value.to_list = mocker.AsyncMock(return_value=[])
+        await scan.get_partition_bounds(collection, {}, "age", 4, sample_size)
+        pipeline = collection.aggregate.call_args[0][0]
+        assert pipeline[0] == stage
+        assert collection.aggregate.call_args[1] == options
+
+
+class ParallelScanTestCase:
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"partitions": 1}, id="one_partition"),
+            pytest.param({"partitions": 3}, id="by_id"),
+            pytest.param(
+                {"partitions": 3, "batch_size": 4, "sample_size": 10}, id="sampled"
+            ),
+            pytest.param(
+                {"partitions": 4, "key": "age", "sample_size": 25}, id="by_key"
+            ),
+        ],
+    )
+    async def test_parallel_scan(self, init_test_db, kwargs):
+        await _create_users(25)
+        users = [user async for user in User.parallel_scan(**kwargs)]
+        assert len(users) == 25
+        assert len({user.id for user in users}) == 25
+        assert all(isinstance(user, User) for user in users)
+
+    async def test_parallel_scan_with_query_and_executor(self, init_test_db):
+        await _create_users(25)
+        with ThreadPoolExecutor(2) as executor:
+            users = [
+                user
+                async for user in User.parallel_scan(
+                    {"age": {"$lt": 5}},
+                    partitions=3,
+                    batch_size=2,
+                    executor=executor,
+                    sample_size=10,
+                )
+            ]
+        assert sorted(user.username for user in users) == sorted(
+            "user_%d" % i for i in range(25) if i % 10 < 5
+        )
+
+    async def test_parallel_scan_of_empty_collection(self, init_test_db):
+        assert [
+            user async for user in User.parallel_scan(partitions=3, sample_size=10)
+        ] == []
+
+
+class TimeRangeScanTestCase:
+    async def test_get_time_slices(self):
+        start = datetime(2020, 1, 1)
+        time_range = DateTimeRange(gte=start, lte=start + timedelta(days=3))
+        assert scan.get_time_slices(time_range, 3) == [
+            {"$gte": start, "$lt": start + timedelta(days=1)},
+            {"$gte": start + timedelta(days=1), "$lt": start + timedelta(days=2)},
+            {"$gte": start + timedelta(days=2), "$lte": start + timedelta(days=3)},
+        ]
+        point = DateTimeRange(gte=start, lte=start)
+        assert scan.get_time_slices(point, 3) == [{"$gte": start, "$lte": start}]
+        with pytest.raises(ValueError, match="Time range must have both borders"):
+            scan.get_time_slices(DateTimeRange(gte=start), 3)
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [
+            pytest.param({"slices": 1}, id="one_slice"),
+            pytest.param({"slices": 4, "concurrency": 2, "batch_size": 3}, id="slices"),
+            pytest.param({"slices": 5, "query": {"age": {"$lt": 5}}}, id="query"),
+        ],
+    )
+    async def test_scan_time_range(self, init_test_db, kwargs):
+        start = datetime(2020, 1, 1)
+        await User.bulk_create(
+            [
+                User(
+                    username="user_%d" % i,
+                    created=start + timedelta(hours=i),
+                    age=i % 10,
+                )
+                for i in reversed(range(30))
+            ]
+        )
+        time_range = [start + timedelta(hours=2), start + timedelta(hours=25)]
+        users = [
+            user async for user in User.scan_time_range("created", time_range, **kwargs)
+        ]
+        query = kwargs.get("query")
+        expected = [
+            start + timedelta(hours=i) for i in range(2, 26) if not query or i % 10 < 5
+        ]
+        assert [user.created for user in users] == expected
+
+    async def test_scan_time_range_by_instance(self, init_test_db):
+        start = datetime(2020, 1, 1)
+        await User.bulk_create(
+            [
+                User(username="user_%d" % i, created=start + timedelta(hours=i), age=i)
+                for i in range(5)
+            ]
+        )
+        time_range = DateTimeRange(gte=start, lte=start + timedelta(hours=2))
+        users = [user async for user in User.scan_time_range("created", time_range, 2)]
+        assert [user.username for user in users] == ["user_0", "user_1", "user_2"]
+
+    async def test_scan_time_range_with_invalid_slices(self, init_test_db):
+        with pytest.raises(ValueError, match="Slices count must be positive"):
+            [user async for user in User.scan_time_range("created", [None, None], 0)]
@@ -0,0 +1,69 @@
+"""Tests for snapshots of loaded documents"""
+import pytest
+from datetime import datetime
+from typing import List
+
+from pydantic_odm import mixins, snapshots
+
+pytestmark = pytest.mark.asyncio
+
+
+class User(mixins.DBPydanticMixin):
+    """Example user model"""
+
+    username: str
+    created: datetime
+    age: int = None
+    tags: List[str] = []
+
+    class Config:
+        database = "default"
+        collection = "test_snapshot_user"
+        snapshot = "hash"
+
+
+class SnapshotTestCase:
+    async def test_field_hashes(self):
+        document = {"id": 1, "username": "test", "tags": ["a"]}
+        snapshot = snapshots.create_snapshot(document, snapshots.SNAPSHOT_HASH)
+        assert snapshot["id"] == 1
+        assert len(snapshot["tags"]) == 8
+        assert snapshots.changed_fields(
+            snapshot, {"username": "test", "tags": ["a", "b"], "age": None}
+        ) == {"tags": ["a", "b"], "age": None}
+
+        snapshot = snapshots.update_snapshot(snapshot, {"tags": ["a", "b"]})
+        assert snapshots.changed_fields(snapshot, {"tags": ["a", "b"]}) == {}
+
+    async def test_unknown_mode(self):
+        with pytest.raises(ValueError, match='"copy" snapshot mode is not supported'):
+            snapshots.create_snapshot({}, "copy")
+
+    async def _create_user(self):
+        user = await User.create({"username": "test", "created": datetime(2020, 1, 1)})
+        collection = await User.get_collection()
+        return user, collection
+
+    async def test_save_with_hash_snapshot(self, init_test_db):
+        user, collection = await self._create_user()
+        user = await User.find_one({"_id": user.id})
+        assert isinstance(user._doc, snapshots.FieldHashes)
+
+        # Only changed fields are written
+        await collection.update_one({"_id": user.id}, {"$set": {"age": 30}})
+        user.tags = ["a"]
+        await user.save()
+        stored = await User.find_one({"_id": user.id})
+        assert stored.tags == ["a"] and stored.age == 30
+
+    async def test_save_without_snapshot(self, init_test_db):
+        user, collection = await self._create_user()
+        users = await User.find_many({}, snapshot="none")
+        assert users[0]._doc == {}
+
+        # All fields are written
+        await collection.update_one({"_id": user.id}, {"$set": {"age": 30}})
+        # Ids of found models are strings
+        users[0].id = user.id
+        await users[0].save()
+        assert (await User.find_one({"_id": user.id})).age is None
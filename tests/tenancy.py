@@ -0,0 +1,93 @@
+"""Tests for tenant-aware database routing"""
+import pytest
+from datetime import datetime
+from motor import motor_asyncio
+
+from pydantic_odm import mixins, tenancy
+
+pytestmark = pytest.mark.asyncio
+
+
+class TenantUser(mixins.DBPydanticMixin):
+    """Example user model with database per tenant"""
+
+    username: str
+    created: datetime
+
+    class Config:
+        database = "default"
+        collection = "test_tenant_user"
+        tenant_resolver = tenancy.TenantDatabaseResolver(
+            "default", "test_tenant_{tenant}", cache_size=2
+        )
+
+
+class MappedTenantUser(mixins.DBPydanticMixin):
+    """Example user model with fixed tenant to alias mapping"""
+
+    username: str
+
+    class Config:
+        database = "default"
+        collection = "test_tenant_user"
+        tenant_resolver = tenancy.TenantAliasResolver({"acme": "default"})
+
+
+class CurrentTenantTestCase:
+    async def test_use_tenant(self):
+        assert tenancy.get_current_tenant() is None
+        with tenancy.use_tenant("acme"):
+            assert tenancy.get_current_tenant() == "acme"
+            with tenancy.use_tenant("globex"):
+                assert tenancy.get_current_tenant() == "globex"
+            assert tenancy.get_current_tenant() == "acme"
+        assert tenancy.get_current_tenant() is None
+
+
+class CollectionLRUCacheTestCase:
+    async def test_evict_least_recently_used(self):
+        cache = tenancy.CollectionLRUCache(maxsize=2)
+        cache.set(("a", "users"), "a_users")
+        cache.set(("b", "users"), "b_users")
+        # Touch first handle, so second becomes least recently used
+        assert cache.get(("a", "users")) == "a_users"
+        cache.set(("c", "users"), "c_users")
+
+        assert len(cache) == 2
+        assert ("a", "users") in cache
+        assert ("b", "users") not in cache
+        assert ("c", "users") in cache
+
+    async def test_invalid_size(self):
+        with pytest.raises(ValueError, match="Cache size must be positive"):
+            tenancy.CollectionLRUCache(maxsize=0)
+
+
+class TenantRoutingTestCase:
+    async def test_get_collection_without_tenant(self, init_test_db):
+        collection = await TenantUser.get_collection()
+        assert collection.database.name == "test_mongo"
+
+    async def test_get_collection_of_tenant_database(self, init_test_db):
+        with tenancy.use_tenant("acme"):
+            collection = await TenantUser.get_collection()
+            assert isinstance(collection, motor_asyncio.AsyncIOMotorCollection)
+            assert collection.database.name == "test_tenant_acme"
+            assert await TenantUser.get_collection() is collection
+
+        resolver = TenantUser.Config.tenant_resolver
+        for tenant in ("globex", "initech"):
+            with tenancy.use_tenant(tenant):
+                await TenantUser.get_collection()
+        assert len(resolver.cache) == 2
+        assert ("acme", "test_tenant_user") not in resolver.cache
+
+    async def test_get_collection_of_mapped_alias(self, init_test_db):
+        with tenancy.use_tenant("acme"):
+            collection = await MappedTenantUser.get_collection()
+            assert collection.database.name == "test_mongo"
+
+        raise_msg = 'Tenant "unknown" is not mapped to database alias'
+        with tenancy.use_tenant("unknown"):
+            with pytest.raises(ValueError, match=raise_msg):
+                await MappedTenantUser.get_collection()
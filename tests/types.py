@@ -1,4 +1,5 @@
 """Tests for pydantic models types"""
+import pickle
 import pytest
 from bson import ObjectId
 from datetime import datetime, timedelta
@@ -21,7 +22,13 @@ class SchemeForTestObjectIdStr(BaseModel):
     uid: types.ObjectIdStr = None
 
 
-class TestObjectIdStr:
+class SchemeForTestNativeObjectId(BaseModel):
+    """Scheme for test native object id type"""
+
+    uid: types.NativeObjectId = None
+
+
+class ObjectIdStrTestCase:
     async def test_create(self):
         model = SchemeForTestObjectIdStr
         uid = ObjectId()
@@ -38,6 +45,57 @@ class TestObjectIdStr:
             model(uid=uid)
 
 
+class NativeObjectIdTestCase:
+    @pytest.mark.parametrize(
+        "value",
+        [
+            pytest.param("5f0c7b0a9b1e8a1b2c3d4e5f", id="str"),
+            pytest.param(ObjectId("5f0c7b0a9b1e8a1b2c3d4e5f"), id="object_id"),
+            pytest.param(b"_\x0c{\n\x9b\x1e\x8a\x1b,=N_", id="bytes"),
+        ],
+    )
+    async def test_create(self, value):
+        obj = SchemeForTestNativeObjectId(uid=value)
+        assert isinstance(obj.uid, types.NativeObjectId)
+        assert obj.uid == ObjectId("5f0c7b0a9b1e8a1b2c3d4e5f")
+
+    async def test_cached_str(self):
+        uid = types.NativeObjectId.validate(ObjectId())
+        assert str(uid) is str(uid)
+        assert str(uid) == str(ObjectId(uid.binary))
+        assert types.NativeObjectId.validate(uid) is uid
+
+    async def test_copy(self):
+        uid = types.NativeObjectId()
+        str(uid)
+        copied = pickle.loads(pickle.dumps(uid))
+        assert isinstance(copied, types.NativeObjectId)
+        assert copied == uid and str(copied) == str(uid)
+
+    async def test_validator(self):
+        with pytest.raises(ValidationError, match="Not a valid ObjectId"):
+            SchemeForTestNativeObjectId(uid="saidfojdsioafjaosidfj")
+        with pytest.raises(ValidationError, match="Not a valid ObjectId"):
+            SchemeForTestNativeObjectId(uid=1)
+
+
+class DateTimeRangeTestCase:
+    async def test_to_mongo(self):
+        gte, lte = datetime(2020, 1, 1), datetime(2020, 2, 1)
+        assert types.DateTimeRange.validate([gte, lte]).to_mongo() == {
+            "$gte": gte,
+            "$lte": lte,
+        }
+        assert types.DateTimeRange.validate({"gte": gte}).to_mongo() == {"$gte": gte}
+
+    async def test_validate_instance(self):
+        gte, lte = datetime(2020, 1, 1), datetime(2020, 2, 1)
+        time_range = types.DateTimeRange.validate(types.DateTimeRange(gte=gte, lte=lte))
+        assert (time_range.gte, time_range.lte) == (gte, lte)
+        with pytest.raises(ValueError, match="Make sure the borders do not cross"):
+            types.DateTimeRange.validate(types.DateTimeRange(gte=lte, lte=gte))
+
+
 class TestDateTimeRange:
     async def test_create(self):
         model = SchemeForTestDateTimeRange
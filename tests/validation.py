@@ -0,0 +1,193 @@
+"""Tests for declarative async validation of documents"""
+import asyncio
+import pytest
+from bson import ObjectId
+from typing import List
+
+from pydantic_odm import mixins, validation
+from pydantic_odm.errors import DocumentValidationError
+from pydantic_odm.types import ObjectIdStr
+
+pytestmark = pytest.mark.asyncio
+
+
+class Author(mixins.DBPydanticMixin):
+    """Example referenced model"""
+
+    name: str
+
+    class Config:
+        database = "default"
+        collection = "test_validation_author"
+
+
+class Category(mixins.DBPydanticMixin):
+    """Example model referenced by slug"""
+
+    slug: str
+
+    class Config:
+        database = "default"
+        collection = "test_validation_category"
+
+
+class Article(mixins.DBPydanticMixin):
+    """Example model with references and async validators"""
+
+    title: str
+    author_id: ObjectIdStr
+    category: str = None
+    reviewer_ids: List[ObjectIdStr] = []
+
+    class Config:
+        database = "default"
+        collection = "test_validation_article"
+        references = {
+            "author_id": Author,
+            "reviewer_ids": Author,
+            "category": validation.Reference(Category, field="slug"),
+        }
+
+    @validation.async_validator("title")
+    async def check_title(cls, value, document):
+        if value.startswith("draft"):
+            raise ValueError("Draft is not allowed")
+
+
+class ReferenceTestCase:
+    async def test_key_and_convert(self):
+        reference = validation.Reference(Author)
+        value = ObjectId()
+        assert reference.key == "_id"
+        assert reference.convert(str(value)) == value
+        reference = validation.Reference(Category, field="slug")
+        assert reference.key == "slug"
+        assert reference.convert(str(value)) == str(value)
+
+    async def test_unknown_field(self):
+        with pytest.raises(ValueError, match='"title" field is not found'):
+            validation.Reference(Category, field="title")
+
+    async def test_collect_references(self):
+        first, second = ObjectId(), ObjectId()
+        documents = [
+            {"author_id": str(first), "reviewer_ids": [str(second)]},
+            {"author_id": str(first), "category": "news", "reviewer_ids": []},
+        ]
+        grouped = validation.collect_references(Article, documents)
+        assert grouped == {
+            (Author, "_id"): {
+                first: [(0, "author_id"), (1, "author_id")],
+                second: [(0, "reviewer_ids")],
+            },
+            (Category, "slug"): {"news": [(1, "category")]},
+        }
+
+
+class AsyncValidatorTestCase:
+    async def test_get_validators(self):
+        class ChildArticle(Article):
+            @validation.async_validator("title", "category")
+            async def check_length(cls, value, document):
+                pass
+
+        validators = validation.get_validators(ChildArticle)
+        assert validators["title"] == (ChildArticle.check_length, Article.check_title)
+        assert validators["category"] == (ChildArticle.check_length,)
+
+    async def test_without_fields(self):
+        with pytest.raises(ValueError, match="Validated fields are not passed"):
+            validation.async_validator()
+
+    @pytest.mark.parametrize(
+        "data, expected",
+        [
+            pytest.param({"title": "a"}, {"title": "a"}, id="document"),
+            pytest.param({"$set": {"title": "a"}}, {"title": "a"}, id="set"),
+            pytest.param({"$inc": {"count": 1}}, {}, id="inc"),
+        ],
+    )
+    async def test_get_validated_fields(self, data, expected):
+        assert validation.get_validated_fields(data) == expected
+
+
+class ValidateDocumentsTestCase:
+    async def test_valid_documents(self, init_test_db):
+        author = await Author.create({"name": "test"})
+        await Category.create({"slug": "news"})
+        articles = await Article.bulk_create(
+            [
+                Article(title="first", author_id=author.id, category="news"),
+                Article(title="second", author_id=author.id, reviewer_ids=[author.id]),
+            ]
+        )
+        assert len(articles) == 2
+
+    async def test_one_query_per_referenced_model(self, init_test_db, mocker):
+        author = await Author.create({"name": "test"})
+        await Category.create({"slug": "news"})
+        spy = mocker.spy(validation, "find_missing")
+        await Article.bulk_create(
+            [
+                Article(
+                    title="article %d" % i,
+                    author_id=author.id,
+                    category="news",
+                    reviewer_ids=[author.id],
+                )
+                for i in range(10)
+            ]
+        )
+        assert spy.call_count == 2
+        assert sorted(call[0][1] for call in spy.call_args_list) == ["_id", "slug"]
+
+    async def test_missing_references(self, init_test_db):
+        author = await Author.create({"name": "test"})
+        missing_id = ObjectId()
+        with pytest.raises(DocumentValidationError) as e:
+            await Article.bulk_create(
+                [
+                    Article(title="first", author_id=author.id),
+                    Article(title="second", author_id=missing_id, category="unknown"),
+                ]
+            )
+        assert e.value.errors == [
+            (1, "author_id", "Author with _id %r is not found" % missing_id),
+            (1, "category", "Category with slug 'unknown' is not found"),
+        ]
+        assert await Article.count() == 0
+
+    async def test_validator_errors(self, init_test_db):
+        author = await Author.create({"name": "test"})
+        with pytest.raises(DocumentValidationError, match="Draft is not allowed"):
+            await Article.create({"title": "draft", "author_id": author.id})
+
+        article = await Article.create({"title": "first", "author_id": author.id})
+        with pytest.raises(DocumentValidationError) as e:
+            await article.update({"title": "draft 2"})
+        assert e.value.errors == [(0, "title", "Draft is not allowed")]
+
+        with pytest.raises(DocumentValidationError, match="Author with _id"):
+            await Article.update_many({}, {"$set": {"author_id": ObjectId()}})
+
+    async def test_bounded_concurrency(self, init_test_db):
+        active = []
+        max_active = []
+
+        class LimitedArticle(Article):
+            class Config:
+                references = {}
+                validation_concurrency = 2
+
+            @validation.async_validator("title")
+            async def check_title(cls, value, document):
+                active.append(value)
+                max_active.append(len(active))
+                await asyncio.sleep(0.01)
+                active.remove(value)
+
+        await validation.validate_documents(
+            LimitedArticle, [{"title": "article %d" % i} for i in range(6)]
+        )
+        assert len(max_active) == 6
+        assert max(max_active) == 2
@@ -0,0 +1,160 @@
+"""Tests for write-behind buffering of model saves"""
+import asyncio
+import pytest
+from bson import ObjectId
+from datetime import datetime
+from pymongo.errors import BulkWriteError
+from typing import Optional
+
+from pydantic_odm import mixins, writebehind
+from pydantic_odm.types import NativeObjectId
+
+pytestmark = pytest.mark.asyncio
+
+
+class Counter(mixins.DBPydanticMixin):
+    """Example counter model"""
+
+    name: str
+    value: int = 0
+    updated: datetime = None
+
+    class Config:
+        database = "default"
+        collection = "test_write_behind_counter"
+        write_behind = True
+        write_behind_max_size = 3
+        write_behind_max_latency = 0.05
+
+
+class NativeCounter(Counter):
+    """Example counter model with native ObjectId id"""
+
+    id: Optional[NativeObjectId] = None
+
+    class Config:
+        database = "default"
+        collection = "test_write_behind_native_counter"
+        write_behind = True
+        write_behind_max_latency = 60
+
+
+class WriteBehindBufferTestCase:
+    async def test_coalesce_writes(self, init_test_db):
+        collection = await Counter.get_collection()
+        buffer = writebehind.WriteBehindBuffer(max_size=10, max_latency=60)
+        document_id = ObjectId()
+        await buffer.add(collection, document_id, {"name": "a", "value": 1})
+        await buffer.add(collection, document_id, {"value": 2})
+        assert len(buffer) == 1
+        assert await buffer.flush() == 1
+        assert await collection.find_one({"_id": document_id}) == {
+            "_id": document_id,
+            "name": "a",
+            "value": 2,
+        }
+        assert len(buffer) == 0
+
+    async def test_failed_flush_keeps_writes(self, mocker):
+        collection = mocker.Mock(full_name="test.collection")
+        collection.bulk_write = mocker.AsyncMock(side_effect=RuntimeError("failed"))
+        buffer = writebehind.WriteBehindBuffer(max_size=10, max_latency=60)
+        document_id = ObjectId()
+        await buffer.add(collection, document_id, {"value": 1})
+        with pytest.raises(RuntimeError):
+            await buffer.flush()
+        await buffer.add(collection, document_id, {"name": "a"})
+        assert buffer.pending["test.collection"][1] == {
+            document_id: {"value": 1, "name": "a"}
+        }
+        buffer._timer.cancel()
+
+    async def test_failed_writes_are_dropped(self, mocker):
+        collection = mocker.Mock(full_name="test.collection")
+        error = BulkWriteError(
+            {"writeErrors": [{"index": 1, "code": 11000, "errmsg": "duplicate"}]}
+        )
+        collection.bulk_write = mocker.AsyncMock(side_effect=error)
+        buffer = writebehind.WriteBehindBuffer(max_size=10, max_latency=60)
+        drop_write = mocker.spy(buffer, "drop_write")
+        first, second = ObjectId(), ObjectId()
+        await buffer.add(collection, first, {"value": 1})
+        await buffer.add(collection, second, {"value": 2})
+        assert await buffer.flush() == 1
+        assert len(buffer) == 0
+        drop_write.assert_called_once_with(
+            collection, second, {"value": 2}, "duplicate"
+        )
+
+    async def test_retries_are_limited(self, mocker):
+        collection = mocker.Mock(full_name="test.collection")
+        collection.bulk_write = mocker.AsyncMock(side_effect=RuntimeError("failed"))
+        buffer = writebehind.WriteBehindBuffer(
+            max_size=10, max_latency=60, max_retries=2
+        )
+        drop_write = mocker.spy(buffer, "drop_write")
+        await buffer.add(collection, ObjectId(), {"value": 1})
+        for _ in range(3):
+            with pytest.raises(RuntimeError):
+                await buffer.flush()
+        assert len(buffer) == 0
+        assert buffer.attempts == {}
+        assert drop_write.call_count == 1
+
+    async def test_flush_by_size_does_not_raise(self, mocker):
+        collection = mocker.Mock(full_name="test.collection")
+        collection.bulk_write = mocker.AsyncMock(side_effect=RuntimeError("failed"))
+        buffer = writebehind.WriteBehindBuffer(max_size=1, max_latency=60)
+        await buffer.add(collection, ObjectId(), {"value": 1})
+        assert collection.bulk_write.call_count == 1
+        assert len(buffer) == 1
+        buffer._timer.cancel()
+
+    async def test_invalid_settings(self):
+        with pytest.raises(ValueError):
+            writebehind.WriteBehindBuffer(max_size=0)
+
+
+class WriteBehindSaveTestCase:
+    async def test_save_is_buffered(self, init_test_db):
+        counter = await Counter(name="test").save()
+        assert counter.id
+        counter.value = 1
+        await counter.save()
+        counter.value = 2
+        await counter.save()
+        assert await Counter.count({}) == 0
+
+        assert await Counter.flush() == 1
+        stored = await Counter.find_one({"_id": ObjectId(counter.id)})
+        assert stored.value == 2 and stored.name == "test"
+
+    async def test_flush_by_size(self, init_test_db):
+        for i in range(3):
+            await Counter(name="counter_%d" % i).save()
+        assert await Counter.count({}) == 3
+
+    async def test_flush_by_time(self, init_test_db):
+        await Counter(name="test").save()
+        await asyncio.sleep(0.1)
+        assert await Counter.count({}) == 1
+
+    async def test_flush_all(self, init_test_db):
+        await Counter(name="test").save()
+        assert await writebehind.flush_all() == 1
+        assert await Counter.count({}) == 1
+
+    @pytest.mark.parametrize("model", [Counter, NativeCounter])
+    async def test_buffer_keys(self, init_test_db, model):
+        counter = await model(name="test").save()
+        assert isinstance(counter.id, NativeObjectId if model is NativeCounter else str)
+        counter.value = 1
+        await counter.save()
+        buffer = writebehind.get_write_behind_buffer(model)
+        collection = await model.get_collection()
+        _, documents = buffer.pending[collection.full_name]
+        # Buffer is keyed by stored ObjectId for both id types
+        assert list(documents) == [ObjectId(str(counter.id))]
+        assert isinstance(list(documents)[0], ObjectId)
+        assert await model.flush() == 1
+        assert (await model.find_one({"_id": counter.id})).value == 1